@@ -43,7 +43,7 @@ class BaseAgent:
                 }
 
             # Check for active wallet
-            active_wallet = wallet_manager_instance.get_active_wallet()
+            active_wallet = wallet_manager_instance.get_active_wallet(request.session_id)
             if not active_wallet:
                 return {
                     "role": "assistant",
@@ -54,7 +54,9 @@ class BaseAgent:
                 prompt = data["prompt"]
                 wallet_address = data.get("wallet_address")
                 chain_id = data.get("chain_id")
-                response_content = self.handle_request(prompt, chain_id, wallet_address)
+                response_content = self.handle_request(
+                    prompt, chain_id, wallet_address, request.session_id
+                )
                 return {
                     "role": "assistant",
                     "content": response_content,
@@ -71,7 +73,11 @@ class BaseAgent:
             raise e
 
     def handle_request(
-        self, message: dict[str, any], chain_id: Optional[str], wallet_address: Optional[str]
+        self,
+        message: dict[str, any],
+        chain_id: Optional[str],
+        wallet_address: Optional[str],
+        session_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         logger.info(f"Message: {message}")
         logger.info(f"Chain ID: {chain_id}")
@@ -126,7 +132,7 @@ class BaseAgent:
                     return {"message": "Ready to perform transfer", "actionType": "transfer"}
                 elif func_name == "get_balance":
                     # Get active wallet from wallet manager
-                    wallet = wallet_manager_instance.get_active_wallet()
+                    wallet = wallet_manager_instance.get_active_wallet(session_id)
                     if not wallet:
                         return {"message": "Error: No active wallet found", "actionType": None}
 
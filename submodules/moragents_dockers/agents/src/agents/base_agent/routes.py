@@ -16,7 +16,7 @@ async def swap(data: dict):
         logger.info(f"Base Agent: Received swap request with data: {data}")
 
         # Get active wallet
-        wallet = wallet_manager_instance.get_active_wallet()
+        wallet = wallet_manager_instance.get_active_wallet(data.get("session_id"))
         if not wallet:
             logger.error("No active wallet found for swap request")
             return JSONResponse(
@@ -58,7 +58,7 @@ async def transfer(data: dict):
         logger.info(f"Base Agent: Received transfer request with data: {data}")
 
         # Get active wallet
-        wallet = wallet_manager_instance.get_active_wallet()
+        wallet = wallet_manager_instance.get_active_wallet(data.get("session_id"))
         if not wallet:
             logger.error("No active wallet found for transfer request")
             return JSONResponse(
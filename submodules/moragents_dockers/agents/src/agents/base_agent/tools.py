@@ -1,12 +1,14 @@
 import logging
-from typing import Dict, Any
-from cdp import Wallet
+from typing import TYPE_CHECKING, Dict, Any
+
+if TYPE_CHECKING:
+    from cdp import Wallet
 
 logger = logging.getLogger(__name__)
 
 
 def swap_assets(
-    agent_wallet: Wallet, amount: str, from_asset_id: str, to_asset_id: str
+    agent_wallet: "Wallet", amount: str, from_asset_id: str, to_asset_id: str
 ) -> Dict[str, Any]:
     """Swap one asset for another (Base Mainnet only)"""
     try:
@@ -52,7 +54,7 @@ def swap_assets(
 
 
 def transfer_asset(
-    agent_wallet: Wallet, amount: str, asset_id: str, destination_address: str
+    agent_wallet: "Wallet", amount: str, asset_id: str, destination_address: str
 ) -> Dict[str, Any]:
     """Transfer an asset to another address"""
     try:
@@ -78,7 +80,7 @@ def transfer_asset(
         raise Exception(f"Failed to transfer asset: {str(e)}")
 
 
-def get_balance(agent_wallet: Wallet, asset_id: str) -> Dict[str, Any]:
+def get_balance(agent_wallet: "Wallet", asset_id: str) -> Dict[str, Any]:
     """Get balance of a specific asset"""
     try:
         balance = agent_wallet.balance(asset_id)
@@ -98,7 +100,7 @@ def get_balance(agent_wallet: Wallet, asset_id: str) -> Dict[str, Any]:
 
 
 def create_token(
-    agent_wallet: Wallet, name: str, symbol: str, initial_supply: int
+    agent_wallet: "Wallet", name: str, symbol: str, initial_supply: int
 ) -> Dict[str, Any]:
     """Create a new ERC-20 token"""
     try:
@@ -116,7 +118,7 @@ def create_token(
         raise Exception(f"Failed to create token: {str(e)}")
 
 
-def request_eth_from_faucet(agent_wallet: Wallet) -> Dict[str, Any]:
+def request_eth_from_faucet(agent_wallet: "Wallet") -> Dict[str, Any]:
     """Request ETH from testnet faucet"""
     try:
         if agent_wallet.network_id == "base-mainnet":
@@ -131,7 +133,7 @@ def request_eth_from_faucet(agent_wallet: Wallet) -> Dict[str, Any]:
         raise Exception(f"Failed to request from faucet: {str(e)}")
 
 
-def deploy_nft(agent_wallet: Wallet, name: str, symbol: str, base_uri: str) -> Dict[str, Any]:
+def deploy_nft(agent_wallet: "Wallet", name: str, symbol: str, base_uri: str) -> Dict[str, Any]:
     """Deploy an ERC-721 NFT contract"""
     try:
         deployed_nft = agent_wallet.deploy_nft(name, symbol, base_uri)
@@ -148,7 +150,7 @@ def deploy_nft(agent_wallet: Wallet, name: str, symbol: str, base_uri: str) -> D
         raise Exception(f"Failed to deploy NFT: {str(e)}")
 
 
-def mint_nft(agent_wallet: Wallet, contract_address: str, mint_to: str) -> Dict[str, Any]:
+def mint_nft(agent_wallet: "Wallet", contract_address: str, mint_to: str) -> Dict[str, Any]:
     """Mint an NFT to an address"""
     try:
         mint_args = {"to": mint_to, "quantity": "1"}
@@ -167,7 +169,9 @@ def mint_nft(agent_wallet: Wallet, contract_address: str, mint_to: str) -> Dict[
         raise Exception(f"Failed to mint NFT: {str(e)}")
 
 
-def register_basename(agent_wallet: Wallet, basename: str, amount: float = 0.002) -> Dict[str, Any]:
+def register_basename(
+    agent_wallet: "Wallet", basename: str, amount: float = 0.002
+) -> Dict[str, Any]:
     """Register a basename for the agent's wallet"""
     try:
         address_id = agent_wallet.default_address.address_id
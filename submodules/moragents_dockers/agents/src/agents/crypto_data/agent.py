@@ -1,11 +1,27 @@
+import asyncio
 import json
 import logging
 
 from src.agents.crypto_data import tools
+from src.agents.crypto_data.config import Config
 from src.models.messages import ChatRequest
+from src.utils.concurrency import run_in_thread
 
 logger = logging.getLogger(__name__)
 
+# Tools whose lookups across coins are grouped into one batched request
+BATCHED_TOOLS = {
+    "get_price": tools.get_coin_prices_tool,
+    "get_market_cap": tools.get_coin_market_caps_tool,
+}
+
+# Remaining tools mapped to their implementation and argument name
+SINGLE_TOOLS = {
+    "get_floor_price": (tools.get_nft_floor_price_tool, "nft_name"),
+    "get_fdv": (tools.get_fully_diluted_valuation_tool, "coin_name"),
+    "get_tvl": (tools.get_protocol_total_value_locked_tool, "protocol_name"),
+}
+
 
 class CryptoDataAgent:
     def __init__(self, config, llm, embeddings):
@@ -14,7 +30,7 @@ class CryptoDataAgent:
         self.embeddings = embeddings
         self.tools_provided = tools.get_tools()
 
-    def get_response(self, message):
+    async def get_response(self, message):
         system_prompt = (
             "Don't make assumptions about the value of the arguments for the function "
             "they should always be supplied by the user and do not alter the value of the arguments. "
@@ -32,39 +48,15 @@ class CryptoDataAgent:
         llm_with_tools = self.llm.bind_tools(self.tools_provided)
 
         try:
-            result = llm_with_tools.invoke(messages)
+            result = await llm_with_tools.ainvoke(messages)
             logger.info("Received response from LLM: %s", result)
 
             if result.tool_calls:
-                tool_call = result.tool_calls[0]
-                func_name = tool_call.get("name")
-                args = tool_call.get("args")
-                logger.info("LLM suggested using tool: %s", func_name)
-
-                response_data = {"data": None, "coinId": None}
-
-                if func_name == "get_price":
-                    response_data["data"] = tools.get_coin_price_tool(args["coin_name"])
-                    response_data["coinId"] = tools.get_tradingview_symbol(
-                        tools.get_coingecko_id(args["coin_name"])
-                    )
-                    return response_data, "assistant"
-                elif func_name == "get_floor_price":
-                    response_data["data"] = tools.get_nft_floor_price_tool(args["nft_name"])
-                    return response_data, "assistant"
-                elif func_name == "get_fdv":
-                    response_data["data"] = tools.get_fully_diluted_valuation_tool(
-                        args["coin_name"]
-                    )
-                    return response_data, "assistant"
-                elif func_name == "get_tvl":
-                    response_data["data"] = tools.get_protocol_total_value_locked_tool(
-                        args["protocol_name"]
-                    )
-                    return response_data, "assistant"
-                elif func_name == "get_market_cap":
-                    response_data["data"] = tools.get_coin_market_cap_tool(args["coin_name"])
-                    return response_data, "assistant"
+                logger.info(
+                    "LLM suggested using tools: %s",
+                    [tool_call.get("name") for tool_call in result.tool_calls],
+                )
+                return await self.execute_tool_calls(result.tool_calls), "assistant"
             else:
                 logger.info("LLM provided a direct response without using tools")
                 return {"data": result.content, "coinId": None}, "assistant"
@@ -72,11 +64,121 @@ class CryptoDataAgent:
             logger.error(f"Error in get_response: {str(e)}")
             raise e
 
-    def generate_response(self, prompt):
-        response, role = self.get_response([prompt])
+    async def execute_tool_calls(self, tool_calls):
+        """
+        Execute every tool call the LLM returned.
+
+        Price and market cap lookups are grouped so all coins are fetched with one
+        batched request per metric; the remaining tool calls run concurrently.
+        Messages are returned in the order the tool calls were made.
+        """
+        batches = {
+            func_name: [
+                tool_call["args"]["coin_name"]
+                for tool_call in tool_calls
+                if tool_call.get("name") == func_name
+            ]
+            for func_name in BATCHED_TOOLS
+        }
+        coin_ids, unresolved = await self._resolve_coin_ids(
+            [name for names in batches.values() for name in names]
+        )
+        batch_funcs = [func_name for func_name, names in batches.items() if names]
+        single_calls = [
+            tool_call for tool_call in tool_calls if tool_call.get("name") in SINGLE_TOOLS
+        ]
+
+        results = await asyncio.gather(
+            *(
+                self._run_batched(func_name, batches[func_name], coin_ids)
+                for func_name in batch_funcs
+            ),
+            *(self._run_single(tool_call) for tool_call in single_calls),
+        )
+        batch_messages = dict(zip(batch_funcs, results))
+        single_messages = results[len(batch_funcs) :]
+        messages = self._order_messages(tool_calls, batch_messages, single_messages, unresolved)
+
+        # The chart follows the first coin whose price was asked for
+        charted_id = next((coin_ids[name] for name in batches["get_price"] if coin_ids[name]), None)
+        return {"data": "\n".join(messages), "coinId": await self._chart_symbol(charted_id)}
+
+    @staticmethod
+    async def _resolve_coin_ids(coin_names):
+        """
+        Look up the CoinGecko ids of coin names concurrently.
+
+        Returns:
+            The id of each name (None if unknown or the lookup failed) and the names
+            whose lookup failed, which aren't invalid as the API was unreachable
+        """
+        coin_names = list(dict.fromkeys(coin_names))
+        resolved = await asyncio.gather(
+            *(run_in_thread(tools.get_coingecko_id, name) for name in coin_names),
+            return_exceptions=True,
+        )
+        coin_ids = {
+            name: None if isinstance(coin_id, Exception) else coin_id
+            for name, coin_id in zip(coin_names, resolved)
+        }
+        unresolved = {
+            name for name, coin_id in zip(coin_names, resolved) if isinstance(coin_id, Exception)
+        }
+        return coin_ids, unresolved
+
+    # A failing tool reports an API error instead of failing the whole answer
+    @staticmethod
+    async def _run_batched(func_name, names, coin_ids):
+        try:
+            return await run_in_thread(BATCHED_TOOLS[func_name], names, coin_ids)
+        except Exception as e:
+            logger.error(f"Tool {func_name} failed: {str(e)}", exc_info=True)
+            return [Config.API_ERROR_MESSAGE] * len(names)
+
+    @staticmethod
+    async def _run_single(tool_call):
+        func, arg_name = SINGLE_TOOLS[tool_call["name"]]
+        try:
+            return await run_in_thread(func, tool_call["args"][arg_name])
+        except Exception as e:
+            logger.error(f"Tool {tool_call['name']} failed: {str(e)}", exc_info=True)
+            return Config.API_ERROR_MESSAGE
+
+    @staticmethod
+    def _order_messages(tool_calls, batch_messages, single_messages, unresolved):
+        """Put the tool messages back in the order the tool calls were made"""
+        batch_messages = {func_name: iter(results) for func_name, results in batch_messages.items()}
+        single_messages = iter(single_messages)
+        messages = []
+        for tool_call in tool_calls:
+            func_name = tool_call.get("name")
+            if func_name in BATCHED_TOOLS:
+                message = next(batch_messages[func_name])
+                if tool_call["args"]["coin_name"] in unresolved:
+                    message = Config.API_ERROR_MESSAGE
+                messages.append(message)
+            elif func_name in SINGLE_TOOLS:
+                messages.append(next(single_messages))
+            else:
+                logger.warning("LLM requested unknown tool: %s", func_name)
+        return messages
+
+    @staticmethod
+    async def _chart_symbol(coin_id):
+        """Get the TradingView symbol charted for a coin, None if there is none"""
+        if not coin_id:
+            return None
+        try:
+            return await run_in_thread(tools.get_tradingview_symbol, coin_id)
+        except Exception as e:
+            logger.error(f"Failed to get chart symbol for {coin_id}: {str(e)}")
+            return None
+
+    async def generate_response(self, prompt):
+        response, role = await self.get_response([prompt])
         return response, role
 
-    def chat(self, request: ChatRequest):
+    async def chat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data:
@@ -85,7 +187,7 @@ class CryptoDataAgent:
                     "Received chat request with prompt: %s",
                     prompt[:50] + "..." if len(prompt) > 50 else prompt,
                 )
-                response, role = self.generate_response(prompt)
+                response, role = await self.generate_response(prompt)
                 return {"role": role, "content": response}
             else:
                 logger.warning("Received chat request without 'prompt' in data")
@@ -0,0 +1,278 @@
+import difflib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from src.agents.crypto_data.config import Config
+from src.utils.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase and drop everything but letters and digits so aliases share a key"""
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+class CoinIndex:
+    """
+    Local index of CoinGecko coins and NFTs used to resolve ids without a network call.
+
+    The coin and NFT lists are bulk-loaded from CoinGecko, persisted to disk and
+    refreshed in the background once they are older than the refresh interval.
+    Refresh requests are spaced out to stay under CoinGecko's rate limit, and a
+    failed page keeps what was already fetched rather than dropping the refresh.
+    Lookups go through in-memory dictionaries keyed by id, symbol and name (plus a
+    punctuation-insensitive alias of each). When several coins share a key, the one
+    with the best market cap rank wins. Misspellings fall back to fuzzy matching
+    against keys that start with the same character.
+
+    Attributes:
+        index_path (str): JSON file the index is persisted to
+        refresh_interval (float): Seconds before the index is considered stale
+        fetched_at (float): Unix time the index was fetched, 0 if never
+    """
+
+    def __init__(self, index_path: str, refresh_interval: float) -> None:
+        self.index_path = index_path
+        self.refresh_interval = refresh_interval
+        self.fetched_at = 0.0
+
+        self._coins: Dict[str, List[str]] = {}
+        self._nfts: Dict[str, List[str]] = {}
+        self._coin_buckets: Dict[str, List[str]] = {}
+        self._nft_buckets: Dict[str, List[str]] = {}
+        self._symbols: Dict[str, str] = {}
+        self._nft_entries: List[Dict] = []
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._refreshing = False
+        self._next_refresh_at = 0.0
+
+    def resolve(self, text: str, type: str = "coin") -> Optional[str]:
+        """
+        Resolve a coin or NFT name, symbol or id to its CoinGecko id.
+
+        Args:
+            text (str): Name, symbol or id as typed by the user
+            type (str): "coin" or "nft"
+
+        Returns:
+            Optional[str]: The CoinGecko id, None if the index has no match
+        """
+        self._ensure_fresh()
+        if type == "coin":
+            keys, buckets = self._coins, self._coin_buckets
+        elif type == "nft":
+            keys, buckets = self._nfts, self._nft_buckets
+        else:
+            raise ValueError("Invalid type specified")
+
+        exact = text.strip().lower()
+        if exact in keys:
+            return keys[exact][0]
+
+        alias = normalize_name(text)
+        if not alias:
+            return None
+        if alias in keys:
+            return keys[alias][0]
+
+        matches = difflib.get_close_matches(
+            alias, buckets.get(alias[0], []), n=1, cutoff=Config.COIN_INDEX_FUZZY_CUTOFF
+        )
+        return keys[matches[0]][0] if matches else None
+
+    def get_symbol(self, coin_id: str) -> Optional[str]:
+        """Get the ticker symbol of a coin id"""
+        self._ensure_fresh()
+        return self._symbols.get(coin_id)
+
+    def is_ready(self) -> bool:
+        """Check whether the index has data to resolve against"""
+        self._ensure_fresh()
+        return bool(self._coins)
+
+    def build(self, coins: List[Dict], nfts: List[Dict], fetched_at: float) -> None:
+        """
+        Rebuild the lookup structures.
+
+        Args:
+            coins (List[Dict]): Coins with id, symbol, name and optional market cap rank
+            nfts (List[Dict]): NFT collections with id, symbol and name
+            fetched_at (float): Unix time the lists were fetched
+        """
+        ranked_coins = sorted(coins, key=lambda coin: coin.get("rank") or float("inf"))
+        coin_keys = self._build_keys(ranked_coins)
+        nft_keys = self._build_keys(nfts)
+        symbols = {coin["id"]: coin["symbol"] for coin in coins if coin.get("symbol")}
+
+        with self._lock:
+            self._coins, self._coin_buckets = coin_keys, self._build_buckets(coin_keys)
+            self._nfts, self._nft_buckets = nft_keys, self._build_buckets(nft_keys)
+            self._symbols = symbols
+            self._nft_entries = nfts
+            self.fetched_at = fetched_at
+            self._next_refresh_at = fetched_at + self.refresh_interval
+        logger.info(f"Coin index built with {len(coins)} coins and {len(nfts)} NFTs")
+
+    @staticmethod
+    def _build_keys(entries: List[Dict]) -> Dict[str, List[str]]:
+        """
+        Map each id, symbol and name (and their aliases) to ids.
+
+        Entries must be passed best ranked first. A ranked entry keeps priority on
+        any key it matches; among unranked entries an exact id wins over a symbol or
+        name that happens to collide with it.
+        """
+        keys: Dict[str, List[str]] = {}
+        for entry in entries:
+            for value in (entry["id"], entry.get("symbol"), entry.get("name")):
+                if not value:
+                    continue
+                for key in {value.strip().lower(), normalize_name(value)}:
+                    if key and entry["id"] not in keys.setdefault(key, []):
+                        keys[key].append(entry["id"])
+
+        ranked = {entry["id"] for entry in entries if entry.get("rank")}
+        for entry in entries:
+            ids = keys[entry["id"].strip().lower()]
+            if ids[0] != entry["id"] and ids[0] not in ranked:
+                ids.insert(0, ids.pop(ids.index(entry["id"])))
+        return keys
+
+    @staticmethod
+    def _build_buckets(keys: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        buckets: Dict[str, List[str]] = {}
+        for key in keys:
+            if key.isalnum():
+                buckets.setdefault(key[0], []).append(key)
+        return buckets
+
+    def load(self) -> bool:
+        """Load the persisted index from disk, returns False if there is none"""
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            self.build(data["coins"], data["nfts"], data["fetched_at"])
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.error(f"Failed to load coin index from {self.index_path}: {str(e)}")
+            return False
+
+    def save(self, coins: List[Dict], nfts: List[Dict], fetched_at: float) -> None:
+        """Persist the index atomically so a crash never leaves a partial file"""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"fetched_at": fetched_at, "coins": coins, "nfts": nfts}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self) -> None:
+        """
+        Fetch the coin and NFT lists from CoinGecko, rebuild and persist the index.
+
+        Coins are indexed and saved before any NFT page is fetched, so a failed NFT
+        page never costs the coin list. NFTs fetched before a failure only replace
+        the previous collections if there are more of them.
+        """
+        coins = self._fetch_coins()
+        with self._lock:
+            nfts = self._nft_entries
+        self.build(coins, nfts, time.time())
+        self.save(coins, nfts, self.fetched_at)
+
+        fetched_nfts, complete = self._fetch_nfts()
+        if complete or len(fetched_nfts) > len(nfts):
+            self.build(coins, fetched_nfts, self.fetched_at)
+            self.save(coins, fetched_nfts, self.fetched_at)
+
+    @staticmethod
+    def _get(path: str, params: Optional[Dict] = None) -> Any:
+        # Spaced out so a refresh doesn't trip the free tier's rate limit
+        time.sleep(Config.COIN_INDEX_REQUEST_INTERVAL)
+        response = http_client.get(f"{Config.COINGECKO_BASE_URL}{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_coins(self) -> List[Dict]:
+        coins = [
+            {"id": coin["id"], "symbol": coin.get("symbol"), "name": coin.get("name")}
+            for coin in self._get("/coins/list")
+        ]
+
+        # Market cap ranks break ties between coins sharing a symbol or name
+        ranks = {}
+        for page in range(1, Config.COIN_INDEX_RANKED_PAGES + 1):
+            params = {"vs_currency": "usd", "order": "market_cap_desc", "per_page": 250}
+            try:
+                markets = self._get("/coins/markets", {**params, "page": page})
+            except requests.RequestException as e:
+                logger.warning(f"Stopped fetching market cap ranks at page {page}: {str(e)}")
+                break
+            for market in markets:
+                if market.get("market_cap_rank"):
+                    ranks[market["id"]] = market["market_cap_rank"]
+        for coin in coins:
+            coin["rank"] = ranks.get(coin["id"])
+        return coins
+
+    def _fetch_nfts(self) -> Tuple[List[Dict], bool]:
+        """Fetch the NFT list, returns the NFTs and whether every page was fetched"""
+        nfts = []
+        for page in range(1, Config.COIN_INDEX_NFT_PAGES + 1):
+            try:
+                batch = self._get("/nfts/list", {"per_page": 250, "page": page})
+            except requests.RequestException as e:
+                logger.warning(f"Stopped fetching NFTs at page {page}: {str(e)}")
+                return nfts, False
+            nfts.extend(
+                {"id": nft["id"], "symbol": nft.get("symbol"), "name": nft.get("name")}
+                for nft in batch
+            )
+            if len(batch) < 250:
+                break
+        return nfts, True
+
+    def _ensure_fresh(self) -> None:
+        """Load from disk on first use and refresh in the background once stale"""
+        if not self._loaded:
+            with self._lock:
+                first_use = not self._loaded
+                self._loaded = True
+            if first_use:
+                self.load()
+
+        if time.time() >= self._next_refresh_at:
+            self._start_refresh()
+
+    def _start_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh coin index: {str(e)}")
+                with self._lock:
+                    self._next_refresh_at = time.time() + Config.COIN_INDEX_RETRY_INTERVAL
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="coin-index-refresh", daemon=True).start()
+
+
+# Create an instance to act as a singleton store
+coin_index = CoinIndex(Config.COIN_INDEX_PATH, Config.COIN_INDEX_REFRESH_INTERVAL)
@@ -1,4 +1,7 @@
 import logging
+import os
+
+from src.config import Config as AppConfig
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -21,3 +24,32 @@ class Config:
     MARKET_CAP_SUCCESS_MESSAGE = "The market cap of {coin_name} is ${market_cap:,}"
     MARKET_CAP_FAILURE_MESSAGE = "Failed to retrieve market cap. Please enter a valid coin name."
     API_ERROR_MESSAGE = "I can't seem to access the API at the moment."
+
+    # Local CoinGecko coin/NFT index
+    COIN_INDEX_PATH = os.path.join(AppConfig.AGENTS_DATA_DIR, "coingecko_index.json")
+    COIN_INDEX_REFRESH_INTERVAL = 24 * 60 * 60  # Seconds before the index is refetched
+    COIN_INDEX_RETRY_INTERVAL = 5 * 60  # Seconds to wait after a failed refresh
+    COIN_INDEX_RANKED_PAGES = 4  # Pages of 250 coins fetched by market cap for tie-breaking
+    COIN_INDEX_NFT_PAGES = 20  # Upper bound on pages of 250 NFTs fetched
+    COIN_INDEX_REQUEST_INTERVAL = 2.5  # Seconds between refresh requests, under the free tier limit
+    COIN_INDEX_FUZZY_CUTOFF = 0.85  # Minimum similarity ratio for fuzzy name matches
+    SEARCH_CACHE_SIZE = 1024  # /search results cached for names the index can't resolve
+    SEARCH_CACHE_TTL = 60 * 60  # Seconds
+
+    # Local DefiLlama protocol snapshot and name matcher
+    PROTOCOL_INDEX_PATH = os.path.join(AppConfig.AGENTS_DATA_DIR, "defillama_protocols.joblib")
+    PROTOCOL_INDEX_REFRESH_INTERVAL = 6 * 60 * 60  # Seconds before the snapshot is refetched
+    PROTOCOL_INDEX_RETRY_INTERVAL = 5 * 60  # Seconds to wait after a failed refresh
+    PROTOCOL_INDEX_NGRAM_RANGE = (2, 4)  # Character n-grams used to match protocol names
+    TVL_FETCH_WORKERS = 8  # Concurrent /tvl requests when candidates can't be ranked locally
+
+    # Market data cache: seconds each metric is served fresh from cache
+    MARKET_CACHE_TTLS = {
+        "price": 30,
+        "market_cap": 60,
+        "floor_price": 120,
+        "fdv": 300,
+        "tvl": 300,
+    }
+    MARKET_CACHE_STALE_TTL = 120  # Further seconds a stale value is served while it refreshes
+    MARKET_CACHE_SIZE = 4096
@@ -0,0 +1,29 @@
+from src.agents.crypto_data.config import Config
+from src.utils.cache import SingleFlightCache
+
+# Short-lived market data shared by concurrent questions about the same asset
+market_cache = SingleFlightCache(Config.MARKET_CACHE_SIZE)
+
+
+def cached(metric, key, loader):
+    """Serve a market data lookup through the cache using the metric's TTL."""
+    return market_cache.get_or_load(
+        (metric, key), loader, Config.MARKET_CACHE_TTLS[metric], Config.MARKET_CACHE_STALE_TTL
+    )
+
+
+def is_cached(metric, key):
+    """Check whether a fresh or stale value is cached."""
+    return market_cache.is_cached((metric, key))
+
+
+def cached_batch(metric, keys, loader):
+    """Share one batched lookup between concurrent requests for the same keys."""
+    return market_cache.get_or_load((metric, tuple(keys)), loader, Config.MARKET_CACHE_TTLS[metric])
+
+
+def store(metric, key, value):
+    """Cache a value obtained outside the cache, e.g. from a batched request."""
+    market_cache.set(
+        (metric, key), value, Config.MARKET_CACHE_TTLS[metric], Config.MARKET_CACHE_STALE_TTL
+    )
@@ -0,0 +1,230 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.agents.crypto_data.coin_index import normalize_name
+from src.agents.crypto_data.config import Config
+from src.utils.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+
+class ProtocolIndex:
+    """
+    Local snapshot of the DefiLlama protocol list with a prebuilt name matcher.
+
+    The `/protocols` list is fetched once, persisted to disk together with a
+    character n-gram TF-IDF matrix over protocol names, and refreshed in the
+    background once older than the refresh interval. Slugs, names and CoinGecko ids
+    resolve through an exact dictionary; anything else is matched by cosine
+    similarity against the prebuilt matrix. Candidates are ordered by the TVL
+    recorded in the snapshot, so picking the largest protocol needs no extra
+    requests.
+
+    Attributes:
+        index_path (str): File the snapshot and matrix are persisted to
+        refresh_interval (float): Seconds before the snapshot is considered stale
+        fetched_at (float): Unix time the snapshot was fetched, 0 if never
+    """
+
+    def __init__(self, index_path: str, refresh_interval: float) -> None:
+        self.index_path = index_path
+        self.refresh_interval = refresh_interval
+        self.fetched_at = 0.0
+
+        self._protocols: List[Dict] = []
+        self._exact: Dict[str, int] = {}
+        self._gecko_ids: Dict[str, int] = {}
+        self._vectorizer: Optional[TfidfVectorizer] = None
+        self._matrix = None
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._refreshing = False
+        self._next_refresh_at = 0.0
+        self._initial_load_lock = threading.Lock()
+
+    def lookup(self, text: str) -> Optional[Dict]:
+        """
+        Find a protocol by exact slug or name.
+
+        Args:
+            text (str): Protocol slug or name as typed by the user
+
+        Returns:
+            Optional[Dict]: The protocol with slug, name, gecko_id and snapshot tvl
+        """
+        self._ensure_fresh()
+        with self._lock:
+            protocols, exact = self._protocols, self._exact
+        index = exact.get(text.strip().lower())
+        if index is None:
+            index = exact.get(normalize_name(text))
+        return protocols[index] if index is not None else None
+
+    def lookup_gecko_id(self, gecko_id: str) -> Optional[Dict]:
+        """Find a protocol by its CoinGecko id"""
+        self._ensure_fresh()
+        with self._lock:
+            protocols, gecko_ids = self._protocols, self._gecko_ids
+        index = gecko_ids.get(gecko_id)
+        return protocols[index] if index is not None else None
+
+    def search(self, text: str, limit: int = 20, min_similarity: float = 0.5) -> List[Dict]:
+        """
+        Find protocols whose names resemble the text, largest snapshot TVL first.
+
+        Args:
+            text (str): Protocol name as typed by the user
+            limit (int): Maximum number of candidates considered
+            min_similarity (float): Minimum cosine similarity of a candidate
+
+        Returns:
+            List[Dict]: Matching protocols ordered by snapshot TVL
+        """
+        self._ensure_fresh()
+        with self._lock:
+            protocols, vectorizer, matrix = self._protocols, self._vectorizer, self._matrix
+        if vectorizer is None:
+            return []
+
+        similarities = (matrix @ vectorizer.transform([text.lower()]).T).toarray().ravel()
+        top = np.argsort(-similarities)[:limit]
+        candidates = [protocols[i] for i in top if similarities[i] > min_similarity]
+        return sorted(candidates, key=lambda protocol: protocol.get("tvl") or 0, reverse=True)
+
+    def ensure_ready(self) -> None:
+        """
+        Make sure a snapshot is available, fetching it synchronously the first time.
+
+        Raises:
+            requests.exceptions.RequestException: If the initial fetch fails
+        """
+        self._ensure_fresh()
+        if not self._protocols:
+            with self._initial_load_lock:
+                if not self._protocols:
+                    self.refresh()
+
+    def build(self, protocols: List[Dict], fetched_at: float, vectorizer=None, matrix=None) -> None:
+        """
+        Rebuild the lookup structures, fitting the name matcher unless one is given.
+
+        Args:
+            protocols (List[Dict]): Protocols with slug, name, gecko_id and tvl
+            fetched_at (float): Unix time the snapshot was fetched
+            vectorizer (Optional[TfidfVectorizer]): Previously fitted matcher
+            matrix: TF-IDF matrix of protocol names produced by the vectorizer
+        """
+        if vectorizer is None or matrix is None:
+            vectorizer = TfidfVectorizer(
+                analyzer="char_wb", ngram_range=Config.PROTOCOL_INDEX_NGRAM_RANGE
+            )
+            matrix = vectorizer.fit_transform([protocol["name"].lower() for protocol in protocols])
+
+        # Larger protocols claim a shared key, so iterate smallest first and overwrite
+        exact: Dict[str, int] = {}
+        gecko_ids: Dict[str, int] = {}
+        by_tvl = sorted(range(len(protocols)), key=lambda i: protocols[i].get("tvl") or 0)
+        for i in by_tvl:
+            protocol = protocols[i]
+            for value in (protocol["slug"], protocol["name"]):
+                if value:
+                    exact[value.strip().lower()] = i
+                    exact[normalize_name(value)] = i
+            if protocol.get("gecko_id"):
+                gecko_ids[protocol["gecko_id"]] = i
+
+        with self._lock:
+            self._protocols = protocols
+            self._exact = exact
+            self._gecko_ids = gecko_ids
+            self._vectorizer = vectorizer
+            self._matrix = matrix
+            self.fetched_at = fetched_at
+            self._next_refresh_at = fetched_at + self.refresh_interval
+        logger.info(f"Protocol index built with {len(protocols)} protocols")
+
+    def load(self) -> bool:
+        """Load the persisted snapshot and matrix, returns False if there is none"""
+        try:
+            data = joblib.load(self.index_path)
+            self.build(data["protocols"], data["fetched_at"], data["vectorizer"], data["matrix"])
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.error(f"Failed to load protocol index from {self.index_path}: {str(e)}")
+            return False
+
+    def save(self) -> None:
+        """Persist the snapshot and matrix atomically"""
+        with self._lock:
+            data = {
+                "fetched_at": self.fetched_at,
+                "protocols": self._protocols,
+                "vectorizer": self._vectorizer,
+                "matrix": self._matrix,
+            }
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        joblib.dump(data, tmp_path)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self) -> None:
+        """Fetch the protocol list from DefiLlama, rebuild and persist the index"""
+        response = http_client.get(f"{Config.DEFILLAMA_BASE_URL}/protocols")
+        response.raise_for_status()
+        protocols = [
+            {
+                "slug": item["slug"],
+                "name": item["name"],
+                "gecko_id": item.get("gecko_id"),
+                "tvl": item.get("tvl"),
+            }
+            for item in response.json()
+            if item.get("slug") and item.get("name")
+        ]
+        self.build(protocols, time.time())
+        self.save()
+
+    def _ensure_fresh(self) -> None:
+        """Load from disk on first use and refresh in the background once stale"""
+        if not self._loaded:
+            with self._lock:
+                first_use = not self._loaded
+                self._loaded = True
+            if first_use:
+                self.load()
+
+        # Without a snapshot, ensure_ready fetches it synchronously instead
+        if self._protocols and time.time() >= self._next_refresh_at:
+            self._start_refresh()
+
+    def _start_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh protocol index: {str(e)}")
+                with self._lock:
+                    self._next_refresh_at = time.time() + Config.PROTOCOL_INDEX_RETRY_INTERVAL
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="protocol-index-refresh", daemon=True).start()
+
+
+# Create an instance to act as a singleton store
+protocol_index = ProtocolIndex(Config.PROTOCOL_INDEX_PATH, Config.PROTOCOL_INDEX_REFRESH_INTERVAL)
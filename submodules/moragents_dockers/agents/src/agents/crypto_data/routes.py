@@ -1,7 +1,8 @@
 import logging
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.stores import agent_manager_instance, session_manager_instance
+from src.agents.crypto_data.market_cache import market_cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,8 @@ async def process_data(data: dict):
             )
 
         response = await crypto_agent.process_data(data)
-        chat_manager_instance.add_message(response)
+        session = session_manager_instance.get_session(data.get("session_id"))
+        session.chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to process data: {str(e)}")
@@ -29,3 +31,9 @@ async def process_data(data: dict):
             status_code=500,
             content={"status": "error", "message": f"Failed to process data: {str(e)}"},
         )
+
+
+@router.get("/cache_stats")
+async def get_cache_stats():
+    """Get market data cache hit, stale-serve and coalescing metrics"""
+    return JSONResponse(content=market_cache.get_stats())
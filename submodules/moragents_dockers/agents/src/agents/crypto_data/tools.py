@@ -1,36 +1,48 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from src.agents.crypto_data.coin_index import coin_index, normalize_name
 from src.agents.crypto_data.config import Config
+from src.agents.crypto_data.market_cache import cached, cached_batch, is_cached, store
+from src.agents.crypto_data.protocol_index import protocol_index
+from src.utils.cache import TTLCache
+from src.utils.http_client import http_client
 
-
-def get_most_similar(text, data):
-    """Returns a list of most similar items based on cosine similarity."""
-    vectorizer = TfidfVectorizer()
-    sentence_vectors = vectorizer.fit_transform(data)
-    text_vector = vectorizer.transform([text])
-    similarity_scores = cosine_similarity(text_vector, sentence_vectors)
-    top_indices = similarity_scores.argsort()[0][-20:]
-    top_matches = [data[item] for item in top_indices if similarity_scores[0][item] > 0.5]
-    return top_matches
+# /search results for names the local index can't resolve
+_search_cache = TTLCache(Config.SEARCH_CACHE_SIZE, Config.SEARCH_CACHE_TTL)
+_MISSING = object()
 
 
 def get_coingecko_id(text, type="coin"):
-    """Get the CoinGecko ID for a given coin or NFT."""
+    """Get the CoinGecko ID for a given coin or NFT.
+
+    Resolves against the local coin index first and only falls back to the
+    CoinGecko search API (with cached results) when the index has no match.
+    """
+    coingecko_id = coin_index.resolve(text, type)
+    if coingecko_id:
+        return coingecko_id
+
+    cache_key = (normalize_name(text), type)
+    cached = _search_cache.get(cache_key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+
     url = f"{Config.COINGECKO_BASE_URL}/search"
     params = {"query": text}
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
         if type == "coin":
-            return data["coins"][0]["id"] if data["coins"] else None
+            coingecko_id = data["coins"][0]["id"] if data["coins"] else None
         elif type == "nft":
-            return data["nfts"][0]["id"] if data.get("nfts") else None
+            coingecko_id = data["nfts"][0]["id"] if data.get("nfts") else None
         else:
             raise ValueError("Invalid type specified")
+        _search_cache.set(cache_key, coingecko_id)
+        return coingecko_id
     except requests.exceptions.RequestException as e:
         logging.error(f"API request failed: {str(e)}")
         raise
@@ -38,9 +50,12 @@ def get_coingecko_id(text, type="coin"):
 
 def get_tradingview_symbol(coingecko_id):
     """Convert a CoinGecko ID to a TradingView symbol."""
+    symbol = coin_index.get_symbol(coingecko_id)
+    if symbol:
+        return f"CRYPTO:{symbol.upper()}USD"
     url = f"{Config.COINGECKO_BASE_URL}/coins/{coingecko_id}"
     try:
-        response = requests.get(url)
+        response = http_client.get(url)
         response.raise_for_status()
         data = response.json()
         symbol = data.get("symbol", "").upper()
@@ -50,15 +65,19 @@ def get_tradingview_symbol(coingecko_id):
         raise
 
 
-def get_price(coin):
+def get_price(coin, coin_id=None):
     """Get the price of a coin from CoinGecko API."""
-    coin_id = get_coingecko_id(coin, type="coin")
+    coin_id = coin_id or get_coingecko_id(coin, type="coin")
     if not coin_id:
         return None
+    return cached("price", coin_id, lambda: _fetch_price(coin_id))
+
+
+def _fetch_price(coin_id):
     url = f"{Config.COINGECKO_BASE_URL}/simple/price"
     params = {"ids": coin_id, "vs_currencies": "USD"}
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         return response.json()[coin_id]["usd"]
     except requests.exceptions.RequestException as e:
@@ -71,9 +90,13 @@ def get_floor_price(nft):
     nft_id = get_coingecko_id(str(nft), type="nft")
     if not nft_id:
         return None
+    return cached("floor_price", nft_id, lambda: _fetch_floor_price(nft_id))
+
+
+def _fetch_floor_price(nft_id):
     url = f"{Config.COINGECKO_BASE_URL}/nfts/{nft_id}"
     try:
-        response = requests.get(url)
+        response = http_client.get(url)
         response.raise_for_status()
         return response.json()["floor_price"]["usd"]
     except requests.exceptions.RequestException as e:
@@ -86,9 +109,13 @@ def get_fdv(coin):
     coin_id = get_coingecko_id(coin, type="coin")
     if not coin_id:
         return None
+    return cached("fdv", coin_id, lambda: _fetch_fdv(coin_id))
+
+
+def _fetch_fdv(coin_id):
     url = f"{Config.COINGECKO_BASE_URL}/coins/{coin_id}"
     try:
-        response = requests.get(url)
+        response = http_client.get(url)
         response.raise_for_status()
         data = response.json()
         return data.get("market_data", {}).get("fully_diluted_valuation", {}).get("usd")
@@ -102,10 +129,14 @@ def get_market_cap(coin):
     coin_id = get_coingecko_id(coin, type="coin")
     if not coin_id:
         return None
+    return cached("market_cap", coin_id, lambda: _fetch_market_cap(coin_id))
+
+
+def _fetch_market_cap(coin_id):
     url = f"{Config.COINGECKO_BASE_URL}/coins/markets"
     params = {"ids": coin_id, "vs_currency": "USD"}
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         return response.json()[0]["market_cap"]
     except requests.exceptions.RequestException as e:
@@ -113,28 +144,78 @@ def get_market_cap(coin):
         raise
 
 
-def get_protocols_list():
-    """Get the list of protocols from DefiLlama API."""
-    url = f"{Config.DEFILLAMA_BASE_URL}/protocols"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return (
-            [item["slug"] for item in data],
-            [item["name"] for item in data],
-            [item["gecko_id"] for item in data],
-        )
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to retrieve protocols list: {str(e)}")
-        raise
+def _get_batched(metric, coin_ids, fetch):
+    """
+    Get a metric for several coins, fetching the uncached ones with one batched request.
+
+    Cached coins go through the cache one by one, so stale values are served while
+    they refresh in the background. The rest are fetched together; concurrent
+    requests for the same set of coins share that one batched request.
+    """
+    values = {}
+    missing = []
+    for coin_id in dict.fromkeys(coin_ids):
+        if is_cached(metric, coin_id):
+            values[coin_id] = cached(
+                metric, coin_id, lambda coin_id=coin_id: fetch([coin_id]).get(coin_id)
+            )
+        else:
+            missing.append(coin_id)
+
+    if missing:
+        missing.sort()
+        fetched = cached_batch(metric, missing, lambda: fetch(missing))
+        for coin_id in missing:
+            if fetched.get(coin_id) is not None:
+                store(metric, coin_id, fetched[coin_id])
+            values[coin_id] = fetched.get(coin_id)
+    return values
+
+
+def get_prices(coin_ids):
+    """Get the USD prices of several coins with a single CoinGecko request."""
+    url = f"{Config.COINGECKO_BASE_URL}/simple/price"
+
+    def fetch(missing):
+        params = {"ids": ",".join(missing), "vs_currencies": "USD"}
+        try:
+            response = http_client.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            return {coin_id: data.get(coin_id, {}).get("usd") for coin_id in missing}
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to retrieve prices: {str(e)}")
+            raise
+
+    return _get_batched("price", coin_ids, fetch)
+
+
+def get_market_caps(coin_ids):
+    """Get the market caps of several coins with a single CoinGecko request."""
+    url = f"{Config.COINGECKO_BASE_URL}/coins/markets"
+
+    def fetch(missing):
+        params = {"ids": ",".join(missing), "vs_currency": "USD", "per_page": len(missing)}
+        try:
+            response = http_client.get(url, params=params)
+            response.raise_for_status()
+            return {market["id"]: market["market_cap"] for market in response.json()}
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to retrieve market caps: {str(e)}")
+            raise
+
+    return _get_batched("market_cap", coin_ids, fetch)
 
 
 def get_tvl_value(protocol_id):
     """Gets the TVL value using the protocol ID from DefiLlama API."""
+    return cached("tvl", protocol_id, lambda: _fetch_tvl_value(protocol_id))
+
+
+def _fetch_tvl_value(protocol_id):
     url = f"{Config.DEFILLAMA_BASE_URL}/tvl/{protocol_id}"
     try:
-        response = requests.get(url)
+        response = http_client.get(url)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -144,32 +225,33 @@ def get_tvl_value(protocol_id):
 
 def get_protocol_tvl(protocol_name):
     """Get the TVL (Total Value Locked) of a protocol from DefiLlama API."""
-    id, name, gecko = get_protocols_list()
-    tag = get_coingecko_id(protocol_name)
-    if tag:
-        protocol_id = next((i for i, j in zip(id, gecko) if j == tag), None)
-        if protocol_id:
-            return {tag: get_tvl_value(protocol_id)}
-    if not tag or not protocol_id:
-        res = get_most_similar(protocol_name, name)
-        if not res:
-            return None
-        else:
-            result = []
-            for item in res:
-                protocol_id = next((i for i, j in zip(id, name) if j == item), None)
-                tvl = get_tvl_value(protocol_id)
-                result.append({protocol_id: tvl})
-            if not result:
-                return None
-            max_key = max(result, key=lambda dct: dct.get(list(dct.keys())[0]))
-            return max_key
-
-
-def get_coin_price_tool(coin_name):
+    protocol_index.ensure_ready()
+    protocol = protocol_index.lookup(protocol_name)
+    if protocol is None:
+        tag = get_coingecko_id(protocol_name)
+        protocol = protocol_index.lookup_gecko_id(tag) if tag else None
+    if protocol is not None:
+        return {protocol["slug"]: get_tvl_value(protocol["slug"])}
+
+    candidates = protocol_index.search(protocol_name)
+    if not candidates:
+        return None
+    # Candidates are ordered by snapshot TVL, so the largest needs a single request
+    if candidates[0].get("tvl") is not None:
+        return {candidates[0]["slug"]: get_tvl_value(candidates[0]["slug"])}
+
+    # Without snapshot TVLs to rank by, fetch the candidates concurrently
+    slugs = [candidate["slug"] for candidate in candidates]
+    with ThreadPoolExecutor(max_workers=Config.TVL_FETCH_WORKERS) as pool:
+        tvls = list(pool.map(get_tvl_value, slugs))
+    best_slug, best_tvl = max(zip(slugs, tvls), key=lambda item: item[1] or 0)
+    return {best_slug: best_tvl}
+
+
+def get_coin_price_tool(coin_name, coin_id=None):
     """Get the price of a cryptocurrency."""
     try:
-        price = get_price(coin_name)
+        price = get_price(coin_name, coin_id)
         if price is None:
             return Config.PRICE_FAILURE_MESSAGE
         return Config.PRICE_SUCCESS_MESSAGE.format(coin_name=coin_name, price=price)
@@ -177,6 +259,30 @@ def get_coin_price_tool(coin_name):
         return Config.API_ERROR_MESSAGE
 
 
+def get_coin_prices_tool(coin_names, coin_ids):
+    """Get the prices of several cryptocurrencies with one batched request.
+
+    Args:
+        coin_names (List[str]): Coin names as asked by the user
+        coin_ids (Dict[str, Optional[str]]): Resolved CoinGecko id for each name
+
+    Returns:
+        List[str]: One message per coin name
+    """
+    try:
+        prices = get_prices([coin_ids[name] for name in coin_names if coin_ids.get(name)])
+    except requests.exceptions.RequestException:
+        return [Config.API_ERROR_MESSAGE] * len(coin_names)
+    return [
+        (
+            Config.PRICE_SUCCESS_MESSAGE.format(coin_name=name, price=prices[coin_ids[name]])
+            if prices.get(coin_ids.get(name)) is not None
+            else Config.PRICE_FAILURE_MESSAGE
+        )
+        for name in coin_names
+    ]
+
+
 def get_nft_floor_price_tool(nft_name):
     """Get the floor price of an NFT."""
     try:
@@ -222,6 +328,32 @@ def get_coin_market_cap_tool(coin_name):
         return Config.API_ERROR_MESSAGE
 
 
+def get_coin_market_caps_tool(coin_names, coin_ids):
+    """Get the market caps of several coins with one batched request.
+
+    Args:
+        coin_names (List[str]): Coin names as asked by the user
+        coin_ids (Dict[str, Optional[str]]): Resolved CoinGecko id for each name
+
+    Returns:
+        List[str]: One message per coin name
+    """
+    try:
+        market_caps = get_market_caps([coin_ids[name] for name in coin_names if coin_ids.get(name)])
+    except requests.exceptions.RequestException:
+        return [Config.API_ERROR_MESSAGE] * len(coin_names)
+    return [
+        (
+            Config.MARKET_CAP_SUCCESS_MESSAGE.format(
+                coin_name=name, market_cap=market_caps[coin_ids[name]]
+            )
+            if market_caps.get(coin_ids.get(name)) is not None
+            else Config.MARKET_CAP_FAILURE_MESSAGE
+        )
+        for name in coin_names
+    ]
+
+
 def get_tools():
     """Return a list of tools for the agent."""
     return [
@@ -34,7 +34,7 @@ class DCAAgent:
                     "needs_credentials": True,
                 }
 
-            active_wallet = wallet_manager_instance.get_active_wallet()
+            active_wallet = wallet_manager_instance.get_active_wallet(request.session_id)
             if not active_wallet:
                 return {
                     "role": "assistant",
@@ -33,7 +33,7 @@ async def create_strategy(data: dict):
                 Decimal(str(data["priceThreshold"])) if data.get("priceThreshold") else None
             ),
             pause_on_volatility=data.get("pauseOnVolatility", False),
-            wallet_id=wallet_manager_instance.active_wallet_id,
+            wallet_id=wallet_manager_instance.get_active_wallet_id(data.get("session_id")),
         )
 
         # Create workflow configuration
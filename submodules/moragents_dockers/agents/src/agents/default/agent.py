@@ -1,4 +1,5 @@
 import logging
+from typing import AsyncIterator, Dict, List
 
 from src.models.messages import ChatRequest
 from src.stores import agent_manager_instance
@@ -11,39 +12,46 @@ class DefaultAgent:
         self.config = config
         self.llm = llm
 
-    def chat(self, request: ChatRequest):
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        # Get currently selected agents for system prompt
+        available_agents = agent_manager_instance.get_available_agents()
+        selected_agent_names = agent_manager_instance.get_selected_agents()
+
+        # Build list of human readable names for selected agents
+        selected_agents_info = []
+        for agent in available_agents:
+            if agent["name"] in selected_agent_names and agent["name"] != "default":
+                human_name = agent.get("human_readable_name", agent["name"])
+                selected_agents_info.append(f"- {human_name}: {agent['description']}")
+
+        system_prompt = (
+            "You are a helpful assistant that can engage in general conversation and provide information about Morpheus agents when specifically asked.\n"
+            "For general questions, respond naturally without mentioning Morpheus or its agents.\n"
+            "Only when explicitly asked about Morpheus or its capabilities, use this list of available agents:\n"
+            f"{chr(10).join(selected_agents_info)}\n"
+            "Remember: Only mention Morpheus agents if directly asked about them. Otherwise, simply answer questions normally as a helpful assistant."
+        )
+
+        return [
+            {
+                "role": "system",
+                "content": system_prompt,
+            },
+            {"role": "user", "content": prompt},
+        ]
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[str]:
+        """Stream the response token by token"""
+        async for chunk in self.llm.astream(self._build_messages(request.prompt.content)):
+            if chunk.content:
+                yield chunk.content
+
+    async def chat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data:
                 prompt = data["prompt"]["content"]
-                # Get currently selected agents for system prompt
-                available_agents = agent_manager_instance.get_available_agents()
-                selected_agent_names = agent_manager_instance.get_selected_agents()
-
-                # Build list of human readable names for selected agents
-                selected_agents_info = []
-                for agent in available_agents:
-                    if agent["name"] in selected_agent_names and agent["name"] != "default":
-                        human_name = agent.get("human_readable_name", agent["name"])
-                        selected_agents_info.append(f"- {human_name}: {agent['description']}")
-
-                system_prompt = (
-                    "You are a helpful assistant that can engage in general conversation and provide information about Morpheus agents when specifically asked.\n"
-                    "For general questions, respond naturally without mentioning Morpheus or its agents.\n"
-                    "Only when explicitly asked about Morpheus or its capabilities, use this list of available agents:\n"
-                    f"{chr(10).join(selected_agents_info)}\n"
-                    "Remember: Only mention Morpheus agents if directly asked about them. Otherwise, simply answer questions normally as a helpful assistant."
-                )
-
-                messages = [
-                    {
-                        "role": "system",
-                        "content": system_prompt,
-                    },
-                    {"role": "user", "content": prompt},
-                ]
-
-                result = self.llm.invoke(messages)
+                result = await self.llm.ainvoke(self._build_messages(prompt))
                 return {"role": "assistant", "content": result.content.strip()}
             else:
                 return {"error": "Missing required parameters"}, 400
@@ -2,7 +2,7 @@ import json
 import logging
 
 from src.models.messages import ChatRequest
-import requests
+from src.utils.http_client import http_client
 from bs4 import BeautifulSoup as bs
 
 
@@ -39,7 +39,7 @@ class HotelFinderAgent:
                 }
 
                 # Fetch the webpage
-                response = requests.get(url, params=params, headers=headers)
+                response = http_client.get(url, params=params, headers=headers)
                 html = response.content
 
                 # Parse the HTML
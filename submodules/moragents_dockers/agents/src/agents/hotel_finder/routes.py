@@ -1,7 +1,7 @@
 import logging
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +21,8 @@ async def process_hotels(data: dict):
             )
 
         response = await hotel_finder.process_hotels(data)
-        chat_manager_instance.add_message(response)
+        session = session_manager_instance.get_session(data.get("session_id"))
+        session.chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to process hotels: {str(e)}")
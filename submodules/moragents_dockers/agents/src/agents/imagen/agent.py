@@ -2,7 +2,6 @@ import base64
 import logging
 from io import BytesIO
 
-import requests
 from PIL import Image
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -11,6 +10,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from src.models.messages import ChatRequest
+from src.utils.http_client import http_client
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -92,7 +92,7 @@ class ImagenAgent:
                         "https://fast-flux-demo.replicate.workers.dev/api/generate-image",
                     )
                 ):
-                    response = requests.get(img_src)
+                    response = http_client.get(img_src)
                     if response.status_code == 200:
                         img_data = response.content
                         return Image.open(BytesIO(img_data))
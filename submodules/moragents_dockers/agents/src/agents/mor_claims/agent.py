@@ -15,14 +15,14 @@ class MorClaimsAgent:
         self.tools_provided = tools.get_tools()
         self.conversation_state = {}
 
-    def _get_response(self, message, wallet_address):
+    def _get_response(self, message, wallet_address, session_id=None):
         if wallet_address not in self.conversation_state:
             self.conversation_state[wallet_address] = {"state": "initial"}
 
         state = self.conversation_state[wallet_address]["state"]
 
         if state == "initial":
-            agent_manager_instance.set_active_agent(self.agent_info["name"])
+            agent_manager_instance.set_active_agent(self.agent_info["name"], session_id)
 
             rewards = {
                 0: tools.get_current_user_reward(wallet_address, 0),
@@ -100,7 +100,9 @@ class MorClaimsAgent:
             if "prompt" in data and "wallet_address" in data:
                 prompt = data["prompt"]
                 wallet_address = data["wallet_address"]
-                response, role, next_turn_agent = self._get_response([prompt], wallet_address)
+                response, role, next_turn_agent = self._get_response(
+                    [prompt], wallet_address, request.session_id
+                )
                 return {
                     "role": role,
                     "content": response,
@@ -117,7 +119,7 @@ class MorClaimsAgent:
             data = request.dict()
             wallet_address = data["wallet_address"]
             transactions = self.conversation_state[wallet_address]["transactions"]
-            agent_manager_instance.clear_active_agent()
+            agent_manager_instance.clear_active_agent(data.get("session_id"))
             return {"transactions": transactions}
         except Exception as e:
             return {"error": str(e)}, 500
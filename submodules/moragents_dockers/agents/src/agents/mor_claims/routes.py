@@ -1,7 +1,8 @@
 import logging
+from typing import Optional
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -9,7 +10,7 @@ router = APIRouter(prefix="/claim", tags=["claim"])
 
 
 @router.post("/claim")
-async def claim(request: Request):
+async def claim(request: Request, session_id: Optional[str] = None):
     """Process a claim request"""
     logger.info("Received claim request")
     try:
@@ -21,7 +22,7 @@ async def claim(request: Request):
             )
 
         response = await claim_agent.claim(request)
-        chat_manager_instance.add_message(response)
+        session_manager_instance.get_session(session_id).chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to process claim: {str(e)}")
@@ -1,11 +1,19 @@
+import asyncio
 import logging
-import re
 
-import pyshorteners
+import requests
 
+from src.agents.news_agent.article_store import article_store
 from src.agents.news_agent.config import Config
-from src.agents.news_agent.tools import clean_html, fetch_rss_feed, is_within_time_window
+from src.agents.news_agent.tools import (
+    coin_matcher,
+    fetch_rss_feed,
+    parse_batch_relevance,
+    prefilter_articles,
+)
 from src.models.messages import ChatRequest
+from src.stores import link_manager_instance
+from src.utils.concurrency import run_in_thread
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +24,6 @@ class NewsAgent:
         self.llm = llm
         self.embeddings = embeddings
         self.tools_provided = self.get_tools()
-        self.url_shortener = pyshorteners.Shortener()
 
     def get_tools(self):
         return [
@@ -40,52 +47,152 @@ class NewsAgent:
             }
         ]
 
-    def check_relevance_and_summarize(self, title, content, coin):
+    async def check_relevance_and_summarize(self, title, content, coin):
         logger.info(f"Checking relevance for {coin}: {title}")
         prompt = Config.RELEVANCE_PROMPT.format(coin=coin, title=title, content=content)
-        result = self.llm.invoke(
+        result = await self.llm.ainvoke(
             input=[{"role": "user", "content": prompt}],
             max_tokens=Config.LLM_MAX_TOKENS,
             temperature=Config.LLM_TEMPERATURE,
         )
         return result.content.strip()
 
-    def process_rss_feed(self, feed_url, coin):
+    async def check_relevance_batch(self, articles, coin, semaphore):
+        """
+        Classify several articles with one LLM call.
+
+        Falls back to checking the articles one by one if the answer can't be parsed.
+        Returns one result per article, None for articles left unanswered.
+        """
+        logger.info(f"Checking relevance of {len(articles)} articles for {coin}")
+        numbered = "\n\n".join(
+            f"{i}. Title: {article['title']}\nContent: {article['content']}"
+            for i, article in enumerate(articles, start=1)
+        )
+        prompt = Config.BATCH_RELEVANCE_PROMPT.format(coin=coin, articles=numbered)
+        async with semaphore:
+            result = await self.llm.ainvoke(
+                input=[{"role": "user", "content": prompt}],
+                max_tokens=Config.LLM_MAX_TOKENS * len(articles),
+                temperature=Config.LLM_TEMPERATURE,
+            )
+        answers = parse_batch_relevance(result.content, len(articles))
+        if answers:
+            return [answers.get(i) for i in range(len(articles))]
+
+        logger.warning(f"Unparseable batched relevance answer for {coin}, checking one by one")
+
+        async def check(article):
+            async with semaphore:
+                return await self.check_relevance_and_summarize(
+                    article["title"], article["content"], coin
+                )
+
+        return await asyncio.gather(*(check(article) for article in articles))
+
+    async def get_feed_articles(self, feed_url):
+        """Get a feed's articles from the store, downloading the feed only once it's stale"""
+        articles = await run_in_thread(article_store.get_feed_articles, feed_url, Config.FEED_TTL)
+        if articles is not None:
+            return articles
+        feed = await run_in_thread(fetch_rss_feed, feed_url)
+        return await run_in_thread(article_store.save_feed, feed_url, feed.entries)
+
+    async def process_rss_feed(self, feed_url, ticker, coin, semaphore):
         logger.info(f"Processing RSS feed for {coin}: {feed_url}")
-        feed = fetch_rss_feed(feed_url)
-        results = []
-        for entry in feed.entries:
-            published_time = entry.get("published") or entry.get("updated")
-            if is_within_time_window(published_time):
-                title = clean_html(entry.title)
-                content = clean_html(entry.summary)
-                logger.info(f"Checking relevance for article: {title}")
-                result = self.check_relevance_and_summarize(title, content, coin)
-                if not result.upper().startswith("NOT RELEVANT"):
-                    results.append({"Title": title, "Summary": result, "Link": entry.link})
-                if len(results) >= Config.ARTICLES_PER_TOKEN:
-                    break
-            else:
-                logger.info(f"Skipping article: {entry.title} (published: {published_time})")
+        articles = await self.get_feed_articles(feed_url)
+        candidates = prefilter_articles(
+            articles, ticker, coin, limit=Config.MAX_CANDIDATES_PER_COIN
+        )
+        logger.info(f"{len(candidates)} of {len(articles)} articles pre-selected for {coin}")
+
+        # Stories judged earlier are answered from the store without an LLM call
+        verdicts = await run_in_thread(
+            article_store.get_verdicts,
+            [article["story_key"] for article in candidates],
+            coin,
+            Config.VERDICT_TTL,
+        )
+        unjudged = [article for article in candidates if article["story_key"] not in verdicts]
+
+        # Best candidates go first, so later batches are only needed if earlier ones fall short
+        for start in range(0, len(unjudged), Config.RELEVANCE_BATCH_SIZE):
+            found = sum(bool(verdicts.get(article["story_key"])) for article in candidates)
+            if found >= Config.ARTICLES_PER_TOKEN:
+                break
+            batch = unjudged[start : start + Config.RELEVANCE_BATCH_SIZE]
+            summaries = await self.check_relevance_batch(batch, coin, semaphore)
+            judged = {
+                article["story_key"]: (
+                    None if summary.upper().startswith("NOT RELEVANT") else summary
+                )
+                for article, summary in zip(batch, summaries)
+                if summary
+            }
+            verdicts.update(judged)
+            await run_in_thread(article_store.save_verdicts, coin, judged)
+
+        results = [
+            {
+                "Title": article["title"],
+                "Summary": verdicts[article["story_key"]],
+                "Link": article["link"],
+            }
+            for article in candidates
+            if verdicts.get(article["story_key"])
+        ]
         logger.info(f"Found {len(results)} relevant articles for {coin}")
         return results
 
-    def fetch_crypto_news(self, coins):
+    async def fetch_coin_news(self, ticker, semaphore):
+        """Find the latest relevant news about a coin and keep it as the coin's digest"""
+        coin_name = Config.CRYPTO_DICT.get(ticker, ticker)
+        google_news_url = Config.GOOGLE_NEWS_BASE_URL.format(coin_name)
+        results = await self.process_rss_feed(google_news_url, ticker, coin_name, semaphore)
+        digest = results[: Config.ARTICLES_PER_TOKEN]
+        await run_in_thread(article_store.save_digest, ticker, digest)
+        return digest
+
+    async def build_digests(self, tickers):
+        """
+        Refresh the news digests of several coins ahead of the chats asking for them.
+
+        A coin failing to refresh keeps its previous digest and doesn't stop the others.
+        """
+        logger.info(f"Building news digests for: {tickers}")
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_LLM_CALLS)
+        results = await asyncio.gather(
+            *(self.fetch_coin_news(ticker, semaphore) for ticker in tickers),
+            return_exceptions=True,
+        )
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to build news digest for {ticker}: {str(result)}")
+
+    async def fetch_crypto_news(self, coins):
         logger.info(f"Fetching news for coins: {coins}")
-        all_news = []
-        for coin in coins:
-            logger.info(f"Processing news for {coin}")
-            coin_name = Config.CRYPTO_DICT.get(coin.upper(), coin)
-            google_news_url = Config.GOOGLE_NEWS_BASE_URL.format(coin_name)
-            results = self.process_rss_feed(google_news_url, coin_name)
-            all_news.extend(
-                [{"Coin": coin, **result} for result in results[: Config.ARTICLES_PER_TOKEN]]
-            )
+        # Shared by all coins so one request never floods the LLM
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_LLM_CALLS)
+
+        async def fetch_coin(coin):
+            # A recent digest, usually built by the prefetch workflow, answers straight away
+            digest = await run_in_thread(article_store.get_digest, coin.upper(), Config.DIGEST_TTL)
+            if digest is None:
+                try:
+                    digest = await self.fetch_coin_news(coin.upper(), semaphore)
+                except requests.exceptions.RequestException as e:
+                    # One unreachable feed shouldn't fail the news for every other coin
+                    logger.error(f"Failed to fetch RSS feed for {coin}: {str(e)}")
+                    return []
+            return [{"Coin": coin, **item} for item in digest]
+
+        per_coin = await asyncio.gather(*(fetch_coin(coin) for coin in dict.fromkeys(coins)))
+        all_news = [item for news in per_coin for item in news]
 
         logger.info(f"Total news items fetched: {len(all_news)}")
         return all_news
 
-    def chat(self, request: ChatRequest):
+    async def chat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data:
@@ -93,11 +200,7 @@ class NewsAgent:
                 if isinstance(prompt, dict) and "content" in prompt:
                     prompt = prompt["content"]
 
-                # Updated coin detection logic
-                coins = re.findall(
-                    r"\b(" + "|".join(re.escape(key) for key in Config.CRYPTO_DICT.keys()) + r")\b",
-                    prompt.upper(),
-                )
+                coins = coin_matcher.find(prompt)
 
                 if not coins:
                     return {
@@ -106,7 +209,8 @@ class NewsAgent:
                         "next_turn_agent": None,
                     }
 
-                news = self.fetch_crypto_news(coins)
+                await run_in_thread(article_store.record_requests, coins)
+                news = await self.fetch_crypto_news(coins)
 
                 if not news:
                     return {
@@ -115,10 +219,14 @@ class NewsAgent:
                         "next_turn_agent": None,
                     }
 
+                link_ids = await run_in_thread(
+                    link_manager_instance.shorten_many, [item["Link"] for item in news]
+                )
+                short_urls = [link_manager_instance.short_url(link_id) for link_id in link_ids]
+
                 response = "Here are the latest news items relevant to changes in price movement of the mentioned tokens in the last 24 hours:\n\n"
-                for index, item in enumerate(news, start=1):
+                for index, (item, short_url) in enumerate(zip(news, short_urls), start=1):
                     coin_name = Config.CRYPTO_DICT.get(item["Coin"], item["Coin"])
-                    short_url = self.url_shortener.tinyurl.short(item["Link"])
                     response += f"{index}. ***{coin_name} News***:\n"
                     response += f"{item['Title']}\n"
                     response += f"{item['Summary']}\n"
@@ -0,0 +1,290 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from src.agents.news_agent.config import Config
+from src.agents.news_agent.tools import article_key, parse_entry
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleStore:
+    """
+    Local SQLite store of news articles and relevance verdicts.
+
+    Parsed feed entries are kept keyed by the hash of their canonical link, so a
+    refetched feed only parses entries it hasn't seen, and a feed fetched less
+    than `FEED_TTL` ago is served from the store without downloading it.
+    Relevance verdicts and summaries are stored per story and coin, where the
+    story key is a hash of the normalized headline; syndicated copies of a story
+    share a verdict, so the LLM judges each story once per coin until the
+    verdict expires.
+
+    Attributes:
+        db_path (str): SQLite database file
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    key TEXT PRIMARY KEY,
+                    story_key TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    published REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS feeds (
+                    url TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS feed_articles (
+                    url TEXT NOT NULL,
+                    article_key TEXT NOT NULL,
+                    PRIMARY KEY (url, article_key)
+                );
+                CREATE TABLE IF NOT EXISTS verdicts (
+                    story_key TEXT NOT NULL,
+                    coin TEXT NOT NULL,
+                    relevant INTEGER NOT NULL,
+                    summary TEXT,
+                    checked_at REAL NOT NULL,
+                    PRIMARY KEY (story_key, coin)
+                );
+                CREATE TABLE IF NOT EXISTS ticker_requests (
+                    ticker TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL,
+                    last_requested REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS digests (
+                    ticker TEXT PRIMARY KEY,
+                    items TEXT NOT NULL,
+                    built_at REAL NOT NULL
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def get_feed_articles(self, url: str, ttl: float) -> Optional[List[Dict]]:
+        """
+        Get the articles of a feed fetched recently enough.
+
+        Args:
+            url (str): Feed URL
+            ttl (float): Seconds a fetched feed stays fresh
+
+        Returns:
+            Optional[List[Dict]]: One article per story, newest first, None if the feed
+                must be fetched again
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT fetched_at FROM feeds WHERE url = ?", (url,)).fetchone()
+            if row is None or time.time() - row["fetched_at"] > ttl:
+                return None
+            rows = conn.execute(
+                "SELECT articles.* FROM feed_articles "
+                "JOIN articles ON articles.key = feed_articles.article_key "
+                "WHERE feed_articles.url = ? ORDER BY articles.published DESC",
+                (url,),
+            ).fetchall()
+        return self._unique_stories(dict(row) for row in rows)
+
+    def save_feed(self, url: str, entries: Iterable) -> List[Dict]:
+        """
+        Store a freshly fetched feed, parsing only entries not stored yet.
+
+        Args:
+            url (str): Feed URL
+            entries: Parsed RSS feed entries
+
+        Returns:
+            List[Dict]: One article per story, newest first
+        """
+        keys = {article_key(entry["link"]): entry for entry in entries if entry.get("link")}
+        with self._lock:
+            conn = self._connect()
+            placeholders = ", ".join("?" for _ in keys)
+            known = {
+                row["key"]: dict(row)
+                for row in conn.execute(
+                    f"SELECT * FROM articles WHERE key IN ({placeholders})", tuple(keys)
+                )
+            }
+
+        articles = list(known.values())
+        for key, entry in keys.items():
+            if key not in known:
+                article = parse_entry(entry)
+                if article is not None:
+                    articles.append(article)
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR IGNORE INTO articles VALUES "
+                "(:key, :story_key, :title, :content, :link, :published)",
+                articles,
+            )
+            conn.execute("DELETE FROM feed_articles WHERE url = ?", (url,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO feed_articles VALUES (?, ?)",
+                [(url, article["key"]) for article in articles],
+            )
+            conn.execute("INSERT OR REPLACE INTO feeds VALUES (?, ?)", (url, now))
+            self._prune(conn, now)
+            conn.commit()
+
+        articles.sort(key=lambda article: article["published"], reverse=True)
+        return self._unique_stories(articles)
+
+    def get_verdicts(
+        self, story_keys: List[str], coin: str, ttl: float
+    ) -> Dict[str, Optional[str]]:
+        """
+        Get unexpired relevance verdicts for stories about a coin.
+
+        Args:
+            story_keys (List[str]): Story keys to look up
+            coin (str): Coin the verdicts were given for
+            ttl (float): Seconds a verdict stays valid
+
+        Returns:
+            Dict[str, Optional[str]]: Summary per judged story, None for stories judged
+                not relevant
+        """
+        if not story_keys:
+            return {}
+        placeholders = ", ".join("?" for _ in story_keys)
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT story_key, relevant, summary FROM verdicts "
+                    f"WHERE coin = ? AND checked_at >= ? AND story_key IN ({placeholders})",
+                    (coin, time.time() - ttl, *story_keys),
+                )
+                .fetchall()
+            )
+        return {row["story_key"]: row["summary"] if row["relevant"] else None for row in rows}
+
+    def save_verdicts(self, coin: str, verdicts: Dict[str, Optional[str]]) -> None:
+        """Store relevance verdicts, a summary per relevant story and None for the rest"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, coin, summary is not None, summary, now)
+                    for key, summary in verdicts.items()
+                ],
+            )
+            conn.commit()
+
+    def record_requests(self, tickers: Iterable[str]) -> None:
+        """Count a request for news about each ticker"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT INTO ticker_requests VALUES (?, 1, ?) ON CONFLICT(ticker) "
+                "DO UPDATE SET count = count + 1, last_requested = excluded.last_requested",
+                [(ticker, now) for ticker in dict.fromkeys(tickers)],
+            )
+            conn.commit()
+
+    def get_top_tickers(self, limit: int) -> List[str]:
+        """Get the most requested tickers, most requested first"""
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT ticker FROM ticker_requests "
+                    "ORDER BY count DESC, last_requested DESC LIMIT ?",
+                    (limit,),
+                )
+                .fetchall()
+            )
+        return [row["ticker"] for row in rows]
+
+    def get_digest(self, ticker: str, max_age: float) -> Optional[List[Dict]]:
+        """
+        Get the latest news digest of a ticker.
+
+        Args:
+            ticker (str): Coin ticker, e.g. "BTC"
+            max_age (float): Seconds a digest stays usable
+
+        Returns:
+            Optional[List[Dict]]: News items with title, summary and link, None if there
+                is no digest recent enough
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT items, built_at FROM digests WHERE ticker = ?", (ticker,))
+                .fetchone()
+            )
+        if row is None or time.time() - row["built_at"] > max_age:
+            return None
+        return json.loads(row["items"])
+
+    def save_digest(self, ticker: str, items: List[Dict]) -> None:
+        """Replace the news digest of a ticker"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?)",
+                (ticker, json.dumps(items), time.time()),
+            )
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of stored articles, feeds, verdicts and digests"""
+        with self._lock:
+            conn = self._connect()
+            return {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("articles", "feeds", "verdicts", "digests")
+            }
+
+    @staticmethod
+    def _unique_stories(articles: Iterable[Dict]) -> List[Dict]:
+        """Keep the first article of every story"""
+        stories = {}
+        for article in articles:
+            stories.setdefault(article["story_key"], article)
+        return list(stories.values())
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, now: float) -> None:
+        cutoff = now - Config.ARTICLE_RETENTION
+        conn.execute(
+            "DELETE FROM feed_articles WHERE article_key IN "
+            "(SELECT key FROM articles WHERE published < ?)",
+            (cutoff,),
+        )
+        conn.execute("DELETE FROM articles WHERE published < ?", (cutoff,))
+        conn.execute("DELETE FROM verdicts WHERE checked_at < ?", (now - Config.VERDICT_TTL,))
+
+
+# Create an instance to act as a singleton store
+article_store = ArticleStore(Config.ARTICLE_STORE_PATH)
@@ -1,4 +1,7 @@
 import logging
+import os
+
+from src.config import Config as AppConfig
 
 logging.basicConfig(level=logging.INFO)
 
@@ -17,6 +20,46 @@ class Config:
     LLM_MAX_TOKENS = 150
     LLM_TEMPERATURE = 0.3
 
+    # Relevance checking
+    MAX_CANDIDATES_PER_COIN = 8  # Pre-filtered articles considered per coin
+    RELEVANCE_BATCH_SIZE = 4  # Articles classified in one LLM call
+    MAX_CONCURRENT_LLM_CALLS = 3  # Relevance calls in flight per request
+
+    # Local article store
+    ARTICLE_STORE_PATH = os.path.join(AppConfig.AGENTS_DATA_DIR, "news_articles.sqlite3")
+    FEED_TTL = 10 * 60  # Seconds a fetched feed is reused before downloading it again
+    VERDICT_TTL = 24 * 60 * 60  # Seconds a relevance verdict and summary stay valid
+    ARTICLE_RETENTION = 7 * 24 * 60 * 60  # Seconds articles are kept after publication
+
+    # Link query parameters that only track the reader, dropped when comparing links
+    TRACKING_PARAMETER_PREFIXES = ("utm_",)
+    TRACKING_PARAMETERS = {
+        "oc",
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "mc_cid",
+        "mc_eid",
+        "igshid",
+        "ref_src",
+        "cmpid",
+        "ocid",
+        "_ga",
+    }
+
+    # Background prefetch (the "news_prefetch" workflow action)
+    AGENT_NAME = "crypto news"  # Name the agent is registered under
+    PREFETCH_TOP_N = 10  # Most requested tickers prefetched per run
+    DIGEST_TTL = 30 * 60  # Seconds a prefetched digest answers chats before refetching
+
+    # Headlines matching these only report price moves and are dropped before the LLM
+    PRICE_ONLY_PATTERNS = [
+        r"\bprice (prediction|analysis|forecast|today|update)",
+        r"\btechnical analysis\b",
+        r"\b(rises|falls|drops|jumps|surges|slips|climbs) \d+(\.\d+)?%",
+    ]
+
     # Prompts
     RELEVANCE_PROMPT = (
         "Consider the following news article about {coin}:\n\n"
@@ -26,6 +69,68 @@ class Config:
         "If it's not relevant or only about price movements, respond with 'NOT RELEVANT'."
     )
 
+    BATCH_RELEVANCE_PROMPT = (
+        "Consider the following numbered news articles about {coin}:\n\n"
+        "{articles}\n\n"
+        "For each article, decide whether it is relevant to potential price impacts on the "
+        "cryptocurrency. Answer with one line per article, starting with its number. "
+        "If it is relevant, give a concise summary focused on how it might impact trading or "
+        "prices, e.g. '1: <summary>'. If it's not relevant or only about price movements, "
+        "answer 'NOT RELEVANT', e.g. '2: NOT RELEVANT'."
+    )
+
+    # Tickers and names that are also common words, only recognized with this exact casing
+    EXACT_CASE_MENTIONS = [
+        "ALGO",
+        "APT",
+        "AR",
+        "ATOM",
+        "BEAM",
+        "BONK",
+        "CORE",
+        "DOT",
+        "EIGEN",
+        "ETC",
+        "FLOW",
+        "GALA",
+        "GT",
+        "LEO",
+        "LINK",
+        "METH",
+        "NEAR",
+        "NOT",
+        "OM",
+        "ONDO",
+        "OP",
+        "RUNE",
+        "SEI",
+        "SUI",
+        "TAO",
+        "THETA",
+        "TON",
+        "UNI",
+        "VET",
+        "W",
+        "Beam",
+        "Bonk",
+        "Brett",
+        "Core",
+        "Flow",
+        "Gate",
+        "Helium",
+        "Immutable",
+        "Jupiter",
+        "MANTRA",
+        "Maker",
+        "Mantle",
+        "Optimism",
+        "Quant",
+        "Render",
+        "Stacks",
+        "Stellar",
+        "The Graph",
+    ]
+
     # Dictionary of top 100 popular tickers and their crypto names
     CRYPTO_DICT = {
         "BTC": "Bitcoin",
@@ -0,0 +1,51 @@
+import logging
+from typing import Any, Dict, List
+
+from src.agents.news_agent.article_store import article_store
+from src.agents.news_agent.config import Config
+from src.utils.concurrency import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+
+def select_prefetch_tickers(top_n: int) -> List[str]:
+    """
+    Pick the tickers worth prefetching, most requested first.
+
+    Only tickers in `Config.CRYPTO_DICT` are considered. Until enough tickers have
+    been asked for, the list is topped up in `CRYPTO_DICT` order.
+    """
+    requested = [
+        ticker
+        for ticker in article_store.get_top_tickers(top_n * 2)
+        if ticker in Config.CRYPTO_DICT
+    ]
+    tickers = list(dict.fromkeys(requested + list(Config.CRYPTO_DICT)))
+    return tickers[:top_n]
+
+
+class NewsPrefetchHandler:
+    """Handles news prefetch workflow actions"""
+
+    def __init__(self, agent_manager):
+        self.agent_manager = agent_manager
+
+    async def execute(self, params: Dict[str, Any]) -> None:
+        """
+        Refresh the news digests of the most requested tickers.
+
+        Args:
+            params (Dict[str, Any]): Optional "tickers" to prefetch, otherwise the
+                "top_n" most requested tickers (defaults to `Config.PREFETCH_TOP_N`)
+        """
+        agent = await self.agent_manager.get_agent_async(Config.AGENT_NAME)
+        if agent is None:
+            raise ValueError(f"Agent {Config.AGENT_NAME} is not available")
+
+        tickers = [ticker.upper() for ticker in params.get("tickers", [])]
+        if not tickers:
+            top_n = int(params.get("top_n", Config.PREFETCH_TOP_N))
+            tickers = await run_in_thread(select_prefetch_tickers, top_n)
+
+        await agent.build_digests(tickers)
+        logger.info(f"Prefetched news digests for {len(tickers)} tickers")
@@ -1,16 +1,24 @@
+import calendar
+import hashlib
 import logging
 import re
+import time
 import urllib.parse
-from datetime import datetime, timedelta
 from html import unescape
+from typing import Dict, List, Optional
 
 import feedparser
 import pytz
 from dateutil import parser
 from src.agents.news_agent.config import Config
+from src.utils.http_client import http_client
+from src.utils.ticker_matcher import TickerMatcher
 
 logger = logging.getLogger(__name__)
 
+# Built once at import, shared by every chat looking for coin mentions
+coin_matcher = TickerMatcher(Config.CRYPTO_DICT, exact_case=Config.EXACT_CASE_MENTIONS)
+
 
 def clean_html(raw_html):
     cleanr = re.compile("<.*?>")
@@ -20,20 +28,6 @@ def clean_html(raw_html):
     return cleantext
 
 
-def is_within_time_window(published_time, hours=24):
-    if not published_time:
-        return False
-    try:
-        pub_date = parser.parse(published_time, fuzzy=True)
-        now = datetime.now(pytz.UTC)
-        if pub_date.tzinfo is None:
-            pub_date = pub_date.replace(tzinfo=pytz.UTC)
-        return (now - pub_date) <= timedelta(hours=hours)
-    except Exception as e:
-        logger.error(f"Error parsing date: {str(e)} for date {published_time}")
-        return False
-
-
 def fetch_rss_feed(feed_url):
     # URL encode the query parameter
     parsed_url = urllib.parse.urlparse(feed_url)
@@ -43,7 +37,150 @@ def fetch_rss_feed(feed_url):
     encoded_query = urllib.parse.urlencode(query_params, doseq=True)
     encoded_url = urllib.parse.urlunparse(parsed_url._replace(query=encoded_query))
 
-    return feedparser.parse(encoded_url)
+    response = http_client.get(encoded_url)
+    response.raise_for_status()
+    return feedparser.parse(response.content)
+
+
+PRICE_ONLY_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in Config.PRICE_ONLY_PATTERNS]
+
+
+def _mentions(text, ticker, name_regex):
+    # Tickers are matched case-sensitively so short ones like "OP" or "W" don't hit plain words
+    return bool(re.search(rf"\b{re.escape(ticker)}\b", text) or name_regex.search(text))
+
+
+def _is_tracking_parameter(name: str) -> bool:
+    name = name.lower()
+    return name in Config.TRACKING_PARAMETERS or name.startswith(Config.TRACKING_PARAMETER_PREFIXES)
+
+
+def canonical_link(link: str) -> str:
+    """Drop tracking parameters and fragments so every copy of a link compares equal"""
+    parts = urllib.parse.urlsplit(link.strip())
+    query = urllib.parse.urlencode(
+        sorted(
+            (name, value)
+            for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_parameter(name)
+        )
+    )
+    return urllib.parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, "")
+    )
+
+
+def article_key(link: str) -> str:
+    """Hash of an article's canonical link"""
+    return hashlib.sha256(canonical_link(link).encode()).hexdigest()
+
+
+def story_key(title: str) -> str:
+    """Hash of a headline with casing and punctuation removed, shared by syndicated copies"""
+    words = re.findall(r"\w+", title.lower())
+    return hashlib.sha256(" ".join(words).encode()).hexdigest()
+
+
+def parse_entry(entry) -> Optional[Dict]:
+    """
+    Turn a feed entry into an article, parsing its date once.
+
+    Google News appends the publisher to headlines ("Title - Publisher"); it is
+    stripped so the same story from several publishers shares a story key.
+
+    Args:
+        entry: Parsed RSS feed entry
+
+    Returns:
+        Optional[Dict]: Article with key, story key, title, content, link and published
+            timestamp, None if the entry has no link or date
+    """
+    link = entry.get("link")
+    if not link:
+        return None
+
+    if entry.get("published_parsed") or entry.get("updated_parsed"):
+        published = calendar.timegm(entry.get("published_parsed") or entry.get("updated_parsed"))
+    else:
+        published_time = entry.get("published") or entry.get("updated")
+        try:
+            pub_date = parser.parse(published_time, fuzzy=True)
+        except Exception:
+            return None
+        if pub_date.tzinfo is None:
+            pub_date = pub_date.replace(tzinfo=pytz.UTC)
+        published = pub_date.timestamp()
+
+    title = clean_html(entry.get("title", ""))
+    source = (entry.get("source") or {}).get("title")
+    if source and title.endswith(f" - {source}"):
+        title = title[: -len(f" - {source}")]
+
+    return {
+        "key": article_key(link),
+        "story_key": story_key(title),
+        "title": title,
+        "content": clean_html(entry.get("summary", "")),
+        "link": link,
+        "published": published,
+    }
+
+
+def prefilter_articles(articles, ticker, coin_name, limit) -> List[Dict]:
+    """
+    Select the articles worth an LLM relevance check, without calling the LLM.
+
+    Articles outside the time window, not mentioning the coin by ticker or name, or
+    whose headline only reports a price move are dropped. The rest are ranked by
+    where the coin is mentioned (title before summary), then by recency.
+
+    Args:
+        articles (List[Dict]): Articles produced by `parse_entry`
+        ticker (str): Coin ticker, e.g. "BTC"
+        coin_name (str): Coin name, e.g. "Bitcoin"
+        limit (int): Maximum number of articles returned
+
+    Returns:
+        List[Dict]: The selected articles, best first
+    """
+    # "POL (ex-MATIC)" is written as "POL" in headlines
+    name = re.sub(r"\s*\(.*\)", "", coin_name)
+    name_regex = re.compile(rf"\b{re.escape(name)}\b", re.IGNORECASE)
+    window_start = time.time() - Config.NEWS_TIME_WINDOW * 3600
+
+    candidates = []
+    for article in articles:
+        if article["published"] < window_start:
+            continue
+        if any(regex.search(article["title"]) for regex in PRICE_ONLY_REGEXES):
+            continue
+        score = 2 * _mentions(article["title"], ticker, name_regex) + _mentions(
+            article["content"], ticker, name_regex
+        )
+        if score:
+            candidates.append((score, article))
+
+    candidates.sort(key=lambda item: (item[0], item[1]["published"]), reverse=True)
+    return [article for _, article in candidates[:limit]]
+
+
+def parse_batch_relevance(text, count) -> Dict[int, str]:
+    """
+    Parse a batched relevance answer into per-article results.
+
+    Args:
+        text (str): LLM answer with one "<number>: <summary or NOT RELEVANT>" line per article
+        count (int): Number of articles in the batch
+
+    Returns:
+        Dict[int, str]: Result per zero-based article index, for the articles answered
+    """
+    results = {}
+    for line in text.splitlines():
+        match = re.match(r"^\s*(?:article\s*)?(\d+)\s*[:.)\-]\s*(.+)$", line, re.IGNORECASE)
+        if match and 1 <= int(match.group(1)) <= count:
+            results.setdefault(int(match.group(1)) - 1, match.group(2).strip())
+    return results
 
 
 def get_tools():
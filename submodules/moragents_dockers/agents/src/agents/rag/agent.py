@@ -1,112 +1,264 @@
+import asyncio
+import functools
 import logging
 import os
+import uuid
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
+import aiofiles
 from fastapi import Request
 from langchain_community.document_loaders import PyMuPDFLoader
-from langchain_community.vectorstores import FAISS
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.documents import Document
 from langchain_text_splitters.character import RecursiveCharacterTextSplitter
-from werkzeug.utils import secure_filename
-
+from src.agents.rag.answer_cache import answer_cache
+from src.agents.rag.config import Config
+from src.agents.rag.embedding_pipeline import EmbeddingPipeline
+from src.agents.rag.ingestion import IngestionJob, ingestion_manager
+from src.agents.rag.retrieval import HybridRetriever, load_reranker
+from src.agents.rag.vector_store import PersistentVectorStore, hash_file
 from src.models.messages import ChatRequest
-from src.stores import agent_manager_instance, chat_manager_instance
+from src.stores import session_manager_instance
+from src.stores.session_manager import Session
+from src.utils.concurrency import run_in_thread
+from werkzeug.utils import secure_filename
 
 logger = logging.getLogger(__name__)
 
 UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
 
 
+def remove_upload(file_path: str) -> None:
+    """Delete an uploaded file, if it is still there"""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
 class RagAgent:
     def __init__(self, config, llm, embeddings):
         self.config = config
         self.llm = llm
         self.embedding = embeddings
-        self.messages = [{"role": "assistant", "content": "Please upload a file to begin"}]
-
-        self.prompt = ChatPromptTemplate.from_template(
-            """
-                Answer the following question only based on the given context
-
-                <context>
-                {context}
-                </context>
-
-                Question: {input}
-            """
+        self.max_size = Config.MAX_FILE_SIZE
+        self.vector_store = PersistentVectorStore(
+            Config.STORE_DIR, embeddings, memory_limit=Config.INDEX_MEMORY_LIMIT
         )
-        self.max_size = 5 * 1024 * 1024
-        self.retriever = None
-
-    async def handle_file_upload(self, file):
-        if not os.path.exists(UPLOAD_FOLDER):
-            os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-
-        # Save the file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        self.retriever = HybridRetriever(
+            self.vector_store, reranker=load_reranker(Config.RERANKER_MODEL)
+        )
+        self.embedding_pipeline = EmbeddingPipeline(
+            embeddings,
+            batch_size=Config.EMBED_BATCH_SIZE,
+            max_concurrency=Config.EMBED_MAX_CONCURRENCY,
+            timeout=Config.EMBED_TIMEOUT,
+        )
+        # Documents being embedded, keyed by content hash
+        self._embedding: Dict[str, asyncio.Future] = {}
 
-        # DocumentToolsGenerator class instantiation
-        loader = PyMuPDFLoader(file_path)
-        docs = loader.load()
+    def _iter_chunks(self, job: IngestionJob) -> Iterator[Document]:
+        """Split a PDF page by page so the whole document is never held in memory"""
         text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1024,
-            chunk_overlap=20,
+            chunk_size=Config.CHUNK_SIZE,
+            chunk_overlap=Config.CHUNK_OVERLAP,
             length_function=len,
             is_separator_regex=False,
         )
-        split_documents = text_splitter.split_documents(docs)
-        vector_store = FAISS.from_documents(split_documents, self.embedding)
-        self.retriever = vector_store.as_retriever(search_kwargs={"k": 7})
+        for page in PyMuPDFLoader(job.file_path).lazy_load():
+            job.total_pages = page.metadata.get("total_pages", job.total_pages)
+            job.pages_read += 1
+            yield from text_splitter.split_documents([page])
+
+    async def _embed_document(self, job: IngestionJob) -> None:
+        """Embed an uploaded file's chunks into the vector store"""
+        if not self.vector_store.begin_document(job.doc_hash, job.filename):
+            return
+
+        def track_progress(embedded: int, read: int) -> None:
+            job.chunks_embedded, job.chunks_read = embedded, read
+
+        try:
+            await self.embedding_pipeline.embed_into(
+                self._iter_chunks(job),
+                functools.partial(self.vector_store.add_batch, job.doc_hash),
+                progress=track_progress,
+            )
+            await run_in_thread(self.vector_store.commit_document, job.doc_hash)
+        except BaseException:
+            self.vector_store.abort_document(job.doc_hash)
+            raise
+        # Answers cached before the document was (re-)indexed may miss its content
+        answer_cache.invalidate_document(job.doc_hash)
+
+    async def _ingest(self, job: IngestionJob) -> None:
+        """Add an uploaded file to the vector store and to its session's documents"""
+        job.doc_hash = await run_in_thread(hash_file, job.file_path)
+
+        # Re-uploads reuse the stored embeddings. An upload of a file that is still
+        # being embedded waits for that ingestion and fails along with it.
+        embedding = self._embedding.get(job.doc_hash)
+        if embedding is not None:
+            await asyncio.shield(embedding)
+        elif not self.vector_store.has_document(job.doc_hash):
+            embedding = asyncio.ensure_future(self._embed_document(job))
+            self._embedding[job.doc_hash] = embedding
+            try:
+                await embedding
+            finally:
+                del self._embedding[job.doc_hash]
+
+        session = session_manager_instance.get_session(job.session_id)
+        if job.doc_hash not in session.uploaded_documents:
+            session.uploaded_documents.append(job.doc_hash)
+        session.chat_manager.set_uploaded_file(True)
+
+    async def _run_ingestion(self, job: IngestionJob) -> None:
+        session = session_manager_instance.get_session(job.session_id)
+        try:
+            await self._ingest(job)
+            session.chat_manager.add_message(
+                {"role": "assistant", "content": f"{job.filename} is ready, ask me about it"}
+            )
+        except Exception:
+            session.chat_manager.add_message(
+                {"role": "assistant", "content": f"Sorry, I couldn't process {job.filename}"}
+            )
+            raise
+        finally:
+            # The vector store keeps everything needed, the upload itself isn't reused
+            remove_upload(job.file_path)
+
+    async def save_upload(self, file, file_path: str) -> bool:
+        """
+        Stream an upload to disk without holding it in memory.
+
+        Returns:
+            bool: False if the file exceeded the maximum size, in which case nothing is kept
+        """
+        size = 0
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(Config.UPLOAD_READ_SIZE):
+                size += len(chunk)
+                if size > self.max_size:
+                    break
+                await buffer.write(chunk)
+        if size > self.max_size:
+            remove_upload(file_path)
+            return False
+        return True
 
     async def upload_file(self, request: Request):
         logger.info(f"Received upload request: {request}")
         file = request["file"]
+        session_id = request.get("session_id")
         if file.filename == "":
             return {"error": "No selected file"}, 400
 
-        # Check file size to ensure it's less than 5 MB
-        content = await file.read()
-        await file.seek(0)
-        if len(content) > self.max_size:
-            return {"role": "assistant", "content": "Please use a file less than 5 MB"}
+        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+        filename = secure_filename(file.filename)
+        # Prefix the name so concurrent uploads of the same file don't overwrite each other
+        file_path = os.path.join(UPLOAD_FOLDER, f"{uuid.uuid4().hex}_{filename}")
 
         try:
-            await self.handle_file_upload(file)
-            chat_manager_instance.set_uploaded_file(True)
+            if not await self.save_upload(file, file_path):
+                max_size_mb = self.max_size // (1024 * 1024)
+                return {
+                    "role": "assistant",
+                    "content": f"Please use a file less than {max_size_mb} MB",
+                }
+
+            job = ingestion_manager.submit(session_id, filename, file_path, self._run_ingestion)
             return {
                 "role": "assistant",
-                "content": "You have successfully uploaded the text",
+                "content": "Your file is being processed, I'll let you know when it's ready",
+                "job_id": job.id,
             }
         except Exception as e:
             logging.error(f"Error during file upload: {str(e)}")
+            remove_upload(file_path)
             return {"error": str(e)}, 500
 
-    def _get_rag_response(self, prompt):
-        retrieved_docs = self.retriever.invoke(prompt)
+    async def _find_cached_answer(
+        self, prompt: str, doc_hashes: List[str]
+    ) -> Tuple[Optional[str], Optional[List[float]]]:
+        """
+        Look for an answer to the same or a near-identical question about the same documents.
+
+        Returns:
+            Tuple[Optional[str], Optional[List[float]]]: The cached answer, or None with the
+                question's embedding for the retrieval that follows
+        """
+        cached = answer_cache.get_exact(doc_hashes, prompt)
+        if cached is not None:
+            return cached, None
+        query_vector = await run_in_thread(self.embedding.embed_query, prompt)
+        return answer_cache.get_similar(doc_hashes, query_vector), query_vector
+
+    async def _build_rag_messages(
+        self, prompt: str, doc_hashes: List[str], query_vector: Optional[List[float]] = None
+    ) -> List[Dict[str, str]]:
+        retrieved_docs = await run_in_thread(
+            self.retriever.retrieve, prompt, doc_hashes, query_vector
+        )
         formatted_context = "\n\n".join(doc.page_content for doc in retrieved_docs)
         formatted_prompt = f"Question: {prompt}\n\nContext: {formatted_context}"
         system_prompt = "You are a helpful assistant. Use the provided context to respond to the following question."
 
-        messages = [
+        return [
             {
                 "role": "system",
                 "content": system_prompt,
             },
             {"role": "user", "content": formatted_prompt},
         ]
-        result = self.llm.invoke(messages)
-        return result.content.strip()
 
-    def chat(self, request: ChatRequest):
+    async def _get_rag_response(self, prompt, session: Session):
+        # Search every document uploaded in this session
+        doc_hashes = list(session.uploaded_documents)
+        cached, query_vector = await self._find_cached_answer(prompt, doc_hashes)
+        if cached is not None:
+            return cached
+
+        messages = await self._build_rag_messages(prompt, doc_hashes, query_vector)
+        result = await self.llm.ainvoke(messages)
+        answer = result.content.strip()
+        if answer:
+            answer_cache.put(doc_hashes, prompt, query_vector, answer)
+        return answer
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[str]:
+        """Stream the response token by token"""
+        session = session_manager_instance.get_session(request.session_id)
+        if not session.chat_manager.get_uploaded_file_status():
+            yield "Please upload a file first"
+            return
+
+        prompt = request.prompt.content
+        doc_hashes = list(session.uploaded_documents)
+        cached, query_vector = await self._find_cached_answer(prompt, doc_hashes)
+        if cached is not None:
+            yield cached
+            return
+
+        messages = await self._build_rag_messages(prompt, doc_hashes, query_vector)
+        tokens = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                tokens.append(chunk.content)
+                yield chunk.content
+
+        answer = "".join(tokens).strip()
+        if answer:
+            answer_cache.put(doc_hashes, prompt, query_vector, answer)
+
+    async def chat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data:
                 prompt = data["prompt"]["content"]
-                if chat_manager_instance.get_uploaded_file_status():
-                    response = self._get_rag_response(prompt)
+                session = session_manager_instance.get_session(request.session_id)
+                if session.chat_manager.get_uploaded_file_status():
+                    response = await self._get_rag_response(prompt, session)
                 else:
                     response = "Please upload a file first"
                 return {"role": "assistant", "content": response}
@@ -0,0 +1,164 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+from src.agents.rag.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase and collapse punctuation and whitespace so trivial rewrites share a key"""
+    return " ".join(re.findall(r"\w+", question.lower()))
+
+
+@dataclass
+class _CachedAnswer:
+    scope: FrozenSet[str]
+    question: str
+    vector: np.ndarray
+    answer: str
+
+
+class SemanticAnswerCache:
+    """
+    Caches RAG answers and serves them for repeated or near-identical questions.
+
+    Answers are scoped to the set of documents they were generated from, keyed
+    by content hash, so a changed document never serves a stale answer. A
+    question first matches on its normalized text; otherwise its embedding is
+    compared with the cached questions of the same scope and the answer of the
+    most similar one is returned when it clears the similarity threshold. The
+    least recently used answers are dropped beyond `max_entries`, and all answers
+    involving a document can be invalidated when it is re-ingested.
+
+    Attributes:
+        max_entries (int): Maximum number of cached answers
+        threshold (float): Minimum cosine similarity for a semantic hit
+    """
+
+    def __init__(self, max_entries: int, threshold: float) -> None:
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._entries: "OrderedDict[int, _CachedAnswer]" = OrderedDict()
+        self._by_scope: Dict[FrozenSet[str], List[int]] = {}
+        self._exact: Dict[Tuple[FrozenSet[str], str], int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0}
+
+    def get_exact(self, doc_hashes: Iterable[str], question: str) -> Optional[str]:
+        """
+        Get the answer to the same question asked about the same documents.
+
+        Args:
+            doc_hashes (Iterable[str]): Content hashes of the documents searched
+            question (str): The user's question
+
+        Returns:
+            Optional[str]: The cached answer, None on a miss
+        """
+        key = (frozenset(doc_hashes), normalize_question(question))
+        with self._lock:
+            entry_id = self._exact.get(key)
+            if entry_id is None:
+                return None
+            self._entries.move_to_end(entry_id)
+            self._stats["exact_hits"] += 1
+            return self._entries[entry_id].answer
+
+    def get_similar(self, doc_hashes: Iterable[str], vector: List[float]) -> Optional[str]:
+        """
+        Get the answer to the most similar question asked about the same documents.
+
+        Args:
+            doc_hashes (Iterable[str]): Content hashes of the documents searched
+            vector (List[float]): Embedding of the user's question
+
+        Returns:
+            Optional[str]: The cached answer if a question clears the threshold, None otherwise
+        """
+        query = self._normalize(vector)
+        with self._lock:
+            entry_ids = self._by_scope.get(frozenset(doc_hashes))
+            if not entry_ids:
+                self._stats["misses"] += 1
+                return None
+            similarities = np.vstack([self._entries[i].vector for i in entry_ids]) @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self._stats["misses"] += 1
+                return None
+            entry_id = entry_ids[best]
+            self._entries.move_to_end(entry_id)
+            self._stats["semantic_hits"] += 1
+            return self._entries[entry_id].answer
+
+    def put(
+        self, doc_hashes: Iterable[str], question: str, vector: List[float], answer: str
+    ) -> None:
+        """
+        Cache an answer.
+
+        Args:
+            doc_hashes (Iterable[str]): Content hashes of the documents searched
+            question (str): The user's question
+            vector (List[float]): Embedding of the question
+            answer (str): The generated answer
+        """
+        scope = frozenset(doc_hashes)
+        key = (scope, normalize_question(question))
+        with self._lock:
+            if key in self._exact:
+                self._remove(self._exact[key])
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _CachedAnswer(scope, key[1], self._normalize(vector), answer)
+            self._by_scope.setdefault(scope, []).append(entry_id)
+            self._exact[key] = entry_id
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate_document(self, doc_hash: str) -> int:
+        """Drop every answer generated from a document, returns how many were dropped"""
+        with self._lock:
+            stale = [i for i, entry in self._entries.items() if doc_hash in entry.scope]
+            for entry_id in stale:
+                self._remove(entry_id)
+        if stale:
+            logger.info(f"Invalidated {len(stale)} cached answers for {doc_hash[:12]}")
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_scope.clear()
+            self._exact.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache size and hit, miss and eviction counts"""
+        with self._lock:
+            return {"entries": len(self._entries), **self._stats}
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        scope_ids = self._by_scope[entry.scope]
+        scope_ids.remove(entry_id)
+        if not scope_ids:
+            del self._by_scope[entry.scope]
+        del self._exact[(entry.scope, entry.question)]
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+
+# Create an instance to act as a singleton store
+answer_cache = SemanticAnswerCache(Config.ANSWER_CACHE_SIZE, Config.ANSWER_CACHE_THRESHOLD)
@@ -1,4 +1,7 @@
 import logging
+import os
+
+from src.config import Config as AppConfig
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -6,5 +9,41 @@ logging.basicConfig(level=logging.INFO)
 
 # Configuration object
 class Config:
-    MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
-    MAX_LENGTH = 16 * 1024 * 1024
+    MAX_FILE_SIZE = int(os.getenv("RAG_MAX_FILE_SIZE_MB", "512")) * 1024 * 1024
+
+    # Persistent vector store
+    STORE_DIR = os.path.join(AppConfig.AGENTS_DATA_DIR, "rag")
+
+    # Chunking and retrieval
+    CHUNK_SIZE = 1024
+    CHUNK_OVERLAP = 20
+
+    # Index memory ceiling, a flat index above it is compressed to IVF-PQ
+    INDEX_MEMORY_LIMIT = int(os.getenv("RAG_INDEX_MEMORY_LIMIT_MB", "512")) * 1024 * 1024
+    INDEX_ADD_BLOCK = 8192  # Vectors moved into the index at a time
+    IVF_PQ_SUBQUANTIZERS = 64  # Upper bound, the largest divisor of the dimension is used
+    IVF_TRAINING_SAMPLE = 65536  # Vectors sampled to train the compressed index
+    IVF_NPROBE = 16  # Inverted lists searched per query
+
+    # Embedding pipeline
+    EMBED_BATCH_SIZE = 64  # Chunks sent in one /api/embed request
+    EMBED_MAX_CONCURRENCY = 4  # Batches embedded at the same time
+    EMBED_TIMEOUT = 120  # Seconds allowed for one batch
+
+    # Background ingestion
+    UPLOAD_READ_SIZE = 1024 * 1024  # Bytes read from the request per write to disk
+    INGESTION_WORKERS = 2  # Documents ingested at the same time
+    INGESTION_MAX_JOBS = 500  # Finished jobs kept for status polling
+
+    # Hybrid retrieval
+    DENSE_K = 20  # Chunks taken from the vector search
+    KEYWORD_K = 20  # Chunks taken from the BM25 search
+    RRF_K = 60  # Reciprocal rank fusion constant, higher flattens the rank weights
+    RERANK_CANDIDATES = 20  # Fused chunks passed to the reranker
+    RERANKER_MODEL = os.getenv("RAG_RERANKER_MODEL")  # Optional flashrank cross-encoder
+    CONTEXT_TOKEN_BUDGET = 1200  # Approximate prompt tokens spent on retrieved context
+    CHARS_PER_TOKEN = 4  # Rough token estimate for packing context
+
+    # Semantic answer cache
+    ANSWER_CACHE_SIZE = 1000  # Answers kept across all documents, least recently used dropped
+    ANSWER_CACHE_THRESHOLD = 0.95  # Cosine similarity at which a question counts as a repeat
@@ -0,0 +1,132 @@
+import json
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+
+class SQLiteDocstore(Docstore, AddableMixin):
+    """
+    Chunk store kept on disk in SQLite.
+
+    Used as the FAISS docstore so chunk text and metadata are read from disk by
+    id when a search returns them, rather than keeping every chunk of every
+    document resident next to the index. An FTS5 index over the chunk text is
+    kept in sync by triggers and provides BM25 keyword search.
+
+    Attributes:
+        path (str): SQLite database file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id TEXT PRIMARY KEY, doc_hash TEXT, content TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS chunks_doc_hash ON chunks (doc_hash)")
+        has_fts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chunks_fts'"
+        ).fetchone()
+        self._conn.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts
+                USING fts5(content, content='chunks', content_rowid='rowid');
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_insert AFTER INSERT ON chunks BEGIN
+                INSERT INTO chunks_fts (rowid, content) VALUES (new.rowid, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_delete AFTER DELETE ON chunks BEGIN
+                INSERT INTO chunks_fts (chunks_fts, rowid, content)
+                    VALUES ('delete', old.rowid, old.content);
+            END;
+            """
+        )
+        if not has_fts:
+            # Index chunks stored before keyword search existed
+            self._conn.execute("INSERT INTO chunks_fts (chunks_fts) VALUES ('rebuild')")
+        self._conn.commit()
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        """Store chunks by id, replacing any left over from an interrupted ingestion"""
+        rows = [
+            (chunk_id, doc.metadata.get("doc_hash"), doc.page_content, json.dumps(doc.metadata))
+            for chunk_id, doc in texts.items()
+        ]
+        with self._lock:
+            # Delete explicitly rather than INSERT OR REPLACE, which skips delete triggers
+            self._conn.executemany("DELETE FROM chunks WHERE id = ?", [(i,) for i in texts])
+            self._conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def search(self, search: str) -> Union[str, Document]:
+        """Get a chunk by id, or a message saying it was not found"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, metadata FROM chunks WHERE id = ?", (search,)
+            ).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return Document(id=search, page_content=row[0], metadata=json.loads(row[1]))
+
+    def keyword_search(
+        self, query: str, doc_hashes: Iterable[str], k: int
+    ) -> List[Tuple[Document, float]]:
+        """
+        Rank chunks of the given documents by BM25 against the query terms.
+
+        Args:
+            query (str): Free text, any term may match
+            doc_hashes (Iterable[str]): Content hashes of the documents to search
+            k (int): Maximum number of chunks to return
+
+        Returns:
+            List[Tuple[Document, float]]: Chunks with their BM25 score, best first
+        """
+        terms = dict.fromkeys(re.findall(r"\w+", query.lower()))
+        doc_hashes = list(doc_hashes)
+        if not terms or not doc_hashes:
+            return []
+
+        match = " OR ".join(f'"{term}"' for term in terms)
+        placeholders = ", ".join("?" for _ in doc_hashes)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunks.id, chunks.content, chunks.metadata, bm25(chunks_fts) AS score "
+                "FROM chunks_fts JOIN chunks ON chunks.rowid = chunks_fts.rowid "
+                f"WHERE chunks_fts MATCH ? AND chunks.doc_hash IN ({placeholders}) "
+                "ORDER BY score LIMIT ?",
+                (match, *doc_hashes, k),
+            ).fetchall()
+        # SQLite reports BM25 as a negative number, lower is better
+        return [
+            (Document(id=row[0], page_content=row[1], metadata=json.loads(row[2])), -row[3])
+            for row in rows
+        ]
+
+    def delete(self, ids: List) -> None:
+        """Delete chunks by id"""
+        with self._lock:
+            self._conn.executemany("DELETE FROM chunks WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+
+    def delete_document(self, doc_hash: str) -> None:
+        """Delete every chunk of a document"""
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks WHERE doc_hash = ?", (doc_hash,))
+            self._conn.commit()
+
+    def document_hashes(self) -> Set[str]:
+        """Get the hashes of all documents with stored chunks"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT doc_hash FROM chunks").fetchall()
+        return {row[0] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from src.utils.concurrency import run_in_thread
+from src.utils.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int], None]
+BatchSink = Callable[[int, List[Document], List[List[float]]], None]
+
+
+class EmbeddingPipeline:
+    """
+    Embeds document chunks in batches with bounded concurrency.
+
+    `OllamaEmbeddings` sends one `/api/embeddings` request per chunk. With an Ollama
+    model the pipeline instead sends each batch as a single multi-input
+    `/api/embed` request through the shared HTTP client; any other embeddings
+    model gets whole batches through `embed_documents` on the agent thread pool.
+    Chunks are pulled from the source lazily, one batch at a time, and reading
+    pauses while the maximum number of batches is in flight, so a large document
+    is never fully parsed ahead of the embedding calls.
+
+    Attributes:
+        embeddings: Embeddings model whose vectors are produced
+        batch_size (int): Chunks per embedding request
+        max_concurrency (int): Batches embedded at the same time
+        timeout (float): Seconds allowed for one batch request
+    """
+
+    def __init__(self, embeddings, batch_size: int, max_concurrency: int, timeout: float) -> None:
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+    def _uses_ollama(self) -> bool:
+        return bool(
+            getattr(self.embeddings, "base_url", None) and getattr(self.embeddings, "model", None)
+        )
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        if not self._uses_ollama():
+            return await run_in_thread(self.embeddings.embed_documents, texts)
+
+        response = await http_client.apost(
+            f"{self.embeddings.base_url}/api/embed",
+            json={"model": self.embeddings.model, "input": texts},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        vectors = response.json()["embeddings"]
+        if len(vectors) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+        return vectors
+
+    async def embed_into(
+        self,
+        chunks: Iterable[Document],
+        sink: BatchSink,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """
+        Embed chunks as they are produced and hand each batch to a sink.
+
+        Batches are not kept once the sink has them, so memory use depends on the
+        batch size and concurrency rather than on the size of the source.
+
+        Args:
+            chunks (Iterable[Document]): Chunks to embed, may be a lazy generator
+            sink (BatchSink): Blocking callable given (start, chunks, vectors) for every
+                batch, where start is the position of the batch's first chunk. Batches
+                may arrive out of order.
+            progress (Optional[ProgressCallback]): Called with (embedded, read) chunk counts
+                after every batch
+
+        Returns:
+            int: Number of chunks embedded
+        """
+        iterator = iter(chunks)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: List[asyncio.Task] = []
+        read = 0
+        embedded = 0
+
+        async def run_batch(start: int, batch: List[Document]) -> None:
+            nonlocal embedded
+            try:
+                vectors = await self._embed_batch([doc.page_content for doc in batch])
+                await run_in_thread(sink, start, batch, vectors)
+            finally:
+                semaphore.release()
+            embedded += len(batch)
+            if progress:
+                progress(embedded, read)
+
+        try:
+            while True:
+                # Wait for a free slot before reading more of the document
+                await semaphore.acquire()
+                batch = await run_in_thread(lambda: list(islice(iterator, self.batch_size)))
+                if not batch:
+                    semaphore.release()
+                    break
+                tasks.append(asyncio.create_task(run_batch(read, batch)))
+                read += len(batch)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        logger.info(f"Embedded {read} chunks in {len(tasks)} batches")
+        return read
+
+    async def embed_documents(
+        self, chunks: Iterable[Document], progress: Optional[ProgressCallback] = None
+    ) -> Tuple[List[Document], List[List[float]]]:
+        """
+        Embed chunks and collect them with their vectors.
+
+        Args:
+            chunks (Iterable[Document]): Chunks to embed, may be a lazy generator
+            progress (Optional[ProgressCallback]): Called with (embedded, read) chunk counts
+                after every batch
+
+        Returns:
+            Tuple[List[Document], List[List[float]]]: The chunks and their vectors, in order
+        """
+        batches = {}
+
+        def collect(start: int, batch: List[Document], vectors: List[List[float]]) -> None:
+            batches[start] = (batch, vectors)
+
+        await self.embed_into(chunks, collect, progress)
+        ordered = [batches[start] for start in sorted(batches)]
+        documents = [doc for batch, _ in ordered for doc in batch]
+        vectors = [vector for _, batch_vectors in ordered for vector in batch_vectors]
+        return documents, vectors
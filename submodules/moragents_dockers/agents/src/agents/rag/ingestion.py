@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.agents.rag.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionStatus(str, Enum):
+    """Status states for ingestion jobs"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class IngestionJob:
+    """An uploaded document waiting for or going through ingestion"""
+
+    id: str
+    session_id: Optional[str]
+    filename: str
+    file_path: str
+    status: IngestionStatus = IngestionStatus.QUEUED
+    total_pages: int = 0
+    pages_read: int = 0
+    chunks_read: int = 0
+    chunks_embedded: int = 0
+    doc_hash: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (IngestionStatus.COMPLETED, IngestionStatus.FAILED)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of pages read, a job reusing stored embeddings reads none"""
+        if self.status == IngestionStatus.COMPLETED:
+            return 1.0
+        return round(self.pages_read / self.total_pages, 3) if self.total_pages else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert job to dictionary format"""
+        return {
+            "id": self.id,
+            "session_id": self.session_id,
+            "filename": self.filename,
+            "status": self.status.value,
+            "progress": self.progress,
+            "total_pages": self.total_pages,
+            "pages_read": self.pages_read,
+            "chunks_read": self.chunks_read,
+            "chunks_embedded": self.chunks_embedded,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+JobProcessor = Callable[[IngestionJob], Awaitable[None]]
+
+
+class IngestionJobManager:
+    """
+    Queues uploaded documents and ingests them on a pool of background workers.
+
+    Workers are started on the running event loop with the first submitted job.
+    Each job is handed to the processor it was submitted with, which updates the
+    job's progress as it goes. Finished jobs are kept for status polling until
+    more than `max_jobs` have accumulated, oldest first.
+    """
+
+    def __init__(self, max_workers: int, max_jobs: int) -> None:
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._processors: Dict[str, JobProcessor] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def submit(
+        self, session_id: Optional[str], filename: str, file_path: str, processor: JobProcessor
+    ) -> IngestionJob:
+        """
+        Queue a document for ingestion.
+
+        Args:
+            session_id (Optional[str]): Session the document was uploaded in
+            filename (str): Original file name
+            file_path (str): Where the upload was saved
+            processor (JobProcessor): Coroutine function ingesting the job
+
+        Returns:
+            IngestionJob: The queued job
+        """
+        self._start_workers()
+        job = IngestionJob(
+            id=uuid.uuid4().hex, session_id=session_id, filename=filename, file_path=file_path
+        )
+        self._jobs[job.id] = job
+        self._processors[job.id] = processor
+        self._queue.put_nowait(job.id)
+        self._prune()
+        logger.info(f"Queued ingestion job {job.id} for {filename}")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[IngestionJob]:
+        """Get a job by id"""
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, session_id: Optional[str] = None) -> List[IngestionJob]:
+        """List jobs, optionally only those of one session"""
+        return [
+            job for job in self._jobs.values() if session_id is None or job.session_id == session_id
+        ]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of jobs in each status"""
+        stats = {status.value: 0 for status in IngestionStatus}
+        for job in self._jobs.values():
+            stats[job.status.value] += 1
+        stats["workers"] = len(self._workers)
+        return stats
+
+    async def shutdown(self) -> None:
+        """Stop the workers, jobs still queued are abandoned"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def _start_workers(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"rag-ingestion-{i}")
+            for i in range(self.max_workers)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            processor = self._processors.pop(job_id, None)
+            try:
+                if job is not None and processor is not None:
+                    await self._run(job, processor)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: IngestionJob, processor: JobProcessor) -> None:
+        job.status = IngestionStatus.RUNNING
+        job.started_at = time.time()
+        try:
+            await processor(job)
+            job.status = IngestionStatus.COMPLETED
+            logger.info(f"Ingestion job {job.id} completed in {time.time() - job.started_at:.1f}s")
+        except Exception as e:
+            job.status = IngestionStatus.FAILED
+            job.error = str(e)
+            logger.error(f"Ingestion job {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[: max(0, len(self._jobs) - self.max_jobs)]:
+            del self._jobs[job_id]
+
+
+# Create an instance to act as a singleton store
+ingestion_manager = IngestionJobManager(Config.INGESTION_WORKERS, Config.INGESTION_MAX_JOBS)
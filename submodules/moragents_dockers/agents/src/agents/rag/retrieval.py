@@ -0,0 +1,152 @@
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from langchain_core.documents import Document
+from src.agents.rag.config import Config
+from src.agents.rag.vector_store import PersistentVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[Document]], k: int) -> List[Document]:
+    """
+    Merge ranked lists of chunks, scoring each chunk by the sum of 1 / (k + rank).
+
+    Args:
+        rankings (Iterable[List[Document]]): Chunk lists ordered best first
+        k (int): Fusion constant damping the weight of the top ranks
+
+    Returns:
+        List[Document]: Unique chunks ordered by fused score
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            scores[document.id] = scores.get(document.id, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(document.id, document)
+    return [documents[chunk_id] for chunk_id in sorted(scores, key=scores.get, reverse=True)]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of tokens the LLM will see for a text"""
+    return len(text) // Config.CHARS_PER_TOKEN + 1
+
+
+def pack_context(documents: List[Document], token_budget: int) -> List[Document]:
+    """
+    Pick chunks in rank order until the token budget is spent.
+
+    A chunk too large for the remaining budget is skipped so smaller, lower ranked
+    chunks can still use it.
+
+    Args:
+        documents (List[Document]): Chunks ordered best first
+        token_budget (int): Approximate tokens available for context
+
+    Returns:
+        List[Document]: The chunks that fit, in rank order
+    """
+    packed = []
+    remaining = token_budget
+    for document in documents:
+        tokens = estimate_tokens(document.page_content)
+        if tokens <= remaining:
+            packed.append(document)
+            remaining -= tokens
+    return packed
+
+
+class FlashRankReranker:
+    """Cross-encoder reranker backed by the optional flashrank package"""
+
+    def __init__(self, model_name: str) -> None:
+        from flashrank import Ranker, RerankRequest
+
+        self._ranker = Ranker(model_name=model_name)
+        self._request = RerankRequest
+
+    def rerank(self, query: str, documents: List[Document]) -> List[Document]:
+        """Order chunks by cross-encoder relevance to the query"""
+        passages = [{"id": i, "text": doc.page_content} for i, doc in enumerate(documents)]
+        results = self._ranker.rerank(self._request(query=query, passages=passages))
+        return [documents[result["id"]] for result in results]
+
+
+def load_reranker(model_name: Optional[str]) -> Optional[FlashRankReranker]:
+    """Load the configured reranker, None when disabled or flashrank is not installed"""
+    if not model_name:
+        return None
+    try:
+        return FlashRankReranker(model_name)
+    except ImportError:
+        logger.warning("RAG_RERANKER_MODEL is set but flashrank is not installed, not reranking")
+    except Exception as e:
+        logger.error(f"Failed to load reranker {model_name}: {str(e)}")
+    return None
+
+
+class HybridRetriever:
+    """
+    Retrieves context from a session's documents with keyword and vector search.
+
+    BM25 over the chunk store catches exact terms (names, numbers, tickers) that
+    embeddings blur, while the FAISS search catches paraphrases. Both rankings
+    are merged with reciprocal rank fusion, optionally reordered by a
+    cross-encoder, and packed into a token budget so the prompt only carries the
+    chunks that matter most.
+
+    Attributes:
+        vector_store (PersistentVectorStore): Store holding the chunks and index
+        reranker (Optional[FlashRankReranker]): Reranker applied after fusion
+        token_budget (int): Approximate tokens of context returned
+    """
+
+    def __init__(
+        self,
+        vector_store: PersistentVectorStore,
+        reranker: Optional[FlashRankReranker] = None,
+        token_budget: int = Config.CONTEXT_TOKEN_BUDGET,
+    ) -> None:
+        self.vector_store = vector_store
+        self.reranker = reranker
+        self.token_budget = token_budget
+
+    def retrieve(
+        self, query: str, doc_hashes: List[str], query_vector: Optional[List[float]] = None
+    ) -> List[Document]:
+        """
+        Get the context chunks for a query.
+
+        Args:
+            query (str): The user's question
+            doc_hashes (List[str]): Content hashes of the documents to search
+            query_vector (Optional[List[float]]): Embedding of the question, if already known
+
+        Returns:
+            List[Document]: Chunks fitting the token budget, most relevant first
+        """
+        if not doc_hashes:
+            return []
+
+        started_at = time.perf_counter()
+        keyword = self.vector_store.keyword_search(query, doc_hashes, Config.KEYWORD_K)
+        dense = self.vector_store.similarity_search(
+            query,
+            doc_hashes,
+            k=Config.DENSE_K,
+            query_vector=query_vector,
+        )
+        candidates = reciprocal_rank_fusion([dense, keyword], Config.RRF_K)
+
+        if self.reranker is not None and candidates:
+            candidates = self.reranker.rerank(query, candidates[: Config.RERANK_CANDIDATES])
+
+        context = pack_context(candidates, self.token_budget)
+        logger.info(
+            f"Retrieved {len(context)} of {len(candidates)} chunks "
+            f"({len(keyword)} keyword, {len(dense)} dense) "
+            f"in {1000 * (time.perf_counter() - started_at):.0f}ms"
+        )
+        return context
@@ -1,7 +1,11 @@
 import logging
-from fastapi import APIRouter, File, UploadFile
+from typing import Optional
+
+from fastapi import APIRouter, File, Form, UploadFile
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.agents.rag.answer_cache import answer_cache
+from src.agents.rag.ingestion import ingestion_manager
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -9,19 +13,19 @@ router = APIRouter(prefix="/rag", tags=["rag"])
 
 
 @router.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(file: UploadFile = File(...), session_id: Optional[str] = Form(None)):
     """Upload a file for RAG processing"""
     logger.info("Received upload request")
     try:
-        rag_agent = agent_manager_instance.get_agent("rag")
+        rag_agent = await agent_manager_instance.get_agent_async("rag")
         if not rag_agent:
             return JSONResponse(
                 status_code=400,
                 content={"status": "error", "message": "RAG agent not found"},
             )
 
-        response = await rag_agent.upload_file({"file": file})
-        chat_manager_instance.add_message(response)
+        response = await rag_agent.upload_file({"file": file, "session_id": session_id})
+        session_manager_instance.get_session(session_id).chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to upload file: {str(e)}")
@@ -29,3 +33,30 @@ async def upload_file(file: UploadFile = File(...)):
             status_code=500,
             content={"status": "error", "message": f"Failed to upload file: {str(e)}"},
         )
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(job_id: str) -> JSONResponse:
+    """Get the status and progress of an ingestion job"""
+    job = ingestion_manager.get_job(job_id)
+    if not job:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"Ingestion job {job_id} not found"},
+        )
+    return JSONResponse(content=job.to_dict())
+
+
+@router.get("/jobs")
+async def list_ingestion_jobs(session_id: Optional[str] = None) -> JSONResponse:
+    """List ingestion jobs, optionally only those of one session"""
+    jobs = ingestion_manager.list_jobs(session_id)
+    return JSONResponse(
+        content={"jobs": [job.to_dict() for job in jobs], "stats": ingestion_manager.get_stats()}
+    )
+
+
+@router.get("/cache_stats")
+async def get_cache_stats() -> JSONResponse:
+    """Get semantic answer cache size, hit, miss and eviction counts"""
+    return JSONResponse(content=answer_cache.get_stats())
@@ -0,0 +1,404 @@
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from src.agents.rag.config import Config
+from src.agents.rag.docstore import SQLiteDocstore
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.faiss"
+INDEX_IDS_FILE = "index_ids.json"
+CHUNKS_FILE = "chunks.sqlite3"
+SPILL_SUFFIX = ".vectors"
+
+
+def hash_file(file_path: str) -> str:
+    """Compute the sha256 of a file's content through a memory map"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+    return digest.hexdigest()
+
+
+def document_positions(ids: List[str]) -> Dict[str, range]:
+    """Find the index positions of each document's vectors from the chunk ids in index order"""
+    starts: Dict[str, int] = {}
+    counts: Dict[str, int] = {}
+    for position, chunk_id in enumerate(ids):
+        doc_hash = chunk_id.partition(":")[0]
+        starts.setdefault(doc_hash, position)
+        counts[doc_hash] = counts.get(doc_hash, 0) + 1
+    return {doc_hash: range(start, start + counts[doc_hash]) for doc_hash, start in starts.items()}
+
+
+@dataclass
+class _PendingDocument:
+    """A document whose chunks are being embedded but not yet added to the index"""
+
+    filename: str
+    spill_path: str
+    ids: List[str] = field(default_factory=list)
+    dimension: Optional[int] = None
+
+
+class PersistentVectorStore:
+    """
+    FAISS vector store persisted to disk and keyed by document content hash.
+
+    Documents are added incrementally to a single index; every chunk carries the
+    sha256 of the file it came from, so re-uploading the same file reuses the
+    stored embeddings instead of embedding it again.
+
+    Nothing proportional to a document's size stays in memory while it is
+    ingested: chunk text goes straight to a SQLite docstore and vectors are
+    spilled to a file next to the index. Only once the whole document has been
+    embedded are its vectors added to the index, so a failed ingestion never
+    leaves a partial document behind. When a flat index outgrows the memory
+    limit it is converted to an IVF-PQ index, which keeps compressed codes
+    instead of full vectors.
+
+    A document's vectors are added in one go, so they sit at consecutive index
+    positions. Searches are restricted to the positions of the requested
+    documents rather than filtering the nearest chunks of the whole index, which
+    other sessions' documents could crowd out.
+
+    Attributes:
+        store_dir (str): Directory holding the index, chunk store and manifest
+        embeddings: Embeddings model used for queries and for chunks added without vectors
+        memory_limit (int): Bytes the index may use before it is compressed
+        manifest (Dict[str, Dict]): Stored documents keyed by content hash
+    """
+
+    def __init__(self, store_dir: str, embeddings, memory_limit: int) -> None:
+        self.store_dir = store_dir
+        self.embeddings = embeddings
+        self.memory_limit = memory_limit
+        self.manifest: Dict[str, Dict] = {}
+        self._store: Optional[FAISS] = None
+        # Index positions of each stored document's vectors
+        self._positions: Dict[str, range] = {}
+        self._pending: Dict[str, _PendingDocument] = {}
+        self._lock = threading.RLock()
+
+        os.makedirs(store_dir, exist_ok=True)
+        self.docstore = SQLiteDocstore(os.path.join(store_dir, CHUNKS_FILE))
+        self.load()
+
+    def has_document(self, doc_hash: str) -> bool:
+        """Check whether a document's embeddings are already stored"""
+        with self._lock:
+            return doc_hash in self.manifest
+
+    def begin_document(self, doc_hash: str, filename: str) -> bool:
+        """
+        Start adding a document.
+
+        Args:
+            doc_hash (str): sha256 of the source file
+            filename (str): Original file name, kept for reference
+
+        Returns:
+            bool: False if the document is already stored or being added
+        """
+        with self._lock:
+            if doc_hash in self.manifest or doc_hash in self._pending:
+                logger.info(f"Reusing stored embeddings for {filename} ({doc_hash[:12]})")
+                return False
+            spill_path = os.path.join(self.store_dir, f"{doc_hash}{SPILL_SUFFIX}")
+            open(spill_path, "wb").close()
+            self._pending[doc_hash] = _PendingDocument(filename=filename, spill_path=spill_path)
+            return True
+
+    def add_batch(
+        self, doc_hash: str, start: int, documents: List[Document], vectors: List[List[float]]
+    ) -> None:
+        """
+        Write a batch of embedded chunks of a document being added.
+
+        Args:
+            doc_hash (str): sha256 of the source file
+            start (int): Position of the batch's first chunk within the document
+            documents (List[Document]): The chunks
+            vectors (List[List[float]]): Their embeddings
+        """
+        ids = [f"{doc_hash}:{start + i}" for i in range(len(documents))]
+        for document in documents:
+            document.metadata["doc_hash"] = doc_hash
+        array = np.asarray(vectors, dtype=np.float32)
+
+        with self._lock:
+            pending = self._pending[doc_hash]
+            if pending.dimension is None:
+                pending.dimension = array.shape[1]
+            self.docstore.add(dict(zip(ids, documents)))
+            with open(pending.spill_path, "ab") as f:
+                array.tofile(f)
+            pending.ids.extend(ids)
+
+    def commit_document(self, doc_hash: str) -> None:
+        """Add a fully embedded document's vectors to the index and persist it"""
+        with self._lock:
+            pending = self._pending.pop(doc_hash)
+            try:
+                if pending.ids:
+                    start = self._store.index.ntotal if self._store is not None else 0
+                    vectors = np.memmap(pending.spill_path, dtype=np.float32, mode="r")
+                    self._add_vectors(
+                        pending.ids, vectors.reshape(len(pending.ids), pending.dimension)
+                    )
+                    del vectors
+                    self._positions[doc_hash] = range(start, start + len(pending.ids))
+            finally:
+                os.remove(pending.spill_path)
+
+            self.manifest[doc_hash] = {
+                "filename": pending.filename,
+                "chunks": len(pending.ids),
+                "added_at": time.time(),
+            }
+            self._compress_if_needed()
+            self.save()
+            logger.info(f"Added {len(pending.ids)} chunks for {pending.filename} ({doc_hash[:12]})")
+
+    def abort_document(self, doc_hash: str) -> None:
+        """Discard a document whose ingestion failed"""
+        with self._lock:
+            pending = self._pending.pop(doc_hash, None)
+            if pending is None:
+                return
+            self.docstore.delete_document(doc_hash)
+            if os.path.exists(pending.spill_path):
+                os.remove(pending.spill_path)
+
+    def add_documents(
+        self,
+        doc_hash: str,
+        filename: str,
+        documents: List[Document],
+        vectors: Optional[List[List[float]]] = None,
+    ) -> bool:
+        """
+        Add all of a document's chunks at once, unless the document is already stored.
+
+        Args:
+            doc_hash (str): sha256 of the source file
+            filename (str): Original file name, kept for reference
+            documents (List[Document]): The document's chunks
+            vectors (Optional[List[List[float]]]): Precomputed chunk embeddings, the
+                chunks are embedded here when omitted
+
+        Returns:
+            bool: True if the chunks were added, False if the document was already stored
+        """
+        if not self.begin_document(doc_hash, filename):
+            return False
+        try:
+            if documents:
+                if vectors is None:
+                    vectors = self.embeddings.embed_documents(
+                        [doc.page_content for doc in documents]
+                    )
+                self.add_batch(doc_hash, 0, documents, vectors)
+            self.commit_document(doc_hash)
+            return True
+        except BaseException:
+            self.abort_document(doc_hash)
+            raise
+
+    def similarity_search(
+        self,
+        query: str,
+        doc_hashes: Iterable[str],
+        k: int,
+        query_vector: Optional[List[float]] = None,
+    ) -> List[Document]:
+        """
+        Find the chunks of the given documents nearest to the query embedding.
+
+        Only the documents' own vectors are searched, however many other documents
+        the index holds.
+
+        Args:
+            query (str): Text to search for
+            doc_hashes (Iterable[str]): Content hashes of the documents to search
+            k (int): Number of chunks to return
+            query_vector (Optional[List[float]]): Embedding of the query, computed here
+                when omitted
+
+        Returns:
+            List[Document]: Chunks ordered nearest first
+        """
+        doc_hashes = list(doc_hashes)
+        with self._lock:
+            if self._store is None or not any(h in self._positions for h in doc_hashes):
+                return []
+        if query_vector is None:
+            query_vector = self.embeddings.embed_query(query)
+
+        # FAISS can't search an index while vectors are added to it, so the search
+        # holds the lock commits and compression take
+        with self._lock:
+            index, index_to_id = self._store.index, self._store.index_to_docstore_id
+            ranges = [self._positions[h] for h in doc_hashes if h in self._positions]
+            selected = np.concatenate([np.arange(r.start, r.stop, dtype=np.int64) for r in ranges])
+            selector = faiss.IDSelectorBatch(selected)
+            if isinstance(index, faiss.IndexIVF):
+                # Probe enough lists to expect as many of the documents' vectors as a
+                # search of the whole index would see
+                nprobe = math.ceil(Config.IVF_NPROBE * index.ntotal / len(selected))
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=min(index.nlist, nprobe))
+            else:
+                params = faiss.SearchParameters(sel=selector)
+            _, positions = index.search(
+                np.asarray([query_vector], dtype=np.float32), min(k, len(selected)), params=params
+            )
+            chunk_ids = [index_to_id[int(p)] for p in positions[0] if p >= 0]
+
+        documents = [self.docstore.search(chunk_id) for chunk_id in chunk_ids]
+        return [doc for doc in documents if isinstance(doc, Document)]
+
+    def keyword_search(self, query: str, doc_hashes: Iterable[str], k: int) -> List[Document]:
+        """Find the chunks of the given documents ranked best by BM25 for the query"""
+        return [doc for doc, _ in self.docstore.keyword_search(query, doc_hashes, k)]
+
+    def _add_vectors(self, ids: List[str], vectors: np.ndarray) -> None:
+        if self._store is None:
+            self._store = FAISS(
+                embedding_function=self.embeddings,
+                index=faiss.IndexFlatL2(vectors.shape[1]),
+                docstore=self.docstore,
+                index_to_docstore_id={},
+            )
+        index, index_to_id = self._store.index, self._store.index_to_docstore_id
+        for offset in range(0, len(ids), Config.INDEX_ADD_BLOCK):
+            block = np.ascontiguousarray(vectors[offset : offset + Config.INDEX_ADD_BLOCK])
+            position = index.ntotal
+            index.add(block)
+            for i, chunk_id in enumerate(ids[offset : offset + len(block)]):
+                index_to_id[position + i] = chunk_id
+
+    def _index_memory(self) -> int:
+        index = self._store.index
+        if isinstance(index, faiss.IndexIVFPQ):
+            return index.ntotal * (index.code_size + 8) + index.nlist * index.d * 4
+        return index.ntotal * index.d * 4
+
+    def _compress_if_needed(self) -> None:
+        """Convert a flat index that outgrew the memory limit to IVF-PQ"""
+        if self._store is None or not isinstance(self._store.index, faiss.IndexFlat):
+            return
+        if self._index_memory() <= self.memory_limit:
+            return
+
+        flat = self._store.index
+        total, dimension = flat.ntotal, flat.d
+        # PQ codebooks need enough vectors per centroid to train on
+        nlist = min(int(4 * math.sqrt(total)), total // 39)
+        if nlist < 1 or total < 256 * 39:
+            logger.warning(
+                f"Index of {total} vectors exceeds the memory limit, too small to compress"
+            )
+            return
+        subquantizers = max(
+            m for m in range(1, Config.IVF_PQ_SUBQUANTIZERS + 1) if dimension % m == 0
+        )
+
+        started_at = time.perf_counter()
+        sample_size = min(total, Config.IVF_TRAINING_SAMPLE)
+        sample = np.sort(np.random.default_rng(0).choice(total, sample_size, replace=False))
+        training = np.vstack([flat.reconstruct(int(i)) for i in sample])
+
+        compressed = faiss.IndexIVFPQ(
+            faiss.IndexFlatL2(dimension), dimension, nlist, subquantizers, 8
+        )
+        compressed.train(training)
+        # Positions are kept, so the index to chunk id mapping stays valid
+        for offset in range(0, total, Config.INDEX_ADD_BLOCK):
+            compressed.add(flat.reconstruct_n(offset, min(Config.INDEX_ADD_BLOCK, total - offset)))
+        compressed.nprobe = Config.IVF_NPROBE
+        self._store.index = compressed
+
+        logger.info(
+            f"Compressed index of {total} vectors to IVF-PQ ({nlist} lists, {subquantizers} "
+            f"subquantizers) in {time.perf_counter() - started_at:.1f}s, "
+            f"now {self._index_memory() / 1024 / 1024:.1f} MB"
+        )
+
+    def save(self) -> None:
+        """Persist the FAISS index, its chunk ids and the manifest"""
+        with self._lock:
+            if self._store is not None:
+                index_path = os.path.join(self.store_dir, INDEX_FILE)
+                faiss.write_index(self._store.index, f"{index_path}.tmp")
+                os.replace(f"{index_path}.tmp", index_path)
+                index_to_id = self._store.index_to_docstore_id
+                self._write_json(INDEX_IDS_FILE, [index_to_id[i] for i in range(len(index_to_id))])
+            self._write_json(MANIFEST_FILE, self.manifest)
+
+    def _write_json(self, name: str, data) -> None:
+        path = os.path.join(self.store_dir, name)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(f"{path}.tmp", path)
+
+    def load(self) -> None:
+        """Load a previously persisted index and manifest, dropping unfinished documents"""
+        for name in os.listdir(self.store_dir):
+            if name.endswith(SPILL_SUFFIX):
+                os.remove(os.path.join(self.store_dir, name))
+
+        manifest_path = os.path.join(self.store_dir, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, "r") as f:
+                    manifest = json.load(f)
+                store, ids = None, []
+                index_path = os.path.join(self.store_dir, INDEX_FILE)
+                if os.path.exists(index_path):
+                    with open(os.path.join(self.store_dir, INDEX_IDS_FILE), "r") as f:
+                        ids = json.load(f)
+                    store = FAISS(
+                        embedding_function=self.embeddings,
+                        index=faiss.read_index(index_path),
+                        docstore=self.docstore,
+                        index_to_docstore_id=dict(enumerate(ids)),
+                    )
+                with self._lock:
+                    self.manifest, self._store = manifest, store
+                    self._positions = document_positions(ids)
+                logger.info(
+                    f"Loaded vector store with {len(manifest)} documents from {self.store_dir}"
+                )
+            except Exception as e:
+                logger.error(f"Failed to load vector store from {self.store_dir}: {str(e)}")
+                return
+
+        # Chunks of documents whose ingestion was interrupted
+        for doc_hash in self.docstore.document_hashes() - set(self.manifest):
+            self.docstore.delete_document(doc_hash)
+
+    def get_stats(self) -> Dict:
+        """Get the number of stored documents and chunks and the index size"""
+        with self._lock:
+            return {
+                "documents": len(self.manifest),
+                "chunks": sum(entry["chunks"] for entry in self.manifest.values()),
+                "pending_documents": len(self._pending),
+                "index_type": type(self._store.index).__name__ if self._store else None,
+                "index_memory_bytes": self._index_memory() if self._store else 0,
+            }
@@ -1,21 +1,22 @@
 import logging
 import time
+from typing import AsyncIterator
 
 import requests
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from src.agents.realtime_search.config import Config
+from src.agents.realtime_search.tools import cached_search, format_results, parse_search_results
 from src.models.messages import ChatRequest
+from src.utils.concurrency import run_in_thread
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-
 
 class RealtimeSearchAgent:
     def __init__(self, config, llm, embeddings):
@@ -36,22 +37,7 @@ class RealtimeSearchAgent:
         logger.info(f"Performing web search for: {search_term}")
 
         try:
-            url = f"https://www.google.com/search?q={search_term}"
-            headers = {"User-Agent": USER_AGENT}
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            search_results = soup.find_all("div", class_="g")
-
-            formatted_results = []
-            for result in search_results[:5]:
-                result_text = result.get_text(strip=True)
-                formatted_results.append(f"Result:\n{result_text}")
-
-            return "\n\n".join(formatted_results)
-
+            return cached_search(search_term)
         except requests.RequestException as e:
             logger.error(f"Error performing web search: {str(e)}")
             logger.info("Attempting fallback to headless browsing")
@@ -72,16 +58,8 @@ class RealtimeSearchAgent:
 
             time.sleep(2)
 
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-
-            search_results = soup.find_all("div", class_="g")
-
-            formatted_results = []
-            for result in search_results[:5]:
-                result_text = result.get_text(strip=True)
-                formatted_results.append(f"Result:\n{result_text}")
-
-            return "\n\n".join(formatted_results)
+            results = parse_search_results(driver.page_source, Config.SEARCH_RESULT_COUNT)
+            return format_results(results)
 
         except Exception as e:
             logger.error(f"Error performing headless web search: {str(e)}")
@@ -89,9 +67,8 @@ class RealtimeSearchAgent:
         finally:
             driver.quit()
 
-    def synthesize_answer(self, search_term, search_results):
-        logger.info("Synthesizing answer from search results")
-        messages = [
+    def _build_synthesis_messages(self, search_term, search_results):
+        return [
             {
                 "role": "system",
                 "content": """You are a helpful assistant that synthesizes information from web search results to answer user queries.
@@ -104,15 +81,28 @@ class RealtimeSearchAgent:
             },
         ]
 
+    async def synthesize_answer(self, search_term, search_results):
+        logger.info("Synthesizing answer from search results")
+        messages = self._build_synthesis_messages(search_term, search_results)
+
         try:
-            result = self.llm.invoke(messages)
+            result = await self.llm.ainvoke(messages)
             logger.info(f"Received response from LLM: {result}")
             return result.content.strip()
         except Exception as e:
             logger.error(f"Error synthesizing answer: {str(e)}")
             raise
 
-    def chat(self, request: ChatRequest):
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[str]:
+        """Search the web, then stream the synthesized answer token by token"""
+        search_term = request.prompt.content
+        search_results = await run_in_thread(self.perform_search_with_web_scraping, search_term)
+        messages = self._build_synthesis_messages(search_term, search_results)
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                yield chunk.content
+
+    async def chat(self, request: ChatRequest):
         try:
             data = request.dict()
             logger.info(f"Received chat request: {data}")
@@ -121,11 +111,18 @@ class RealtimeSearchAgent:
                 search_term = prompt["content"]
                 logger.info(f"Performing web search for prompt: {search_term}")
 
-                search_results = self.perform_search_with_web_scraping(search_term)
-                logger.info(f"Search results obtained")
-
-                synthesized_answer = self.synthesize_answer(search_term, search_results)
-                logger.info(f"Synthesized answer: {synthesized_answer}")
+                started_at = time.perf_counter()
+                search_results = await run_in_thread(
+                    self.perform_search_with_web_scraping, search_term
+                )
+                searched_at = time.perf_counter()
+                logger.info(f"Search results obtained in {1000 * (searched_at - started_at):.0f}ms")
+
+                synthesized_answer = await self.synthesize_answer(search_term, search_results)
+                logger.info(
+                    f"Synthesized answer in {1000 * (time.perf_counter() - searched_at):.0f}ms: "
+                    f"{synthesized_answer}"
+                )
 
                 return {"role": "assistant", "content": synthesized_answer}
             else:
@@ -0,0 +1,24 @@
+import logging
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+
+
+# Configuration object
+class Config:
+
+    GOOGLE_SEARCH_URL = "https://www.google.com/search"
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    SEARCH_RESULT_COUNT = 5  # Search results passed to the LLM
+
+    # Search result cache
+    SEARCH_CACHE_SIZE = 256
+    SEARCH_CACHE_TTL = 10 * 60  # Seconds a search stays fresh
+
+    # Enriching snippets with the result pages themselves
+    PAGE_FETCH_COUNT = 3  # Top results whose pages are fetched
+    PAGE_FETCH_WORKERS = 8  # Page fetches in flight across all searches
+    PAGE_FETCH_TIMEOUT = 5  # Seconds a search waits for its pages before using snippets alone
+    PAGE_EXCERPT_CHARS = 1500  # Page text kept per result
+    PAGE_MAX_BYTES = 512 * 1024  # Bytes of a page read at most, the rest is never downloaded
+    PAGE_READ_SIZE = 16 * 1024  # Bytes read from the connection at a time
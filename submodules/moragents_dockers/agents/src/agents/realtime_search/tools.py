@@ -0,0 +1,163 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from bs4 import BeautifulSoup
+from src.agents.realtime_search.config import Config
+from src.config import Config as AppConfig
+from src.utils.cache import SingleFlightCache, normalize_cache_key
+from src.utils.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+_search_cache = SingleFlightCache(Config.SEARCH_CACHE_SIZE)
+
+# Bounded pool shared by every search, so concurrent searches can't open unlimited connections
+_page_pool = ThreadPoolExecutor(
+    max_workers=Config.PAGE_FETCH_WORKERS, thread_name_prefix="page-fetch"
+)
+
+
+def _result_link(href: Optional[str]) -> Optional[str]:
+    """Get the target of a result link, unwrapping Google's /url?q= redirects"""
+    if href and href.startswith("/url?"):
+        href = parse_qs(urlsplit(href).query).get("q", [None])[0]
+    if href and urlsplit(href).scheme in ("http", "https"):
+        return href
+    return None
+
+
+def parse_search_results(html: str, limit: int) -> List[Dict]:
+    """
+    Extract the organic results of a Google search page.
+
+    Args:
+        html (str): Search results page
+        limit (int): Maximum number of results returned
+
+    Returns:
+        List[Dict]: Results with snippet and link (None if the result has none)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    results = []
+    for result in soup.find_all("div", class_="g")[:limit]:
+        anchor = result.find("a", href=True)
+        results.append(
+            {
+                "snippet": result.get_text(strip=True),
+                "link": _result_link(anchor["href"]) if anchor else None,
+            }
+        )
+    return results
+
+
+def fetch_page_excerpt(url: str) -> Optional[str]:
+    """
+    Fetch a result page and keep the start of its readable text.
+
+    The body is only downloaded for HTML pages, and only its first
+    `PAGE_MAX_BYTES` bytes.
+
+    Returns:
+        Optional[str]: Paragraph text of the page, None if it isn't an HTML page
+    """
+    with http_client.get(
+        url,
+        headers={"User-Agent": Config.USER_AGENT},
+        timeout=(AppConfig.HTTP_CONNECT_TIMEOUT, Config.PAGE_FETCH_TIMEOUT),
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        if "html" not in response.headers.get("Content-Type", ""):
+            return None
+        body = bytearray()
+        for chunk in response.iter_content(Config.PAGE_READ_SIZE):
+            body += chunk
+            if len(body) >= Config.PAGE_MAX_BYTES:
+                break
+
+    # BeautifulSoup works out the encoding, from the page's meta tags if need be
+    soup = BeautifulSoup(bytes(body[: Config.PAGE_MAX_BYTES]), "html.parser")
+    paragraphs = (p.get_text(" ", strip=True) for p in soup.find_all("p"))
+    text = " ".join(paragraph for paragraph in paragraphs if paragraph)
+    return text[: Config.PAGE_EXCERPT_CHARS] or None
+
+
+def enrich_with_pages(results: List[Dict]) -> None:
+    """
+    Add page excerpts to the top results, fetching their pages concurrently.
+
+    Pages not fetched within `PAGE_FETCH_TIMEOUT` are skipped and their results
+    keep the snippet alone.
+    """
+    futures = {
+        _page_pool.submit(fetch_page_excerpt, result["link"]): result
+        for result in results[: Config.PAGE_FETCH_COUNT]
+        if result["link"]
+    }
+    done, not_done = wait(futures, timeout=Config.PAGE_FETCH_TIMEOUT)
+    for future in not_done:
+        future.cancel()
+    for future in done:
+        try:
+            futures[future]["excerpt"] = future.result()
+        except Exception as e:
+            logger.warning(f"Failed to fetch result page {futures[future]['link']}: {str(e)}")
+
+
+def format_results(results: List[Dict]) -> str:
+    """Format results as the text handed to the LLM"""
+    formatted_results = []
+    for result in results:
+        text = f"Result:\n{result['snippet']}"
+        if result.get("excerpt"):
+            text += f"\nPage excerpt:\n{result['excerpt']}"
+        formatted_results.append(text)
+    return "\n\n".join(formatted_results)
+
+
+def search_web(search_term: str) -> str:
+    """
+    Search Google and enrich the top results with the text of their pages.
+
+    Raises:
+        requests.RequestException: If the search page can't be fetched
+    """
+    started_at = time.perf_counter()
+    response = http_client.get(
+        Config.GOOGLE_SEARCH_URL,
+        params={"q": search_term},
+        headers={"User-Agent": Config.USER_AGENT},
+    )
+    response.raise_for_status()
+    results = parse_search_results(response.text, Config.SEARCH_RESULT_COUNT)
+    searched_at = time.perf_counter()
+
+    enrich_with_pages(results)
+    enriched_at = time.perf_counter()
+
+    logger.info(
+        f"Web search for '{search_term}' took {1000 * (enriched_at - started_at):.0f}ms "
+        f"(search {1000 * (searched_at - started_at):.0f}ms, "
+        f"page fetch {1000 * (enriched_at - searched_at):.0f}ms, {len(results)} results)"
+    )
+    return format_results(results)
+
+
+def cached_search(search_term: str) -> str:
+    """
+    Search the web, reusing results of the same query searched within `SEARCH_CACHE_TTL`.
+
+    Queries differing only in case, punctuation or spacing share a cache entry, and
+    concurrent identical searches share one request. Searches without results,
+    e.g. when Google answered with a consent or captcha page, aren't kept.
+    """
+    key = normalize_cache_key(search_term)
+    results = _search_cache.get_or_load(
+        key, lambda: search_web(search_term), Config.SEARCH_CACHE_TTL
+    )
+    if not results:
+        _search_cache.invalidate(key)
+    return results
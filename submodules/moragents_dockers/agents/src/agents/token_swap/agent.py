@@ -1,10 +1,10 @@
 import json
 import logging
 
-import requests
 from src.agents.token_swap import tools
 from src.agents.token_swap.config import Config
 from src.models.messages import ChatRequest
+from src.utils.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +27,7 @@ class TokenSwapAgent:
             {"tokenAddress": token_address, "walletAddress": wallet_address},
             chain_id,
         )
-        response = requests.get(url, headers=Config.HEADERS)
+        response = http_client.get(url, headers=Config.HEADERS)
         data = response.json()
         return data
 
@@ -38,13 +38,13 @@ class TokenSwapAgent:
             else {"tokenAddress": token_address}
         )
         url = self.api_request_url("/approve/transaction", query_params, chain_id)
-        response = requests.get(url, headers=Config.HEADERS)
+        response = http_client.get(url, headers=Config.HEADERS)
         transaction = response.json()
         return transaction
 
     def build_tx_for_swap(self, swap_params, chain_id):
         url = self.api_request_url("/swap", swap_params, chain_id)
-        swap_transaction = requests.get(url, headers=Config.HEADERS).json()
+        swap_transaction = http_client.get(url, headers=Config.HEADERS).json()
         return swap_transaction
 
     def get_response(self, message, chain_id, wallet_address):
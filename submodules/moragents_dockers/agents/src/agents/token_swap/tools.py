@@ -1,8 +1,8 @@
 import logging
 import time
 
-import requests
 from src.agents.token_swap.config import Config
+from src.utils.http_client import http_client
 from web3 import Web3
 
 
@@ -21,7 +21,7 @@ class SwapNotPossibleError(Exception):
 def search_tokens(query, chain_id, limit=1, ignore_listed="false"):
     endpoint = f"/v1.2/{chain_id}/search"
     params = {"query": query, "limit": limit, "ignore_listed": ignore_listed}
-    response = requests.get(Config.INCH_URL + endpoint, params=params, headers=Config.HEADERS)
+    response = http_client.get(Config.INCH_URL + endpoint, params=params, headers=Config.HEADERS)
     if response.status_code == 200:
         return response.json()
     else:
@@ -92,7 +92,7 @@ def validate_swap(web3: Web3, token1, token2, chain_id, amount, wallet_address):
 def get_quote(token1, token2, amount_in_wei, chain_id):
     endpoint = f"/v6.0/{chain_id}/quote"
     params = {"src": token1, "dst": token2, "amount": int(amount_in_wei)}
-    response = requests.get(Config.QUOTE_URL + endpoint, params=params, headers=Config.HEADERS)
+    response = http_client.get(Config.QUOTE_URL + endpoint, params=params, headers=Config.HEADERS)
     if response.status_code == 200:
         return response.json()
     else:
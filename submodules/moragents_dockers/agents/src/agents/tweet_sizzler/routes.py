@@ -1,7 +1,8 @@
 import logging
+from typing import Optional
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -9,7 +10,7 @@ router = APIRouter(prefix="/tweet", tags=["tweet"])
 
 
 @router.post("/regenerate")
-async def regenerate_tweet():
+async def regenerate_tweet(session_id: Optional[str] = None):
     """Regenerate a tweet"""
     logger.info("Received regenerate tweet request")
     try:
@@ -21,7 +22,7 @@ async def regenerate_tweet():
             )
 
         response = tweet_agent.generate_tweet()
-        chat_manager_instance.add_message(response)
+        session_manager_instance.get_session(session_id).chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to regenerate tweet: {str(e)}")
@@ -32,7 +33,7 @@ async def regenerate_tweet():
 
 
 @router.post("/post")
-async def post_tweet(request: Request):
+async def post_tweet(request: Request, session_id: Optional[str] = None):
     """Post a tweet"""
     logger.info("Received post tweet request")
     try:
@@ -44,7 +45,7 @@ async def post_tweet(request: Request):
             )
 
         response = await tweet_agent.post_tweet(request)
-        chat_manager_instance.add_message(response)
+        session_manager_instance.get_session(session_id).chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to post tweet: {str(e)}")
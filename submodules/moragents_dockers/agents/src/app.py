@@ -1,25 +1,50 @@
-import logging
-import os
-import time
-
-import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_ollama import ChatOllama
-
-from src.config import Config
-from src.delegator import Delegator
-from src.models.messages import ChatRequest
-from src.stores import agent_manager_instance, chat_manager_instance, workflow_manager_instance
-from src.routes import (
+# Start profiling before anything else is imported so startup import time is captured
+from src.utils.startup_profiler import startup_profiler
+
+startup_profiler.start()
+
+import asyncio  # noqa: E402
+import logging  # noqa: E402
+import os  # noqa: E402
+import time  # noqa: E402
+from datetime import timedelta  # noqa: E402
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from langchain_community.embeddings import OllamaEmbeddings  # noqa: E402
+from langchain_ollama import ChatOllama  # noqa: E402
+
+from src.agents.news_agent.prefetch import NewsPrefetchHandler  # noqa: E402
+from src.agents.rag.ingestion import ingestion_manager  # noqa: E402
+from src.config import Config  # noqa: E402
+from src.delegator import Delegator  # noqa: E402
+from src.models.messages import ChatRequest  # noqa: E402
+from src.stores import (  # noqa: E402
+    agent_manager_instance,
+    session_manager_instance,
+    workflow_manager_instance,
+)
+from src.stores.session_manager import Session  # noqa: E402
+from src.utils.concurrency import ConcurrencyLimiter, run_in_thread  # noqa: E402
+from src.utils.http_client import http_client  # noqa: E402
+from src.utils.streaming import format_sse_event  # noqa: E402
+from src.routes import (  # noqa: E402
     agent_manager_routes,
     chat_manager_routes,
+    http_client_routes,
     key_manager_routes,
+    link_manager_routes,
+    routing_routes,
+    session_manager_routes,
+    startup_routes,
     wallet_manager_routes,
     workflow_manager_routes
 )
 
+startup_profiler.mark("core_imports")
+
 # Constants
 UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
 
@@ -50,6 +75,43 @@ async def startup_event():
     await workflow_manager_instance.initialize()
 
 
+@app.on_event("startup")
+async def schedule_news_prefetch():
+    if not Config.NEWS_PREFETCH_ENABLED:
+        return
+    workflows = await workflow_manager_instance.list_workflows()
+    if not any(workflow.action == "news_prefetch" for workflow in workflows):
+        await workflow_manager_instance.create_workflow(
+            name="News prefetch",
+            description="Keep news digests of the most requested tickers warm",
+            action="news_prefetch",
+            params={},
+            interval=timedelta(seconds=Config.NEWS_PREFETCH_INTERVAL),
+        )
+
+
+@app.on_event("startup")
+async def warm_up_agents():
+    if Config.AGENT_WARMUP_ENABLED:
+        asyncio.create_task(run_in_thread(agent_manager_instance.warm_up))
+
+
+@app.on_event("startup")
+async def mark_ready():
+    startup_profiler.mark("ready")
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    http_client.close()
+    await http_client.aclose()
+
+
+@app.on_event("shutdown")
+async def stop_ingestion_workers():
+    await ingestion_manager.shutdown()
+
+
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 llm = ChatOllama(
@@ -59,11 +121,22 @@ llm = ChatOllama(
 embeddings = OllamaEmbeddings(model=Config.OLLAMA_EMBEDDING_MODEL, base_url=Config.OLLAMA_URL)
 
 delegator = Delegator(llm, embeddings)
+workflow_manager_instance.register_action_handler(
+    "news_prefetch", NewsPrefetchHandler(agent_manager_instance)
+)
+app.state.delegator = delegator
+startup_profiler.mark("delegator")
+chat_limiter = ConcurrencyLimiter(Config.MAX_CONCURRENT_CHATS, Config.CHAT_QUEUE_TIMEOUT)
 
 # Include base store routes
 app.include_router(agent_manager_routes.router)
 app.include_router(key_manager_routes.router)
+app.include_router(link_manager_routes.router)
 app.include_router(chat_manager_routes.router)
+app.include_router(http_client_routes.router)
+app.include_router(session_manager_routes.router)
+app.include_router(startup_routes.router)
+app.include_router(routing_routes.router)
 app.include_router(wallet_manager_routes.router)
 app.include_router(workflow_manager_routes.router)
 
@@ -87,16 +160,18 @@ app.include_router(swap_router)
 app.include_router(dca_router)
 app.include_router(base_router)
 
+startup_profiler.mark("routers")
 
-async def get_active_agent_for_chat(prompt: dict) -> str:
+
+async def get_active_agent_for_chat(prompt: dict, session: Session) -> str:
     """Get the active agent for handling the chat request."""
-    active_agent = agent_manager_instance.get_active_agent()
+    active_agent = agent_manager_instance.get_active_agent(session.session_id)
     if active_agent:
         return active_agent
 
     logger.info("No active agent, getting delegator response")
     start_time = time.time()
-    result = delegator.get_delegator_response(prompt)
+    result = await delegator.get_delegator_response(prompt, session)
     logger.info(f"Delegator response time: {time.time() - start_time:.2f} seconds")
     logger.info(f"Delegator response: {result}")
 
@@ -122,22 +197,33 @@ def validate_agent_response(response: dict, current_agent: str) -> dict:
 @app.post("/chat")
 async def chat(chat_request: ChatRequest):
     prompt = chat_request.prompt.dict()
-    chat_manager_instance.add_message(prompt)
+    session = session_manager_instance.get_session(chat_request.session_id)
+    session.chat_manager.add_message(prompt)
 
     try:
-        delegator.reset_attempted_agents()
-        active_agent = await get_active_agent_for_chat(prompt)
+        async with chat_limiter:
+            delegator.reset_attempted_agents(session)
+            pinned_agent = agent_manager_instance.get_active_agent(session.session_id)
 
-        logger.info(f"Delegating chat to active agent: {active_agent}")
-        current_agent, response = delegator.delegate_chat(active_agent, chat_request)
+            if Config.SPECULATIVE_FALLBACK_ENABLED and not pinned_agent:
+                logger.info("Delegating chat speculatively to the top ranked agents")
+                current_agent, response = await delegator.delegate_chat_speculative(
+                    chat_request, session
+                )
+            else:
+                active_agent = await get_active_agent_for_chat(prompt, session)
+                logger.info(f"Delegating chat to active agent: {active_agent}")
+                current_agent, response = await delegator.delegate_chat(
+                    active_agent, chat_request, session
+                )
 
         validated_response = validate_agent_response(response, current_agent)
-        chat_manager_instance.add_response(validated_response, current_agent)
+        session.chat_manager.add_response(validated_response, current_agent)
 
         logger.info(f"Sending response: {validated_response}")
         return validated_response
 
-    except TimeoutError:
+    except (TimeoutError, asyncio.TimeoutError):
         logger.error("Chat request timed out")
         raise HTTPException(status_code=504, detail="Request timed out")
     except ValueError as ve:
@@ -148,5 +234,49 @@ async def chat(chat_request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/stream")
+async def chat_stream(chat_request: ChatRequest):
+    """Stream the chat response as server-sent events
+
+    Emits `token` events as the agent generates text, then a single `done` event
+    with the responding agent and complete response (or an `error` event).
+    """
+    prompt = chat_request.prompt.dict()
+    session = session_manager_instance.get_session(chat_request.session_id)
+    session.chat_manager.add_message(prompt)
+
+    async def event_stream():
+        try:
+            async with chat_limiter:
+                delegator.reset_attempted_agents(session)
+                active_agent = await get_active_agent_for_chat(prompt, session)
+
+                logger.info(f"Streaming chat from active agent: {active_agent}")
+                async for event in delegator.delegate_chat_stream(
+                    active_agent, chat_request, session
+                ):
+                    if event["type"] == "done":
+                        if not event["agentName"]:
+                            event = {"type": "error", "message": "All available agents failed"}
+                        else:
+                            session.chat_manager.add_response(
+                                event["response"], event["agentName"]
+                            )
+                    yield format_sse_event(event)
+
+        except (TimeoutError, asyncio.TimeoutError):
+            logger.error("Streaming chat request timed out")
+            yield format_sse_event({"type": "error", "message": "Request timed out"})
+        except Exception as e:
+            logger.error(f"Error in streaming chat route: {str(e)}", exc_info=True)
+            yield format_sse_event({"type": "error", "message": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=5000, reload=True)
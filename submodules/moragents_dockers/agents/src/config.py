@@ -1,5 +1,6 @@
 import logging
 import datetime
+import os
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -14,6 +15,59 @@ class Config:
     OLLAMA_URL = "http://host.docker.internal:11434"
 
     MAX_UPLOAD_LENGTH = 16 * 1024 * 1024
+
+    # Persistent agent data (indexes, stores), survives container restarts when it is a volume
+    AGENTS_DATA_DIR = os.getenv("AGENTS_DATA_DIR", "/var/lib/agents")
+
+    # Chat concurrency configuration
+    MAX_CONCURRENT_CHATS = 32
+    CHAT_QUEUE_TIMEOUT = 60  # Seconds a chat may wait for a free slot before timing out
+    AGENT_THREAD_POOL_SIZE = 32  # Worker threads for agents that still expose a sync chat()
+
+    # Session configuration
+    MAX_SESSIONS = 500
+    SESSION_IDLE_TIMEOUT = 60 * 60  # Seconds before an idle session is evicted
+    SESSION_MEMORY_LIMIT = 256 * 1024 * 1024  # Approximate cap on stored chat history, in bytes
+
+    # Embedding router configuration
+    ROUTER_ENABLED = True
+    ROUTER_MARGIN_THRESHOLD = 0.05  # Top-1 vs top-2 cosine margin needed to skip the LLM selector
+    ROUTER_MIN_SIMILARITY = 0.35  # Minimum top-1 cosine similarity to trust the router
+
+    # Routing decision cache configuration
+    ROUTING_CACHE_SIZE = 1024
+    ROUTING_CACHE_TTL = 60 * 60  # Seconds
+
+    # Speculative fallback: run the top ranked agents concurrently instead of cascading serially
+    SPECULATIVE_FALLBACK_ENABLED = False
+    SPECULATIVE_TOP_K = 3
+    SPECULATIVE_AGENT_TIMEOUT = 60  # Seconds allowed per agent before it is abandoned
+    # Seconds higher ranked agents still running get to answer once a lower ranked one has
+    SPECULATIVE_GRACE_PERIOD = 1.0
+    # Agents acting on the user's behalf never run speculatively, a cancelled sync agent
+    # keeps running in its thread
+    SIDE_EFFECT_AGENTS = ["base", "token swap", "mor claims", "tweet sizzler", "dca"]
+
+    # Shared HTTP client configuration for agent tools
+    HTTP_CONNECT_TIMEOUT = 5  # Seconds
+    HTTP_READ_TIMEOUT = 30  # Seconds
+    HTTP_MAX_RETRIES = 3  # Retries for idempotent requests on connection errors and 429/5xx
+    HTTP_BACKOFF_FACTOR = 0.5  # Exponential backoff base in seconds
+    HTTP_POOL_MAXSIZE = 20  # Keep-alive connections per host
+    HTTP_MAX_CONCURRENT_PER_HOST = 10
+
+    # Agent loading: import agent modules on first use instead of at startup
+    LAZY_AGENT_LOADING = True
+    AGENT_WARMUP_ENABLED = False  # Load selected agents in the background after startup
+    AGENT_LOAD_RETRY_INTERVAL = 30  # Seconds before an agent that failed to load is tried again
+
+    SHORT_LINK_DB_PATH = os.path.join(AGENTS_DATA_DIR, "links.sqlite3")
+    SHORT_LINK_BASE_URL = os.getenv("SHORT_LINK_BASE_URL", "http://localhost:8080")
+    SHORT_LINK_ID_LENGTH = 10  # Random base 62 characters, too many ids to guess one
+
+    NEWS_PREFETCH_ENABLED = False  # Schedule the news prefetch workflow at startup
+    NEWS_PREFETCH_INTERVAL = 10 * 60  # Seconds between news digest refreshes
+
     AGENTS_CONFIG = {
         "agents": [
             {
@@ -23,6 +77,11 @@ class Config:
                 "name": "default",
                 "human_readable_name": "Default General Purpose",
                 "upload_required": False,
+                "examples": [
+                    "hello, how are you?",
+                    "which agents are available?",
+                    "explain what a blockchain is",
+                ],
             },
             {
                 "path": "src.agents.imagen.agent",
@@ -31,6 +90,11 @@ class Config:
                 "name": "imagen",
                 "human_readable_name": "Image Generator",
                 "upload_required": False,
+                "examples": [
+                    "generate an image of a cat astronaut",
+                    "create a picture of a sunset over the ocean",
+                    "draw a logo for my project",
+                ],
             },
             {
                 "path": "src.agents.base_agent.agent",
@@ -39,6 +103,11 @@ class Config:
                 "name": "base",
                 "human_readable_name": "Base Transaction Manager",
                 "upload_required": False,
+                "examples": [
+                    "send 10 USDC to this address on Base",
+                    "swap ETH for USDC on base",
+                    "what is my wallet balance on Base",
+                ],
             },
             {
                 "path": "src.agents.crypto_data.agent",
@@ -47,6 +116,12 @@ class Config:
                 "name": "crypto data",
                 "human_readable_name": "Crypto Data Fetcher",
                 "upload_required": False,
+                "examples": [
+                    "what is the price of ETH",
+                    "what is the market cap of solana",
+                    "fdv of bitcoin",
+                    "what is the TVL of aave",
+                ],
             },
             {
                 "path": "src.agents.hotel_finder.agent",
@@ -55,6 +130,11 @@ class Config:
                 "name": "hotel finder",
                 "human_readable_name": "Hotel Finder",
                 "upload_required": False,
+                "examples": [
+                    "find me a hotel in Paris",
+                    "cheap accommodation near the city center",
+                    "book lodging for two adults",
+                ],
             },
             # DISABLED: Pending 1inch protocol fix
             #
@@ -72,6 +152,10 @@ class Config:
                 "name": "tweet sizzler",
                 "human_readable_name": "Tweet / X-Post Generator",
                 "upload_required": False,
+                "examples": [
+                    "write a tweet about Morpheus",
+                    "draft an X post announcing our launch",
+                ],
             },
             {
                 "path": "src.agents.dca_agent.agent",
@@ -80,6 +164,11 @@ class Config:
                 "name": "dca",
                 "human_readable_name": "DCA Strategy Manager",
                 "upload_required": False,
+                "examples": [
+                    "set up a DCA strategy for ETH",
+                    "buy 50 USDC of bitcoin every week",
+                    "dollar cost average into SOL",
+                ],
             },
             {
                 "path": "src.agents.rag.agent",
@@ -88,6 +177,11 @@ class Config:
                 "name": "rag",
                 "human_readable_name": "Document Assistant",
                 "upload_required": True,
+                "examples": [
+                    "summarize the uploaded document",
+                    "what does the document say about fees",
+                    "answer questions about my PDF",
+                ],
             },
             # DISABLED:
             #
@@ -105,6 +199,10 @@ class Config:
                 "name": "mor rewards",
                 "human_readable_name": "MOR Rewards Tracker",
                 "upload_required": False,
+                "examples": [
+                    "how many MOR rewards do I have",
+                    "check my accrued MOR balance",
+                ],
             },
             {
                 "path": "src.agents.realtime_search.agent",
@@ -113,6 +211,11 @@ class Config:
                 "name": "realtime search",
                 "human_readable_name": "Real-Time Search",
                 "upload_required": False,
+                "examples": [
+                    "who won the game last night",
+                    "search the web for the latest AI news",
+                    "what happened today in the markets",
+                ],
             },
             {
                 "path": "src.agents.news_agent.agent",
@@ -121,6 +224,11 @@ class Config:
                 "name": "crypto news",
                 "human_readable_name": "Crypto News Analyst",
                 "upload_required": False,
+                "examples": [
+                    "any news about bitcoin today",
+                    "latest news on ETH and SOL",
+                    "what news could move the price of DOGE",
+                ],
             },
         ]
     }
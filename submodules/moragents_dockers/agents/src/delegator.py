@@ -1,8 +1,16 @@
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from langchain.schema import HumanMessage, SystemMessage
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.config import Config
+from src.semantic_router import SemanticRouter
+from src.stores import agent_manager_instance
+from src.stores.session_manager import Session
+from src.utils.cache import TTLCache, normalize_cache_key
+from src.utils.concurrency import call_agent_chat
+from src.utils.streaming import supports_streaming
 
 logger = logging.getLogger(__name__)
 
@@ -10,51 +18,108 @@ logger = logging.getLogger(__name__)
 class Delegator:
     def __init__(self, llm, embeddings):
         self.llm = llm  # Keep llm instance on delegator
-        self.attempted_agents = set()  # Track attempted agents within a chat session
+        self.router = (
+            SemanticRouter(
+                embeddings,
+                agent_manager_instance.get_available_agents(),
+                Config.ROUTER_MARGIN_THRESHOLD,
+                Config.ROUTER_MIN_SIMILARITY,
+            )
+            if Config.ROUTER_ENABLED
+            else None
+        )
+        self.routing_cache = TTLCache(Config.ROUTING_CACHE_SIZE, Config.ROUTING_CACHE_TTL)
+        agent_manager_instance.register_selection_callback(self._on_agents_selected)
 
-        # Load all agents via agent manager
-        agent_manager_instance.load_all_agents(llm, embeddings)
-        logger.info(f"Delegator initialized with {len(agent_manager_instance.agents)} agents")
+        # Agents are loaded by the agent manager, lazily unless configured otherwise
+        agent_manager_instance.configure(llm, embeddings)
+        logger.info(
+            f"Delegator initialized with {len(agent_manager_instance.agents)} agents loaded"
+        )
         logger.info(f"Active agents: {agent_manager_instance.get_selected_agents()}")
 
-    def reset_attempted_agents(self):
-        """Reset the set of attempted agents"""
-        self.attempted_agents = set()
-        logger.info("Reset attempted agents")
+    def _on_agents_selected(self, agent_names: List[str]) -> None:
+        """Drop cached routing decisions when the selected agents change"""
+        self.routing_cache.clear()
+        logger.info(f"Cleared routing cache after agent selection change: {agent_names}")
 
-    def get_available_unattempted_agents(self) -> List[Dict]:
-        """Get available agents that haven't been attempted yet"""
+    def reset_attempted_agents(self, session: Session):
+        """Reset the set of attempted agents for a session"""
+        session.attempted_agents = set()
+        logger.info(f"Reset attempted agents for session {session.session_id}")
+
+    def get_available_unattempted_agents(self, session: Session) -> List[Dict]:
+        """Get available agents that haven't been attempted yet in this session"""
         return [
             agent_config
             for agent_config in agent_manager_instance.get_available_agents()
             if agent_config["name"] in agent_manager_instance.get_selected_agents()
-            and agent_config["name"] not in self.attempted_agents
+            and agent_config["name"] not in session.attempted_agents
             and not (
                 agent_config["upload_required"]
-                and not chat_manager_instance.get_uploaded_file_status()
+                and not session.chat_manager.get_uploaded_file_status()
             )
         ]
 
-    def get_delegator_response(self, prompt: Dict) -> Dict[str, str]:
+    async def get_delegator_response(self, prompt: Dict, session: Session) -> Dict[str, str]:
         """Get appropriate agent based on prompt, excluding previously attempted agents"""
-        available_agents = self.get_available_unattempted_agents()
+        available_agents = self.get_available_unattempted_agents(session)
         logger.info(f"Available, unattempted agents: {available_agents}")
 
         if not available_agents:
             # If no specialized agents are available, use default agent as last resort
-            if "default" not in self.attempted_agents:
+            if "default" not in session.attempted_agents:
                 return {"agent": "default"}
             raise ValueError("No remaining agents available for current state")
 
-        system_prompt = (
+        candidate_names = [agent["name"] for agent in available_agents]
+        cache_key = (normalize_cache_key(prompt["content"]), frozenset(candidate_names))
+        selected_agent_name = self.routing_cache.get(cache_key)
+
+        if selected_agent_name:
+            logger.info(f"Routing cache hit: {selected_agent_name}")
+        else:
+            selected_agent_name = await self._select_agent(prompt, available_agents)
+            if selected_agent_name in candidate_names:
+                self.routing_cache.set(cache_key, selected_agent_name)
+
+        # Track this agent as attempted
+        session.attempted_agents.add(selected_agent_name)
+        logger.info(
+            f"Added {selected_agent_name} to attempted agents. Current attempts: {session.attempted_agents}"
+        )
+
+        return {"agent": selected_agent_name}
+
+    async def _select_agent(self, prompt: Dict, available_agents: List[Dict]) -> str:
+        """Pick an agent with the embedding router, falling back to the LLM selector"""
+        if self.router:
+            candidate_names = [agent["name"] for agent in available_agents]
+            selected_agent_name = await self.router.route(prompt["content"], candidate_names)
+            if selected_agent_name:
+                return selected_agent_name
+
+        start_time = time.perf_counter()
+        selected_agent_name = await self._select_agent_with_llm(prompt, available_agents)
+        if self.router:
+            self.router.record_llm_selection(time.perf_counter() - start_time)
+        return selected_agent_name
+
+    @staticmethod
+    def _build_selection_prompt(available_agents: List[Dict], function_name: str) -> str:
+        return (
             "Your name is Morpheus. "
             "Your primary function is to select the correct agent from the list of available agents based on the user's input. "
-            "You MUST use the 'select_agent' function to select an agent. "
+            f"You MUST use the '{function_name}' function to select an agent. "
             "Available agents and their descriptions in the format `{agent_name}: {agent_description}`"
             "You must use one of the available agent names.\n"
             + "\n".join(f"- {agent['name']}: {agent['description']}" for agent in available_agents)
         )
 
+    async def _select_agent_with_llm(self, prompt: Dict, available_agents: List[Dict]) -> str:
+        """Ask the LLM to pick an agent from the available agents"""
+        system_prompt = self._build_selection_prompt(available_agents, "select_agent")
+
         tools = [
             {
                 "name": "select_agent",
@@ -79,7 +144,7 @@ class Delegator:
             HumanMessage(content=prompt["content"]),
         ]
 
-        result = agent_selection_llm.invoke(messages)
+        result = await agent_selection_llm.ainvoke(messages)
         tool_calls = result.tool_calls
 
         if not tool_calls:
@@ -87,42 +152,258 @@ class Delegator:
 
         selected_agent = tool_calls[0]
         logger.info(f"Selected agent: {selected_agent}")
-        selected_agent_name = selected_agent.get("args", {}).get("agent")
+        return selected_agent.get("args", {}).get("agent")
 
-        # Track this agent as attempted
-        self.attempted_agents.add(selected_agent_name)
-        logger.info(
-            f"Added {selected_agent_name} to attempted agents. Current attempts: {self.attempted_agents}"
+    async def get_ranked_agents(self, prompt: Dict, session: Session, top_k: int) -> List[str]:
+        """
+        Rank the available, unattempted agents for a prompt in a single selector call.
+
+        Uses the embedding router when it is available, otherwise asks the LLM for an
+        ordered list.
+
+        Args:
+            prompt (Dict): The user prompt message
+            session (Session): Session whose attempted agents are excluded
+            top_k (int): Maximum number of agents to return
+
+        Returns:
+            List[str]: Agent names, best first
+        """
+        available_agents = self.get_available_unattempted_agents(session)
+        candidate_names = [agent["name"] for agent in available_agents]
+        if not candidate_names:
+            return []
+
+        if self.router:
+            try:
+                ranked = await self.router.rank(prompt["content"], candidate_names)
+                return [name for name, _ in ranked[:top_k]]
+            except Exception as e:
+                logger.error(f"Semantic ranking failed, falling back to LLM ranking: {str(e)}")
+
+        system_prompt = self._build_selection_prompt(available_agents, "rank_agents")
+        tools = [
+            {
+                "name": "rank_agents",
+                "description": (
+                    "Rank the agents best suited to respond to the user query, best first"
+                ),
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "agents": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": candidate_names},
+                            "description": "Agent names ordered from most to least suitable",
+                        }
+                    },
+                    "required": ["agents"],
+                },
+            }
+        ]
+        ranking_llm = self.llm.bind_tools(tools, tool_choice="rank_agents")
+        result = await ranking_llm.ainvoke(
+            [SystemMessage(content=system_prompt), HumanMessage(content=prompt["content"])]
         )
+        if not result.tool_calls:
+            raise ValueError("No agents were ranked by the model")
 
-        return {"agent": selected_agent_name}
+        ranked_names = result.tool_calls[0].get("args", {}).get("agents") or []
+        ranked_names = [name for name in dict.fromkeys(ranked_names) if name in candidate_names]
+        logger.info(f"Ranked agents: {ranked_names}")
+        return ranked_names[:top_k]
 
-    def delegate_chat(self, agent_name: str, chat_request: Any) -> Tuple[Optional[str], Any]:
+    def get_routing_metrics(self) -> Dict[str, Dict]:
+        """Get metrics for the embedding router and the routing decision cache"""
+        return {
+            "router": self.router.get_metrics() if self.router else {},
+            "cache": self.routing_cache.get_stats(),
+        }
+
+    async def delegate_chat(
+        self, agent_name: str, chat_request: Any, session: Session
+    ) -> Tuple[Optional[str], Any]:
         """Delegate chat to specific agent with cascading fallback"""
         logger.info(f"Attempting to delegate chat to agent: {agent_name}")
 
         if agent_name not in agent_manager_instance.get_selected_agents():
             logger.warning(f"Attempted to delegate to unselected agent: {agent_name}")
-            return self._try_next_agent(chat_request)
+            return await self._try_next_agent(chat_request, session)
 
-        agent = agent_manager_instance.get_agent(agent_name)
+        agent = await agent_manager_instance.get_agent_async(agent_name)
         if not agent:
-            logger.error(f"Agent {agent_name} is selected but not loaded")
-            return self._try_next_agent(chat_request)
+            logger.error(f"Agent {agent_name} is selected but could not be loaded")
+            return await self._try_next_agent(chat_request, session)
 
         try:
-            result = agent.chat(chat_request)
+            result = await call_agent_chat(agent, chat_request)
             logger.info(f"Chat delegation to {agent_name} completed successfully")
             return agent_name, result
         except Exception as e:
             logger.error(f"Error during chat delegation to {agent_name}: {str(e)}")
-            return self._try_next_agent(chat_request)
+            session.attempted_agents.add(agent_name)
+            return await self._try_next_agent(chat_request, session)
+
+    async def delegate_chat_stream(
+        self, agent_name: str, chat_request: Any, session: Session
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Delegate chat to an agent, streaming tokens when the agent supports it.
+
+        Yields `token` events as chunks arrive and finishes with a `done` event
+        carrying the responding agent and the complete response. Agents without
+        `stream_chat` are wrapped so their whole response arrives in the `done`
+        event. If a streaming agent fails before producing output, the regular
+        fallback cascade takes over.
+        """
+        agent = (
+            await agent_manager_instance.get_agent_async(agent_name)
+            if agent_name in agent_manager_instance.get_selected_agents()
+            else None
+        )
 
-    def _try_next_agent(self, chat_request: Any) -> Tuple[Optional[str], Any]:
+        if agent and supports_streaming(agent):
+            chunks: List[str] = []
+            try:
+                async for chunk in agent.stream_chat(chat_request):
+                    chunks.append(chunk)
+                    yield {"type": "token", "content": chunk}
+                response = {"role": "assistant", "content": "".join(chunks).strip()}
+                yield {"type": "done", "agentName": agent_name, "response": response}
+                return
+            except Exception as e:
+                logger.error(f"Error during streaming chat with {agent_name}: {str(e)}")
+                if chunks:
+                    yield {"type": "error", "message": f"{agent_name} failed mid-response"}
+                    return
+                session.attempted_agents.add(agent_name)
+                current_agent, response = await self._try_next_agent(chat_request, session)
+        else:
+            current_agent, response = await self.delegate_chat(agent_name, chat_request, session)
+
+        yield {"type": "done", "agentName": current_agent, "response": response}
+
+    @staticmethod
+    def _is_valid_response(response: Any) -> bool:
+        """Agents signal failure with an (error, status) tuple or an error payload"""
+        return isinstance(response, dict) and "error" not in response and "Error" not in response
+
+    async def _call_agent(self, agent_name: str, chat_request: Any) -> Any:
+        agent = await agent_manager_instance.get_agent_async(agent_name)
+        if not agent:
+            raise ValueError(f"Agent {agent_name} is selected but could not be loaded")
+        return await asyncio.wait_for(
+            call_agent_chat(agent, chat_request), timeout=Config.SPECULATIVE_AGENT_TIMEOUT
+        )
+
+    def _speculative_result_is_valid(self, agent_name: str, task: asyncio.Task) -> bool:
+        """Check a finished speculative call answered, logging why it didn't"""
+        if task.exception() is not None:
+            logger.error(f"Speculative delegation to {agent_name} failed: {task.exception()!r}")
+            return False
+        if not self._is_valid_response(task.result()):
+            logger.warning(
+                f"Speculative delegation to {agent_name} returned an error: {task.result()}"
+            )
+            return False
+        return True
+
+    async def _run_speculative(
+        self, agent_names: List[str], chat_request: Any
+    ) -> Tuple[Optional[str], Any]:
+        """
+        Run agents concurrently and return the best-ranked valid response.
+
+        All agents start at once and the first valid response is returned unless an
+        agent ranked above it is still running; those get `SPECULATIVE_GRACE_PERIOD`
+        seconds to answer, so a hung top-ranked agent can't hold the response back.
+        Agents still running when a winner is found are cancelled.
+        """
+        tasks = {
+            asyncio.create_task(self._call_agent(name, chat_request)): name for name in agent_names
+        }
+        pending = set(tasks)
+        valid: Dict[str, Any] = {}
+        loop = asyncio.get_running_loop()
+        deadline = None
+        try:
+            while pending:
+                timeout = None if deadline is None else max(deadline - loop.time(), 0)
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    if self._speculative_result_is_valid(tasks[task], task):
+                        valid[tasks[task]] = task.result()
+                if not valid:
+                    continue
+                best = next(name for name in agent_names if name in valid)
+                running = {tasks[task] for task in pending}
+                if not running.intersection(agent_names[: agent_names.index(best)]):
+                    break
+                if deadline is None:
+                    deadline = loop.time() + Config.SPECULATIVE_GRACE_PERIOD
+
+            if not valid:
+                return None, None
+            best = next(name for name in agent_names if name in valid)
+            logger.info(f"Speculative delegation won by {best}")
+            return best, valid[best]
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def delegate_chat_speculative(
+        self, chat_request: Any, session: Session
+    ) -> Tuple[Optional[str], Any]:
+        """
+        Delegate chat to the top ranked agents concurrently.
+
+        The selector is asked for a ranked list once and the top
+        `SPECULATIVE_TOP_K` agents run in parallel, bounding the worst case to
+        roughly one agent call. Agents in `SIDE_EFFECT_AGENTS` are left out of
+        the parallel run; when one is ranked first it runs alone. The default
+        agent is the last resort.
+        """
+        prompt = chat_request.prompt.dict()
+        try:
+            agent_names = await self.get_ranked_agents(prompt, session, Config.SPECULATIVE_TOP_K)
+        except ValueError as ve:
+            logger.error(f"Agent ranking failed: {str(ve)}")
+            agent_names = []
+
+        if agent_names and agent_names[0] in Config.SIDE_EFFECT_AGENTS:
+            agent_names = agent_names[:1]
+        else:
+            agent_names = [name for name in agent_names if name not in Config.SIDE_EFFECT_AGENTS]
+
+        if agent_names:
+            session.attempted_agents.update(agent_names)
+            current_agent, result = await self._run_speculative(agent_names, chat_request)
+            if current_agent:
+                return current_agent, result
+
+        if "default" not in session.attempted_agents:
+            session.attempted_agents.add("default")
+            current_agent, result = await self._run_speculative(["default"], chat_request)
+            if current_agent:
+                return current_agent, result
+
+        return None, {"error": "All available agents have been attempted without success"}
+
+    async def _try_next_agent(
+        self, chat_request: Any, session: Session
+    ) -> Tuple[Optional[str], Any]:
         """Try to get a response from the next best available agent"""
+        if Config.SPECULATIVE_FALLBACK_ENABLED:
+            return await self.delegate_chat_speculative(chat_request, session)
+
         try:
             # Get next best agent
-            result = self.get_delegator_response(chat_request.prompt.dict())
+            result = await self.get_delegator_response(chat_request.prompt.dict(), session)
 
             if "agent" not in result:
                 return None, {"error": "No suitable agent found"}
@@ -130,7 +411,7 @@ class Delegator:
             next_agent = result["agent"]
             logger.info(f"Cascading to next agent: {next_agent}")
 
-            return self.delegate_chat(next_agent, chat_request)
+            return await self.delegate_chat(next_agent, chat_request, session)
         except ValueError as ve:
             # No more agents available
             logger.error(f"No more agents available: {str(ve)}")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -10,3 +12,4 @@ class ChatRequest(BaseModel):
     prompt: ChatMessage
     chain_id: str
     wallet_address: str
+    session_id: Optional[str] = None
@@ -1,7 +1,10 @@
+import asyncio
 import logging
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
+from src.config import Config
 from src.stores import agent_manager_instance
+from src.utils.concurrency import run_in_thread
 
 logger = logging.getLogger(__name__)
 
@@ -28,4 +31,13 @@ async def set_selected_agents(request: Request) -> JSONResponse:
     agent_manager_instance.set_selected_agents(agent_names)
     logger.info(f"Newly selected agents: {agent_manager_instance.get_selected_agents()}")
 
+    if Config.AGENT_WARMUP_ENABLED:
+        asyncio.create_task(run_in_thread(agent_manager_instance.warm_up, agent_names))
+
     return JSONResponse(content={"status": "success", "agents": agent_names})
+
+
+@router.get("/load_report")
+async def get_load_report() -> JSONResponse:
+    """Get load status and load time for each agent"""
+    return JSONResponse(content={"agents": agent_manager_instance.get_load_report()})
@@ -1,6 +1,7 @@
 import logging
+from typing import Optional
 from fastapi import APIRouter
-from src.stores import chat_manager_instance
+from src.stores import session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -8,15 +9,16 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 
 
 @router.get("/messages")
-async def get_messages():
+async def get_messages(session_id: Optional[str] = None):
     """Get all chat messages"""
     logger.info("Received get_messages request")
-    return {"messages": chat_manager_instance.get_messages()}
+    chat_manager = session_manager_instance.get_session(session_id).chat_manager
+    return {"messages": chat_manager.get_messages()}
 
 
 @router.get("/clear")
-async def clear_messages():
+async def clear_messages(session_id: Optional[str] = None):
     """Clear chat message history"""
     logger.info("Clearing message history")
-    chat_manager_instance.clear_messages()
+    session_manager_instance.get_session(session_id).chat_manager.clear_messages()
     return {"response": "successfully cleared message history"}
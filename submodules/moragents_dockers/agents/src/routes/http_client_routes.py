@@ -0,0 +1,15 @@
+import logging
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from src.utils.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/http", tags=["http"])
+
+
+@router.get("/stats")
+async def get_http_stats() -> JSONResponse:
+    """Get per-host request, error and latency counters and connection pool occupancy"""
+    return JSONResponse(content=http_client.get_stats())
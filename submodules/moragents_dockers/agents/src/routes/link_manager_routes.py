@@ -0,0 +1,21 @@
+import logging
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, RedirectResponse
+from src.stores import link_manager_instance
+from src.utils.concurrency import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["links"])
+
+
+@router.get("/s/{link_id}")
+async def follow_link(link_id: str):
+    """Redirect a short link to its original URL"""
+    url = await run_in_thread(link_manager_instance.resolve, link_id)
+    if url is None:
+        return JSONResponse(
+            status_code=404, content={"status": "error", "message": f"Link {link_id} not found"}
+        )
+    return RedirectResponse(url, status_code=302)
@@ -0,0 +1,15 @@
+import logging
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/routing", tags=["routing"])
+
+
+@router.get("/metrics")
+async def get_routing_metrics(request: Request) -> JSONResponse:
+    """Get agent routing latency, LLM fallback-rate and routing cache metrics"""
+    delegator = request.app.state.delegator
+    return JSONResponse(content=delegator.get_routing_metrics())
@@ -0,0 +1,33 @@
+import logging
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from src.stores import session_manager_instance
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/sessions", tags=["sessions"])
+
+
+@router.get("/list")
+async def list_sessions() -> JSONResponse:
+    """Get metadata for all live sessions"""
+    return JSONResponse(content={"sessions": session_manager_instance.list_sessions()})
+
+
+@router.get("/stats")
+async def get_session_stats() -> JSONResponse:
+    """Get session store statistics"""
+    return JSONResponse(content=session_manager_instance.get_stats())
+
+
+@router.delete("/{session_id}")
+async def remove_session(session_id: str) -> JSONResponse:
+    """Remove a session and its conversation state"""
+    if session_manager_instance.remove_session(session_id):
+        logger.info(f"Removed session {session_id}")
+        return JSONResponse(content={"status": "success"})
+    return JSONResponse(
+        status_code=404,
+        content={"status": "error", "message": f"Session {session_id} not found"},
+    )
@@ -0,0 +1,18 @@
+import logging
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from src.stores import agent_manager_instance
+from src.utils.startup_profiler import startup_profiler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/startup", tags=["startup"])
+
+
+@router.get("/profile")
+async def get_startup_profile(top: int = 50) -> JSONResponse:
+    """Get startup milestones, the slowest module imports and per-agent load times"""
+    report = startup_profiler.get_report(top)
+    report["agents"] = agent_manager_instance.get_load_report()
+    return JSONResponse(content=report)
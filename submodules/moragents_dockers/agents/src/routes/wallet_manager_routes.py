@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from src.stores import wallet_manager_instance
@@ -58,10 +59,10 @@ async def restore_wallet(request: Request) -> JSONResponse:
 
 
 @router.get("/list")
-async def list_wallets() -> JSONResponse:
+async def list_wallets(session_id: Optional[str] = None) -> JSONResponse:
     """Get list of all wallet IDs"""
     try:
-        wallet_list = wallet_manager_instance.list_wallets()
+        wallet_list = wallet_manager_instance.list_wallets(session_id)
         return JSONResponse(content={"wallets": wallet_list})
     except Exception as e:
         logger.error(f"Failed to list wallets: {str(e)}")
@@ -145,13 +146,14 @@ async def set_active_wallet(request: Request) -> JSONResponse:
     """Set active wallet"""
     data = await request.json()
     wallet_id = data.get("wallet_id")
+    session_id = data.get("session_id")
 
     if not wallet_id:
         return JSONResponse(
             status_code=400, content={"status": "error", "message": "Missing wallet_id"}
         )
 
-    success = wallet_manager_instance.set_active_wallet(wallet_id)
+    success = wallet_manager_instance.set_active_wallet(wallet_id, session_id)
     if success:
         address = wallet_manager_instance.get_wallet_address(wallet_id)
         return JSONResponse(
@@ -164,9 +166,9 @@ async def set_active_wallet(request: Request) -> JSONResponse:
 
 
 @router.get("/active")
-async def get_active_wallet() -> JSONResponse:
+async def get_active_wallet(session_id: Optional[str] = None) -> JSONResponse:
     """Get active wallet ID"""
-    active_wallet_id = wallet_manager_instance.get_active_wallet_id()
+    active_wallet_id = wallet_manager_instance.get_active_wallet_id(session_id)
     if active_wallet_id:
         address = wallet_manager_instance.get_wallet_address(active_wallet_id)
         return JSONResponse(content={"active_wallet_id": active_wallet_id, "address": address})
@@ -174,7 +176,7 @@ async def get_active_wallet() -> JSONResponse:
 
 
 @router.delete("/active")
-async def clear_active_wallet() -> JSONResponse:
+async def clear_active_wallet(session_id: Optional[str] = None) -> JSONResponse:
     """Clear active wallet"""
-    wallet_manager_instance.clear_active_wallet()
+    wallet_manager_instance.clear_active_wallet(session_id)
     return JSONResponse(content={"status": "success"})
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticRouter:
+    """
+    Fast routing tier that picks an agent by embedding similarity.
+
+    Each agent's description and example utterances are embedded once. A prompt is
+    embedded and scored against every utterance in a single matrix product; an
+    agent's score is its best-matching utterance. The router only commits to an
+    agent when the winner is similar enough and clearly ahead of the runner-up,
+    otherwise the caller falls back to the LLM selector.
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        agent_configs: List[Dict],
+        margin_threshold: float,
+        min_similarity: float,
+    ) -> None:
+        self.embeddings = embeddings
+        self.agent_configs = agent_configs
+        self.margin_threshold = margin_threshold
+        self.min_similarity = min_similarity
+
+        self.agent_names: List[str] = [config["name"] for config in agent_configs]
+        self._matrix: Optional[np.ndarray] = None  # (utterances, dim), L2 normalised
+        self._owners: Optional[np.ndarray] = None  # agent index for each utterance row
+        self._index_lock = asyncio.Lock()
+
+        self._metrics = {
+            "requests": 0,
+            "fast_routed": 0,
+            "llm_fallbacks": 0,
+            "router_errors": 0,
+            "router_latency_total": 0.0,
+            "llm_latency_total": 0.0,
+        }
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    async def _ensure_index(self) -> None:
+        """Embed agent descriptions and examples on first use"""
+        if self._matrix is not None:
+            return
+        async with self._index_lock:
+            if self._matrix is not None:
+                return
+
+            texts, owners = [], []
+            for index, config in enumerate(self.agent_configs):
+                for utterance in [config["description"], *config.get("examples", [])]:
+                    texts.append(utterance)
+                    owners.append(index)
+
+            vectors = await self.embeddings.aembed_documents(texts)
+            self._matrix = self._normalize(np.asarray(vectors, dtype=np.float32))
+            self._owners = np.asarray(owners)
+            logger.info(
+                f"Semantic router indexed {len(texts)} utterances "
+                f"for {len(self.agent_names)} agents"
+            )
+
+    def score(self, query_vector: np.ndarray, candidates: List[str]) -> List[Tuple[str, float]]:
+        """
+        Score candidate agents against an embedded prompt.
+
+        Args:
+            query_vector (np.ndarray): Embedding of the prompt
+            candidates (List[str]): Agent names eligible for selection
+
+        Returns:
+            List[Tuple[str, float]]: Candidates with their similarity, best first
+        """
+        similarities = self._matrix @ self._normalize(query_vector.astype(np.float32))
+        agent_scores = np.full(len(self.agent_names), -np.inf, dtype=np.float32)
+        np.maximum.at(agent_scores, self._owners, similarities)
+
+        candidate_set = set(candidates)
+        candidate_indices = np.array(
+            [i for i, name in enumerate(self.agent_names) if name in candidate_set], dtype=int
+        )
+        if candidate_indices.size == 0:
+            return []
+        ranked = candidate_indices[np.argsort(-agent_scores[candidate_indices])]
+        return [(self.agent_names[i], float(agent_scores[i])) for i in ranked]
+
+    async def rank(self, prompt: str, candidates: List[str]) -> List[Tuple[str, float]]:
+        """
+        Rank candidate agents for a prompt by embedding similarity.
+
+        Args:
+            prompt (str): The user prompt
+            candidates (List[str]): Agent names eligible for selection
+
+        Returns:
+            List[Tuple[str, float]]: Candidates with their similarity, best first
+        """
+        await self._ensure_index()
+        query_vector = np.asarray(await self.embeddings.aembed_query(prompt))
+        return self.score(query_vector, candidates)
+
+    async def route(self, prompt: str, candidates: List[str]) -> Optional[str]:
+        """
+        Pick an agent for the prompt, or None when the LLM selector should decide.
+
+        Args:
+            prompt (str): The user prompt
+            candidates (List[str]): Agent names eligible for selection
+
+        Returns:
+            Optional[str]: The selected agent name, None if the decision is ambiguous
+        """
+        self._metrics["requests"] += 1
+        start_time = time.perf_counter()
+        try:
+            ranked = await self.rank(prompt, candidates)
+        except Exception as e:
+            logger.error(f"Semantic routing failed, falling back to LLM selector: {str(e)}")
+            self._metrics["router_errors"] += 1
+            return None
+        finally:
+            self._metrics["router_latency_total"] += time.perf_counter() - start_time
+
+        if not ranked:
+            return None
+
+        top_name, top_score = ranked[0]
+        margin = top_score - ranked[1][1] if len(ranked) > 1 else float("inf")
+        logger.info(f"Semantic router top match: {top_name} ({top_score:.3f}, margin {margin:.3f})")
+
+        if top_score >= self.min_similarity and margin >= self.margin_threshold:
+            self._metrics["fast_routed"] += 1
+            return top_name
+        return None
+
+    def record_llm_selection(self, latency: float) -> None:
+        """Record a selection that had to fall back to the LLM"""
+        self._metrics["llm_fallbacks"] += 1
+        self._metrics["llm_latency_total"] += latency
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Get routing latency and fallback-rate metrics"""
+        requests = self._metrics["requests"]
+        fallbacks = self._metrics["llm_fallbacks"]
+        return {
+            "requests": requests,
+            "fast_routed": self._metrics["fast_routed"],
+            "llm_fallbacks": fallbacks,
+            "router_errors": self._metrics["router_errors"],
+            "fallback_rate": fallbacks / requests if requests else 0.0,
+            "avg_router_latency_ms": (
+                1000 * self._metrics["router_latency_total"] / requests if requests else 0.0
+            ),
+            "avg_llm_latency_ms": (
+                1000 * self._metrics["llm_latency_total"] / fallbacks if fallbacks else 0.0
+            ),
+        }
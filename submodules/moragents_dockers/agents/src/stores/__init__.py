@@ -1,5 +1,7 @@
 from src.stores.agent_manager import agent_manager_instance
 from src.stores.chat_manager import chat_manager_instance
 from src.stores.key_manager import key_manager_instance
+from src.stores.link_manager import link_manager_instance
+from src.stores.session_manager import session_manager_instance
 from src.stores.wallet_manager import wallet_manager_instance
 from src.stores.workflow_manager import workflow_manager_instance
@@ -1,11 +1,15 @@
 import importlib
 import logging
+import threading
+import time
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from langchain_ollama import ChatOllama
 from langchain_community.embeddings import OllamaEmbeddings
 
 from src.config import Config
+from src.stores.session_manager import session_manager_instance
+from src.utils.concurrency import run_in_thread
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +18,19 @@ class AgentManager:
     """
     Manages the loading, selection and activation of agents in the system.
 
+    The active agent is tracked per session in the session store. With
+    `Config.LAZY_AGENT_LOADING`, an agent's module is only imported and the agent
+    constructed the first time it is requested, so unused agents cost nothing at
+    startup. An agent that fails to load is tried again on a request made
+    `Config.AGENT_LOAD_RETRY_INTERVAL` seconds or more after the failure.
+
     Attributes:
-        active_agent (Optional[str]): Currently active agent name
         selected_agents (List[str]): List of selected agent names
         config (Dict): Configuration dictionary for agents
         agents (Dict[str, Any]): Dictionary of loaded agent instances
+        load_times (Dict[str, Dict[str, float]]): Seconds spent importing and constructing
+            each agent
+        load_errors (Dict[str, str]): Error message for each agent that failed to load
         llm (ChatOllama): Language model instance
         embeddings (OllamaEmbeddings): Embeddings model instance
     """
@@ -30,12 +42,16 @@ class AgentManager:
         Args:
             config (Dict): Configuration dictionary containing agent definitions
         """
-        self.active_agent: Optional[str] = None
         self.selected_agents: List[str] = []
         self.config = config
         self.agents: Dict[str, Any] = {}
         self.llm: Optional[ChatOllama] = None
         self.embeddings: Optional[OllamaEmbeddings] = None
+        self.load_times: Dict[str, Dict[str, float]] = {}
+        self.load_errors: Dict[str, str] = {}
+        self._failed_at: Dict[str, float] = {}
+        self._load_locks = {agent["name"]: threading.Lock() for agent in config["agents"]}
+        self._selection_callbacks: List[Callable[[List[str]], None]] = []
 
         # Select first 6 agents by default
         self.set_selected_agents([agent["name"] for agent in config["agents"][:6]])
@@ -51,16 +67,44 @@ class AgentManager:
         Returns:
             bool: True if agent loaded successfully, False otherwise
         """
+        start_time = time.perf_counter()
         try:
             module = importlib.import_module(agent_config["path"])
             agent_class = getattr(module, agent_config["class"])
+            imported_at = time.perf_counter()
             self.agents[agent_config["name"]] = agent_class(agent_config, self.llm, self.embeddings)
-            logger.info(f"Loaded agent: {agent_config['name']}")
+            self.load_times[agent_config["name"]] = {
+                "import": imported_at - start_time,
+                "construct": time.perf_counter() - imported_at,
+            }
+            self.load_errors.pop(agent_config["name"], None)
+            self._failed_at.pop(agent_config["name"], None)
+            logger.info(
+                f"Loaded agent: {agent_config['name']} in {time.perf_counter() - start_time:.2f}s"
+            )
             return True
         except Exception as e:
+            self.load_errors[agent_config["name"]] = str(e)
+            self._failed_at[agent_config["name"]] = time.monotonic()
             logger.error(f"Failed to load agent {agent_config['name']}: {str(e)}")
             return False
 
+    def configure(self, llm: ChatOllama, embeddings: OllamaEmbeddings) -> None:
+        """
+        Set the models agents are constructed with.
+
+        Agents are loaded eagerly unless `Config.LAZY_AGENT_LOADING` is enabled, in
+        which case each agent is loaded on first use.
+
+        Args:
+            llm (ChatOllama): Language model instance
+            embeddings (OllamaEmbeddings): Embeddings model instance
+        """
+        self.llm = llm
+        self.embeddings = embeddings
+        if not Config.LAZY_AGENT_LOADING:
+            self.load_all_agents(llm, embeddings)
+
     def load_all_agents(self, llm: ChatOllama, embeddings: OllamaEmbeddings) -> None:
         """
         Load all available agents with the given language and embedding models.
@@ -75,32 +119,41 @@ class AgentManager:
             self._load_agent(agent_config)
         logger.info(f"Loaded {len(self.agents)} agents")
 
-    def get_active_agent(self) -> Optional[str]:
+    def get_active_agent(self, session_id: Optional[str] = None) -> Optional[str]:
         """
-        Get the name of the currently active agent.
+        Get the name of the currently active agent for a session.
+
+        Args:
+            session_id (Optional[str]): Session id, None for the default session
 
         Returns:
             Optional[str]: Name of active agent or None if no agent is active
         """
-        return self.active_agent
+        return session_manager_instance.get_session(session_id).active_agent
 
-    def set_active_agent(self, agent_name: Optional[str]) -> None:
+    def set_active_agent(self, agent_name: Optional[str], session_id: Optional[str] = None) -> None:
         """
-        Set the active agent.
+        Set the active agent for a session.
 
         Args:
             agent_name (Optional[str]): Name of agent to activate
+            session_id (Optional[str]): Session id, None for the default session
 
         Raises:
             ValueError: If agent_name is not in selected_agents
         """
         if agent_name and agent_name not in self.selected_agents:
             raise ValueError(f"Agent {agent_name} is not selected")
-        self.active_agent = agent_name
+        session_manager_instance.get_session(session_id).active_agent = agent_name
 
-    def clear_active_agent(self) -> None:
-        """Clear the currently active agent."""
-        self.active_agent = None
+    def clear_active_agent(self, session_id: Optional[str] = None) -> None:
+        """
+        Clear the currently active agent for a session.
+
+        Args:
+            session_id (Optional[str]): Session id, None for the default session
+        """
+        session_manager_instance.get_session(session_id).active_agent = None
 
     def get_available_agents(self) -> List[Dict]:
         """
@@ -137,9 +190,19 @@ class AgentManager:
             raise ValueError(f"Invalid agent names provided: {invalid_names}")
 
         self.selected_agents = agent_names
+        session_manager_instance.clear_active_agents(keep=agent_names)
+
+        for callback in self._selection_callbacks:
+            callback(agent_names)
 
-        if self.active_agent not in agent_names:
-            self.clear_active_agent()
+    def register_selection_callback(self, callback: Callable[[List[str]], None]) -> None:
+        """
+        Register a callback invoked whenever the selected agents change.
+
+        Args:
+            callback (Callable[[List[str]], None]): Called with the new selected agent names
+        """
+        self._selection_callbacks.append(callback)
 
     def get_agent_config(self, agent_name: str) -> Optional[Dict]:
         """
@@ -155,7 +218,7 @@ class AgentManager:
 
     def get_agent(self, agent_name: str) -> Optional[Any]:
         """
-        Get agent instance by name.
+        Get agent instance by name, loading it on first use.
 
         Args:
             agent_name (str): Name of agent
@@ -163,8 +226,74 @@ class AgentManager:
         Returns:
             Optional[Any]: Agent instance if found, None otherwise
         """
+        agent = self.agents.get(agent_name)
+        if agent is not None:
+            return agent
+
+        agent_config = self.get_agent_config(agent_name)
+        if agent_config is None or self.llm is None:
+            return None
+
+        with self._load_locks[agent_name]:
+            failed_at = self._failed_at.get(agent_name)
+            retry_due = (
+                failed_at is None
+                or time.monotonic() - failed_at >= Config.AGENT_LOAD_RETRY_INTERVAL
+            )
+            if agent_name not in self.agents and retry_due:
+                self._load_agent(agent_config)
         return self.agents.get(agent_name)
 
+    async def get_agent_async(self, agent_name: str) -> Optional[Any]:
+        """
+        Get agent instance by name, loading it on the agent thread pool on first use
+        so module imports don't block the event loop.
+
+        Args:
+            agent_name (str): Name of agent
+
+        Returns:
+            Optional[Any]: Agent instance if found, None otherwise
+        """
+        agent = self.agents.get(agent_name)
+        if agent is not None:
+            return agent
+        return await run_in_thread(self.get_agent, agent_name)
+
+    def warm_up(self, agent_names: Optional[List[str]] = None) -> None:
+        """
+        Load agents ahead of their first request.
+
+        Args:
+            agent_names (Optional[List[str]]): Agents to load, defaults to the selected agents
+        """
+        for agent_name in agent_names or list(self.selected_agents):
+            self.get_agent(agent_name)
+        logger.info(f"Warm-up complete, {len(self.agents)} agents loaded")
+
+    def get_load_report(self) -> List[Dict[str, Any]]:
+        """
+        Get the load status of every available agent.
+
+        Returns:
+            List[Dict[str, Any]]: Per agent selection, load status, import and
+                construction time, and error
+        """
+        report = []
+        for agent in self.config["agents"]:
+            times = self.load_times.get(agent["name"], {})
+            report.append(
+                {
+                    "name": agent["name"],
+                    "selected": agent["name"] in self.selected_agents,
+                    "loaded": agent["name"] in self.agents,
+                    "import_ms": round(1000 * times["import"], 1) if times else None,
+                    "construct_ms": round(1000 * times["construct"], 1) if times else None,
+                    "error": self.load_errors.get(agent["name"]),
+                }
+            )
+        return report
+
 
 # Create an instance to act as a singleton store
 agent_manager_instance = AgentManager(Config.AGENTS_CONFIG)
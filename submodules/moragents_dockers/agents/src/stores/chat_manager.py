@@ -16,9 +16,15 @@ class ChatManager:
                             and assume all risks associated with its limitations and potential errors.""",
             }
         ]
+        self.memory_usage = self._message_size(self.messages[0])
+
+    @staticmethod
+    def _message_size(message: Dict[str, str]) -> int:
+        return sum(len(str(value).encode()) for value in message.values())
 
     def add_message(self, message: Dict[str, str]):
         self.messages.append(message)
+        self.memory_usage += self._message_size(message)
         logger.info(f"Added message: {message}")
 
     def get_messages(self) -> List[Dict[str, str]]:
@@ -33,6 +39,7 @@ class ChatManager:
 
     def clear_messages(self):
         self.messages = [self.messages[0]]  # Keep the initial message
+        self.memory_usage = self._message_size(self.messages[0])
         logger.info("Cleared message history")
 
     def get_last_message(self) -> Dict[str, str]:
@@ -44,6 +51,10 @@ class ChatManager:
         self.add_message(response_with_agent)
         logger.info(f"Added response from agent {agent_name}: {response_with_agent}")
 
+    def get_memory_usage(self) -> int:
+        """Approximate size of the stored history in UTF-8 bytes"""
+        return self.memory_usage
+
     def get_chat_history(self) -> str:
         return "\n".join([f"{msg['role']}: {msg['content']}" for msg in self.messages])
 
@@ -0,0 +1,111 @@
+import logging
+import os
+import secrets
+import sqlite3
+import string
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+ALPHABET = string.digits + string.ascii_letters
+
+
+def new_link_id() -> str:
+    """Generate a random base 62 link id"""
+    return "".join(secrets.choice(ALPHABET) for _ in range(Config.SHORT_LINK_ID_LENGTH))
+
+
+class LinkManager:
+    """
+    In-process URL shortener backed by a SQLite table.
+
+    Every URL is stored once under a random base 62 id, so shortening the same
+    URL twice yields the same id while ids can't be enumerated to discover the
+    other stored links. Short links resolve through the `/s/{link_id}` route of
+    the agents API. Only the agents shorten links, there is no public route
+    to add one.
+
+    Attributes:
+        db_path (str): SQLite database file
+        base_url (str): Public URL of the agents API that short links point to
+    """
+
+    def __init__(self, db_path: str, base_url: str) -> None:
+        self.db_path = db_path
+        self.base_url = base_url.rstrip("/")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS links ("
+                "id TEXT PRIMARY KEY, url TEXT NOT NULL UNIQUE, created_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _find_ids(conn: sqlite3.Connection, urls: List[str]) -> Dict[str, str]:
+        placeholders = ", ".join("?" for _ in urls)
+        return dict(conn.execute(f"SELECT url, id FROM links WHERE url IN ({placeholders})", urls))
+
+    def shorten_many(self, urls: List[str]) -> List[str]:
+        """
+        Get the short link ids of several URLs, storing the ones not seen before.
+
+        Args:
+            urls (List[str]): URLs to shorten
+
+        Returns:
+            List[str]: One link id per URL, in the same order
+        """
+        unique = list(dict.fromkeys(urls))
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            ids = self._find_ids(conn, unique)
+            # A URL whose random id is already taken is ignored and gets another id
+            while len(ids) < len(unique):
+                conn.executemany(
+                    "INSERT OR IGNORE INTO links (id, url, created_at) VALUES (?, ?, ?)",
+                    [(new_link_id(), url, now) for url in unique if url not in ids],
+                )
+                conn.commit()
+                ids = self._find_ids(conn, unique)
+        return [ids[url] for url in urls]
+
+    def shorten(self, url: str) -> str:
+        """Get the short link id of a URL"""
+        return self.shorten_many([url])[0]
+
+    def short_url(self, link_id: str) -> str:
+        """Build the public URL of a short link"""
+        return f"{self.base_url}/s/{link_id}"
+
+    def resolve(self, link_id: str) -> Optional[str]:
+        """
+        Find the URL behind a short link.
+
+        Args:
+            link_id (str): Short link id
+
+        Returns:
+            Optional[str]: The original URL, None if the id is unknown
+        """
+        with self._lock:
+            row = (
+                self._connect().execute("SELECT url FROM links WHERE id = ?", (link_id,)).fetchone()
+            )
+        return row[0] if row else None
+
+
+# Create an instance to act as a singleton store
+link_manager_instance = LinkManager(Config.SHORT_LINK_DB_PATH, Config.SHORT_LINK_BASE_URL)
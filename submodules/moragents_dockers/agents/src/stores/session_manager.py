@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from src.config import Config
+from src.stores.chat_manager import ChatManager, chat_manager_instance
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_ID = "default"
+
+
+@dataclass
+class Session:
+    """Conversation state owned by a single client session"""
+
+    session_id: str
+    chat_manager: ChatManager = field(default_factory=ChatManager)
+    active_agent: Optional[str] = None
+    active_wallet_id: Optional[str] = None
+    attempted_agents: Set[str] = field(default_factory=set)
+    uploaded_documents: List[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    last_accessed: float = field(default_factory=time.time)
+
+    def touch(self) -> None:
+        """Mark the session as recently used"""
+        self.last_accessed = time.time()
+
+    def get_memory_usage(self) -> int:
+        """Approximate memory held by the session"""
+        return self.chat_manager.get_memory_usage()
+
+    def to_dict(self) -> dict:
+        """Convert session metadata to dictionary format"""
+        return {
+            "session_id": self.session_id,
+            "active_agent": self.active_agent,
+            "active_wallet_id": self.active_wallet_id,
+            "message_count": len(self.chat_manager.get_messages()),
+            "uploaded_documents": len(self.uploaded_documents),
+            "memory_usage": self.get_memory_usage(),
+            "created_at": self.created_at,
+            "last_accessed": self.last_accessed,
+        }
+
+
+class SessionManager:
+    """
+    Keeps per-session conversation state so concurrent users don't share history,
+    active agent, fallback bookkeeping or active wallet.
+
+    Sessions are kept in least-recently-used order. Idle sessions are evicted after
+    `idle_timeout` seconds, and the least recently used sessions are evicted whenever
+    the session count or the approximate memory footprint exceeds its limit. The
+    default session wraps the legacy `chat_manager_instance` and is never evicted,
+    so clients that don't send a session id keep working unchanged.
+    """
+
+    def __init__(self, max_sessions: int, idle_timeout: float, memory_limit: int) -> None:
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.memory_limit = memory_limit
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._evicted_count = 0
+
+        self._sessions[DEFAULT_SESSION_ID] = Session(
+            session_id=DEFAULT_SESSION_ID, chat_manager=chat_manager_instance
+        )
+
+    def get_session(self, session_id: Optional[str] = None) -> Session:
+        """
+        Get the session for an id, creating it on first use.
+
+        Args:
+            session_id (Optional[str]): Client supplied session id, None for the default session
+
+        Returns:
+            Session: The session state
+        """
+        session_id = session_id or DEFAULT_SESSION_ID
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id=session_id)
+                self._sessions[session_id] = session
+                logger.info(f"Created session {session_id}")
+            session.touch()
+            self._sessions.move_to_end(session_id)
+            self._evict()
+            return session
+
+    def has_session(self, session_id: str) -> bool:
+        """Check if a session exists"""
+        with self._lock:
+            return session_id in self._sessions
+
+    def remove_session(self, session_id: str) -> bool:
+        """Remove a session. The default session is reset instead of removed."""
+        with self._lock:
+            if session_id == DEFAULT_SESSION_ID:
+                session = self._sessions[DEFAULT_SESSION_ID]
+                session.chat_manager.clear_messages()
+                session.active_agent = None
+                session.active_wallet_id = None
+                session.attempted_agents = set()
+                session.uploaded_documents = []
+                return True
+            return self._sessions.pop(session_id, None) is not None
+
+    def list_sessions(self) -> List[dict]:
+        """Get metadata for all live sessions"""
+        with self._lock:
+            return [session.to_dict() for session in self._sessions.values()]
+
+    def clear_active_agents(self, keep: List[str]) -> None:
+        """Clear the active agent of every session whose agent is not in `keep`"""
+        with self._lock:
+            for session in self._sessions.values():
+                if session.active_agent not in keep:
+                    session.active_agent = None
+
+    def clear_active_wallet(self, wallet_id: str) -> None:
+        """Clear a wallet from every session that has it active"""
+        with self._lock:
+            for session in self._sessions.values():
+                if session.active_wallet_id == wallet_id:
+                    session.active_wallet_id = None
+
+    def get_memory_usage(self) -> int:
+        """Approximate memory held by all sessions"""
+        with self._lock:
+            return sum(session.get_memory_usage() for session in self._sessions.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get session store statistics"""
+        with self._lock:
+            return {
+                "session_count": len(self._sessions),
+                "memory_usage": self.get_memory_usage(),
+                "evicted_count": self._evicted_count,
+                "max_sessions": self.max_sessions,
+                "memory_limit": self.memory_limit,
+            }
+
+    def _evict(self) -> None:
+        """Evict idle sessions, then least recently used ones until within limits"""
+        now = time.time()
+        for session_id, session in list(self._sessions.items()):
+            if session_id != DEFAULT_SESSION_ID and now - session.last_accessed > self.idle_timeout:
+                self._drop(session_id, "idle")
+
+        memory_usage = self.get_memory_usage()
+        while len(self._sessions) > self.max_sessions or memory_usage > self.memory_limit:
+            candidate = next((sid for sid in self._sessions if sid != DEFAULT_SESSION_ID), None)
+            # Never evict the session that was just touched (it sits at the end)
+            if candidate is None or candidate == next(reversed(self._sessions)):
+                break
+            memory_usage -= self._sessions[candidate].get_memory_usage()
+            self._drop(candidate, "lru")
+
+    def _drop(self, session_id: str, reason: str) -> None:
+        del self._sessions[session_id]
+        self._evicted_count += 1
+        logger.info(f"Evicted session {session_id} ({reason})")
+
+
+# Create an instance to act as a singleton store
+session_manager_instance = SessionManager(
+    Config.MAX_SESSIONS, Config.SESSION_IDLE_TIMEOUT, Config.SESSION_MEMORY_LIMIT
+)
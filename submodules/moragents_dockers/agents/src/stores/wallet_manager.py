@@ -1,9 +1,13 @@
 import json
 import logging
-from typing import Dict, Optional
-from cdp import Cdp, Wallet, WalletData
+from typing import TYPE_CHECKING, Dict, Optional
 from pathlib import Path
 from src.stores.key_manager import key_manager_instance
+from src.stores.session_manager import DEFAULT_SESSION_ID, session_manager_instance
+
+# The CDP SDK takes seconds to import, so it is only imported once a wallet is used
+if TYPE_CHECKING:
+    from cdp import Cdp, Wallet
 
 logger = logging.getLogger(__name__)
 
@@ -11,9 +15,9 @@ logger = logging.getLogger(__name__)
 class WalletManager:
     def __init__(self):
         """Initialize the WalletManager"""
-        self.wallets: Dict[str, Wallet] = {}
+        self.wallets: Dict[str, "Wallet"] = {}
         self.wallet_data: Dict[str, dict] = {}
-        self.cdp_client: Optional[Cdp] = None
+        self.cdp_client: Optional["Cdp"] = None
         self.active_wallet_id: Optional[str] = None
 
     def configure_cdp_client(self) -> bool:
@@ -26,6 +30,8 @@ class WalletManager:
                 return False
 
             keys = key_manager_instance.get_coinbase_keys()
+            from cdp import Cdp
+
             logger.info("Configuring CDP client with stored credentials")
             self.cdp_client = Cdp.configure(keys.cdp_api_key, keys.cdp_api_secret)
 
@@ -38,7 +44,7 @@ class WalletManager:
 
     def create_wallet(
         self, wallet_id: str, network_id: Optional[str] = None, set_active: bool = True
-    ) -> Wallet:
+    ) -> "Wallet":
         """Create a new CDP wallet and store it"""
         try:
             if not wallet_id:
@@ -47,6 +53,8 @@ class WalletManager:
             if not self.configure_cdp_client():
                 raise ValueError("Failed to configure CDP client - check credentials")
 
+            from cdp import Wallet
+
             logger.info(f"Creating new wallet with network ID: {network_id}")
             logger.info(f"Current wallets: {self.wallets}")
             wallet = Wallet.create(network_id=network_id)
@@ -74,7 +82,7 @@ class WalletManager:
 
     def restore_wallet(
         self, wallet_id: str, wallet_data: dict, set_active: bool = True
-    ) -> Optional[Wallet]:
+    ) -> Optional["Wallet"]:
         """Restore a wallet from exported data"""
         try:
             if not wallet_id:
@@ -85,6 +93,8 @@ class WalletManager:
 
             logger.info(f"Restoring wallet with ID: {wallet_id}")
 
+            from cdp import Wallet, WalletData
+
             # Convert dict to WalletData instance
             wallet_data_obj = WalletData.from_dict(wallet_data)
 
@@ -107,7 +117,7 @@ class WalletManager:
             logger.error(f"Failed to restore wallet: {str(e)}")
             return None
 
-    def get_wallet(self, wallet_id: str) -> Optional[Wallet]:
+    def get_wallet(self, wallet_id: str) -> Optional["Wallet"]:
         """Get a wallet by ID"""
         return self.wallets.get(wallet_id)
 
@@ -118,28 +128,46 @@ class WalletManager:
             return None
         return wallet.default_address.address_id
 
-    def get_active_wallet(self) -> Optional[Wallet]:
-        """Get the currently active wallet"""
-        if not self.active_wallet_id:
+    def get_active_wallet(self, session_id: Optional[str] = None) -> Optional["Wallet"]:
+        """Get the currently active wallet, preferring the session's own selection"""
+        active_wallet_id = self.get_active_wallet_id(session_id)
+        if not active_wallet_id:
             return None
-        return self.wallets.get(self.active_wallet_id)
+        return self.wallets.get(active_wallet_id)
+
+    def get_active_wallet_id(self, session_id: Optional[str] = None) -> Optional[str]:
+        """
+        Get the ID of the currently active wallet.
 
-    def get_active_wallet_id(self) -> Optional[str]:
-        """Get the ID of the currently active wallet"""
+        Sessions other than the default one only see the wallet they selected
+        themselves, so one user's selection never becomes active for another.
+        """
+        if session_id and session_id != DEFAULT_SESSION_ID:
+            return session_manager_instance.get_session(session_id).active_wallet_id
         return self.active_wallet_id
 
-    def set_active_wallet(self, wallet_id: str) -> bool:
-        """Set a wallet as the active wallet"""
+    def set_active_wallet(self, wallet_id: str, session_id: Optional[str] = None) -> bool:
+        """Set a wallet as the active wallet, globally or for a single session"""
         if not self.has_wallet(wallet_id):
             logger.error(f"Cannot set active wallet - wallet {wallet_id} not found")
             return False
 
+        if session_id and session_id != DEFAULT_SESSION_ID:
+            session_manager_instance.get_session(session_id).active_wallet_id = wallet_id
+            logger.info(f"Set wallet {wallet_id} as active wallet for session {session_id}")
+            return True
+
         self.active_wallet_id = wallet_id
         logger.info(f"Set wallet {wallet_id} as active wallet")
         return True
 
-    def clear_active_wallet(self):
-        """Clear the currently active wallet"""
+    def clear_active_wallet(self, session_id: Optional[str] = None):
+        """Clear the currently active wallet, globally or for a single session"""
+        if session_id and session_id != DEFAULT_SESSION_ID:
+            session_manager_instance.get_session(session_id).active_wallet_id = None
+            logger.info(f"Cleared active wallet for session {session_id}")
+            return
+
         self.active_wallet_id = None
         logger.info("Cleared active wallet")
 
@@ -165,12 +193,14 @@ class WalletManager:
 
     def load_wallet(
         self, wallet_id: str, filepath: str, set_active: bool = True
-    ) -> Optional[Wallet]:
+    ) -> Optional["Wallet"]:
         """Load wallet from saved data"""
         try:
             with open(filepath, "r") as f:
                 wallet_data = json.load(f)
 
+            from cdp import Wallet
+
             # Import wallet from data
             wallet = Wallet.import_data(wallet_data)
 
@@ -196,19 +226,21 @@ class WalletManager:
             del self.wallet_data[wallet_id]
         if self.active_wallet_id == wallet_id:
             self.clear_active_wallet()
+        session_manager_instance.clear_active_wallet(wallet_id)
         logger.info(f"Removed wallet {wallet_id}")
 
     def has_wallet(self, wallet_id: str) -> bool:
         """Check if wallet exists"""
         return wallet_id in self.wallets
 
-    def list_wallets(self) -> list[dict]:
+    def list_wallets(self, session_id: Optional[str] = None) -> list[dict]:
         """Get list of wallets with their data"""
+        active_wallet_id = self.get_active_wallet_id(session_id)
         return [
             {
                 "wallet_id": wallet_id,
                 "network_id": wallet.network_id,
-                "is_active": wallet_id == self.active_wallet_id,
+                "is_active": wallet_id == active_wallet_id,
                 "address": wallet.default_address.address_id,
             }
             for wallet_id, wallet in self.wallets.items()
@@ -0,0 +1,241 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_cache_key(text: str) -> str:
+    """Normalize case, punctuation and whitespace so near-identical prompts share a key"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time-to-live.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept before evicting the least recently used
+        ttl (float): Seconds an entry stays valid after being set
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key (Hashable): Cache key
+            default (Any): Value returned on a miss
+
+        Returns:
+            Any: The cached value, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to store
+            ttl (Optional[float]): Override for the default time-to-live
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SingleFlightCache:
+    """
+    Thread-safe cache for upstream lookups with request coalescing and
+    stale-while-revalidate.
+
+    Concurrent misses for the same key share a single call to the loader. Once an
+    entry is older than its TTL but still within its stale window, it is served
+    immediately while one background refresh replaces it.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept before evicting the least recently used
+    """
+
+    def __init__(self, max_size: int, refresh_workers: int = 4) -> None:
+        self.max_size = max_size
+        # key -> (value, fresh_until, stale_until)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._refresh_pool = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="cache-refresh"
+        )
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "errors": 0,
+            "evictions": 0,
+        }
+
+    def get_or_load(
+        self, key: Hashable, loader: Callable[[], Any], ttl: float, stale_ttl: float = 0
+    ) -> Any:
+        """
+        Get a cached value, loading it if missing.
+
+        Args:
+            key (Hashable): Cache key
+            loader (Callable[[], Any]): Fetches the value from upstream
+            ttl (float): Seconds the value is served as fresh
+            stale_ttl (float): Further seconds a stale value is served while it is refreshed
+
+        Returns:
+            Any: The cached or freshly loaded value
+
+        Raises:
+            Exception: Whatever the loader raised, if there was no usable cached value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fresh_until, stale_until = entry
+                if now < fresh_until:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                if now < stale_until:
+                    self._entries.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                    if key not in self._in_flight:
+                        self._stats["refreshes"] += 1
+                        self._in_flight[key] = Future()
+                        self._refresh_pool.submit(self._load, key, loader, ttl, stale_ttl)
+                    return value
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                self._stats["misses"] += 1
+                self._in_flight[key] = Future()
+            else:
+                self._stats["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+        return self._load(key, loader, ttl, stale_ttl)
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: float = 0) -> None:
+        """Store a value directly, e.g. one obtained from a batched request"""
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (value, now + ttl, now + ttl + stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def is_cached(self, key: Hashable) -> bool:
+        """Check whether a fresh or stale value is cached. Does not touch the counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() < entry[2]
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], ttl: float, stale_ttl: float) -> Any:
+        with self._lock:
+            future = self._in_flight[key]
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                del self._in_flight[key]
+            logger.warning(f"Cache loader for {key} failed: {str(e)}")
+            future.set_exception(e)
+            raise
+        self.set(key, value, ttl, stale_ttl)
+        with self._lock:
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit, stale, miss, coalescing and refresh counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["in_flight"] = len(self._in_flight)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        stats["upstream_saved"] = stats["hits"] + stats["stale_hits"] + stats["coalesced"]
+        return stats
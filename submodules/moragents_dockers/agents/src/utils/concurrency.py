@@ -0,0 +1,87 @@
+import asyncio
+import functools
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Shared pool used to run blocking agent code off the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=Config.AGENT_THREAD_POOL_SIZE, thread_name_prefix="agent-worker"
+)
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking callable on the shared agent thread pool.
+
+    Args:
+        func (Callable): Blocking function to execute
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Any: The value returned by func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def call_agent_chat(agent: Any, chat_request: Any) -> Any:
+    """
+    Invoke an agent's chat method regardless of whether it is sync or async.
+
+    Agents that implement `async def chat` are awaited directly; agents that still
+    expose a blocking `chat` are offloaded to the shared thread pool so they never
+    stall the event loop.
+
+    Args:
+        agent (Any): Agent instance exposing a chat method
+        chat_request (Any): The chat request to forward
+
+    Returns:
+        Any: The agent's response
+    """
+    if inspect.iscoroutinefunction(agent.chat):
+        return await agent.chat(chat_request)
+    return await run_in_thread(agent.chat, chat_request)
+
+
+class ConcurrencyLimiter:
+    """
+    Async context manager bounding how many chats are processed at once.
+
+    Requests beyond the limit wait for a free slot; if none frees up within
+    `queue_timeout` seconds a TimeoutError is raised.
+    """
+
+    def __init__(self, limit: int, queue_timeout: Optional[float] = None) -> None:
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self._in_flight = 0
+        self._waiting = 0
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out waiting for a chat slot ({self.limit} in flight)")
+            raise TimeoutError("Timed out waiting for a free chat slot")
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._in_flight -= 1
+        self._semaphore.release()
+
+    def get_stats(self) -> dict:
+        """Return current limiter occupancy."""
+        return {"limit": self.limit, "in_flight": self._in_flight, "waiting": self._waiting}
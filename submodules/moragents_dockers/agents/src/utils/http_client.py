@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from src.config import Config
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+class HttpClient:
+    """
+    Shared HTTP client used by agent tools.
+
+    Connections are kept alive in per-host pools instead of opening a new TCP+TLS
+    connection per call. Every request gets a default timeout, idempotent requests
+    are retried with exponential backoff on connection errors and retryable status
+    codes, and the number of concurrent requests to a single host is capped.
+
+    The sync API (`get`, `post`, `request`) returns `requests.Response` and raises
+    `requests` exceptions, so existing tool code keeps its error handling. The async
+    API (`aget`, `apost`, `arequest`) returns `httpx.Response`.
+    """
+
+    def __init__(
+        self,
+        timeout: Tuple[float, float],
+        max_retries: int,
+        backoff_factor: float,
+        pool_maxsize: int,
+        max_per_host: int,
+    ) -> None:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.max_per_host = max_per_host
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self._session = requests.Session()
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+        self._lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._async_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"requests": 0, "errors": 0, "in_flight": 0, "latency_total": 0.0}
+        )
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).netloc
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_semaphores[host]
+
+    def _async_host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._async_host_semaphores:
+            self._async_host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._async_host_semaphores[host]
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            connect_timeout, read_timeout = self.timeout
+            self._async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=None, max_keepalive_connections=self.pool_maxsize
+                ),
+                transport=httpx.AsyncHTTPTransport(retries=self.max_retries),
+                follow_redirects=True,
+            )
+        return self._async_client
+
+    def _record(self, host: str, started_at: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats[host]
+            stats["requests"] += 1
+            stats["errors"] += int(failed)
+            stats["in_flight"] -= 1
+            stats["latency_total"] += time.perf_counter() - started_at
+
+    def _begin(self, host: str) -> float:
+        with self._lock:
+            self._stats[host]["in_flight"] += 1
+        return time.perf_counter()
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Passed through to `requests.Session.request`
+
+        Returns:
+            requests.Response: The response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = self._host(url)
+        with self._host_semaphore(host):
+            started_at = self._begin(host)
+            failed = True
+            try:
+                response = self._session.request(method, url, **kwargs)
+                failed = response.status_code >= 500
+                return response
+            finally:
+                self._record(host, started_at, failed)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request through the pooled session"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request through the pooled session"""
+        return self.request("POST", url, **kwargs)
+
+    async def arequest(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request through the pooled async client.
+
+        Idempotent requests answered with a retryable status are retried with
+        exponential backoff; connection errors are retried by the transport.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Passed through to `httpx.AsyncClient.request`
+
+        Returns:
+            httpx.Response: The response
+        """
+        client = self._get_async_client()
+        host = self._host(url)
+        retries = self.max_retries if method.upper() in IDEMPOTENT_METHODS else 0
+        async with self._async_host_semaphore(host):
+            for attempt in range(retries + 1):
+                started_at = self._begin(host)
+                failed = True
+                try:
+                    response = await client.request(method, url, **kwargs)
+                    failed = response.status_code >= 500
+                finally:
+                    self._record(host, started_at, failed)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+                delay = self.backoff_factor * (2**attempt)
+                logger.warning(
+                    f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+        return response
+
+    async def aget(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request through the pooled async client"""
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request through the pooled async client"""
+        return await self.arequest("POST", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-host request counts, errors, latency and connection pool occupancy"""
+        with self._lock:
+            hosts = {
+                host: {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "in_flight": stats["in_flight"],
+                    "avg_latency_ms": (
+                        1000 * stats["latency_total"] / stats["requests"]
+                        if stats["requests"]
+                        else 0.0
+                    ),
+                }
+                for host, stats in self._stats.items()
+            }
+
+        pools = {}
+        for key in list(self._adapter.poolmanager.pools.keys()):
+            pool = self._adapter.poolmanager.pools.get(key)
+            if pool is not None:
+                pools[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle_connections": pool.pool.qsize() if pool.pool else 0,
+                }
+
+        return {
+            "hosts": hosts,
+            "sync_pools": pools,
+            "async_client_open": self._async_client is not None,
+            "timeout": list(self.timeout),
+            "max_retries": self.max_retries,
+            "max_per_host": self.max_per_host,
+        }
+
+    def close(self) -> None:
+        """Close pooled sync connections"""
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """Close pooled async connections"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+# Process-wide client shared by all agent tools
+http_client = HttpClient(
+    timeout=(Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT),
+    max_retries=Config.HTTP_MAX_RETRIES,
+    backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+    pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+    max_per_host=Config.HTTP_MAX_CONCURRENT_PER_HOST,
+)
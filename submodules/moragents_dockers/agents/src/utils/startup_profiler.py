@@ -0,0 +1,174 @@
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _ImportTimingFinder(MetaPathFinder):
+    """
+    Meta path hook that times module execution.
+
+    It resolves specs through the remaining finders and wraps the loader's
+    `exec_module` on the returned loader instance, so module loaders keep their
+    real type. Loaders shared by many modules (pytest's assertion rewriter,
+    zipimporter) are wrapped once, and `unwrap` restores every loader.
+    Class-level loaders (builtin and frozen modules) are not timed.
+    """
+
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self._profiler = profiler
+        self._resolving = threading.local()
+        # Wrapped loaders by id, with the exec_module they held on the instance, if any
+        self._wrapped: Dict[int, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._resolving, "active", False):
+            return None
+        self._resolving.active = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._resolving.active = False
+
+        loader = spec.loader
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            self._wrap(loader)
+        return spec
+
+    def _wrap(self, loader: Any) -> None:
+        with self._lock:
+            if id(loader) in self._wrapped:
+                return
+            exec_module = loader.exec_module
+
+            def timed_exec_module(module):
+                with self._profiler.time_module(module.__name__):
+                    exec_module(module)
+
+            own = getattr(loader, "__dict__", {}).get("exec_module")
+            try:
+                loader.exec_module = timed_exec_module
+            except AttributeError:
+                return
+            self._wrapped[id(loader)] = (loader, own)
+
+    def unwrap(self) -> None:
+        """Give every wrapped loader back its own exec_module"""
+        with self._lock:
+            for loader, own in self._wrapped.values():
+                if own is None:
+                    del loader.exec_module
+                else:
+                    loader.exec_module = own
+            self._wrapped.clear()
+
+
+class _ModuleTimer:
+    def __init__(self, profiler: "StartupProfiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._profiler._stack().append([self._name, time.perf_counter(), 0.0])
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        stack = self._profiler._stack()
+        name, start_time, children = stack.pop()
+        cumulative = time.perf_counter() - start_time
+        if stack:
+            stack[-1][2] += cumulative
+        self._profiler.module_times[name] = {
+            "self": cumulative - children,
+            "cumulative": cumulative,
+        }
+
+
+class StartupProfiler:
+    """
+    Records how long the service takes to start.
+
+    Once started, every module imported afterwards is timed (both its own
+    execution and its cumulative time including nested imports). Named milestones
+    mark the phases of startup relative to when profiling started.
+
+    Attributes:
+        module_times (Dict[str, Dict[str, float]]): Self and cumulative seconds per module
+        milestones (Dict[str, float]): Seconds from start to each milestone
+    """
+
+    def __init__(self) -> None:
+        self.module_times: Dict[str, Dict[str, float]] = {}
+        self.milestones: Dict[str, float] = {}
+        self._started_at: Optional[float] = None
+        self._finder: Optional[_ImportTimingFinder] = None
+        self._local = threading.local()
+
+    def _stack(self) -> List[list]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def start(self) -> None:
+        """Install the import hook and start the clock"""
+        if self._finder is not None:
+            return
+        self._started_at = time.perf_counter()
+        self._finder = _ImportTimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def stop(self) -> None:
+        """Remove the import hook, keeping the timings recorded so far"""
+        if self._finder is None:
+            return
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder.unwrap()
+        self._finder = None
+
+    def time_module(self, name: str) -> _ModuleTimer:
+        """Context manager timing the execution of a module"""
+        return _ModuleTimer(self, name)
+
+    def mark(self, milestone: str) -> None:
+        """Record the time elapsed since start for a named milestone"""
+        if self._started_at is not None:
+            self.milestones[milestone] = time.perf_counter() - self._started_at
+
+    def get_report(self, top: int = 50) -> Dict[str, Any]:
+        """
+        Get the startup profile.
+
+        Args:
+            top (int): Number of slowest modules to include
+
+        Returns:
+            Dict[str, Any]: Milestones, module count and the slowest modules by cumulative time
+        """
+        slowest = sorted(
+            self.module_times.items(), key=lambda item: item[1]["cumulative"], reverse=True
+        )[:top]
+        return {
+            "milestones_ms": {name: round(1000 * t, 1) for name, t in self.milestones.items()},
+            "module_count": len(self.module_times),
+            "modules": [
+                {
+                    "module": name,
+                    "self_ms": round(1000 * times["self"], 1),
+                    "cumulative_ms": round(1000 * times["cumulative"], 1),
+                }
+                for name, times in slowest
+            ],
+        }
+
+
+# Process-wide profiler, started at the top of src/app.py
+startup_profiler = StartupProfiler()
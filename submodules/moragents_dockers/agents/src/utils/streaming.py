@@ -0,0 +1,17 @@
+import json
+from typing import Any, Dict
+
+
+def supports_streaming(agent: Any) -> bool:
+    """
+    Check whether an agent opts into token streaming.
+
+    Streaming agents implement `async def stream_chat(request)` as an async generator
+    yielding text chunks as the LLM produces them.
+    """
+    return callable(getattr(agent, "stream_chat", None))
+
+
+def format_sse_event(event: Dict[str, Any]) -> str:
+    """Serialize an event as a server-sent events frame"""
+    return f"data: {json.dumps(event)}\n\n"
@@ -0,0 +1,100 @@
+import re
+import string
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Lowercasing must keep every character at its index, which str.lower doesn't guarantee
+_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class TickerMatcher:
+    """
+    Finds coin mentions in text with an Aho-Corasick automaton over tickers and names.
+
+    The automaton is built once, so a prompt is scanned in a single pass however
+    many coins are known. Mentions must stand on word boundaries; overlapping
+    mentions resolve to the longest one, so "Bitcoin Cash" isn't also read as
+    "Bitcoin". Matching ignores case except for the keywords listed as exact case,
+    meant for tickers and names that are also common words ("NOT", "Flow").
+
+    Attributes:
+        coins (Dict[str, str]): Canonical ticker to coin name
+    """
+
+    def __init__(self, coins: Dict[str, str], exact_case: Iterable[str] = ()) -> None:
+        self.coins = coins
+        exact_case = set(exact_case)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (keyword length, ticker, keyword if its case must match)
+        self._outputs: List[List[Tuple[int, str, Optional[str]]]] = [[]]
+
+        seen = set()
+        for ticker, name in coins.items():
+            # "POL (ex-MATIC)" is written as "POL"
+            for keyword in (ticker, re.sub(r"\s*\(.*\)", "", name)):
+                key = keyword.translate(_LOWER)
+                exact = keyword if keyword in exact_case else None
+                if key and (key, exact) not in seen:
+                    seen.add((key, exact))
+                    self._add(key, ticker, exact)
+        self._build_failure_links()
+
+    def _add(self, key: str, ticker: str, exact: Optional[str]) -> None:
+        state = 0
+        for char in key:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._outputs[state].append((len(key), ticker, exact))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def find(self, text: str) -> List[str]:
+        """
+        Find the coins mentioned in a text.
+
+        Args:
+            text (str): Text to scan, e.g. a user prompt
+
+        Returns:
+            List[str]: Canonical tickers in order of first mention, without duplicates
+        """
+        lowered = text.translate(_LOWER)
+        matches = []
+        state = 0
+        for end, char in enumerate(lowered, start=1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, ticker, exact in self._outputs[state]:
+                start = end - length
+                if start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if end < len(lowered) and lowered[end].isalnum():
+                    continue
+                if exact is not None and text[start:end] != exact:
+                    continue
+                matches.append((start, -length, ticker))
+
+        tickers = {}
+        covered_until = 0
+        for start, negative_length, ticker in sorted(matches):
+            if start >= covered_until:
+                tickers.setdefault(ticker)
+                covered_until = start - negative_length
+        return list(tickers)
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from src.agents.crypto_data import tools
+from src.agents.crypto_data.agent import CryptoDataAgent
+from src.agents.crypto_data.coin_index import coin_index
+from src.agents.crypto_data.market_cache import market_cache
+
+COINS = [
+    {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "rank": 1},
+    {"id": "ethereum", "symbol": "eth", "name": "Ethereum", "rank": 2},
+    {"id": "solana", "symbol": "sol", "name": "Solana", "rank": 5},
+]
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    coin_index._loaded = True
+    coin_index.build(COINS, [], fetched_at=float("inf"))
+    market_cache.clear()
+    calls = []
+
+    def fake_get(url, params=None, **kwargs):
+        calls.append(url)
+        ids = params["ids"].split(",")
+        if url.endswith("/simple/price"):
+            return FakeResponse({coin_id: {"usd": 100} for coin_id in ids})
+        return FakeResponse([{"id": coin_id, "market_cap": 5} for coin_id in ids])
+
+    monkeypatch.setattr(tools.http_client, "get", fake_get)
+    return calls
+
+
+def test_all_tool_calls_run_with_one_request_per_metric(upstream):
+    tool_calls = [
+        {"name": "get_price", "args": {"coin_name": "BTC"}},
+        {"name": "get_market_cap", "args": {"coin_name": "eth"}},
+        {"name": "get_price", "args": {"coin_name": "ETH"}},
+        {"name": "get_price", "args": {"coin_name": "Solana"}},
+    ]
+    agent = CryptoDataAgent({}, None, None)
+    response = asyncio.run(agent.execute_tool_calls(tool_calls))
+
+    assert response["data"].splitlines() == [
+        "The price of BTC is $100",
+        "The market cap of eth is $5",
+        "The price of ETH is $100",
+        "The price of Solana is $100",
+    ]
+    assert response["coinId"] == "CRYPTO:BTCUSD"
+    assert sorted(upstream) == [
+        f"{tools.Config.COINGECKO_BASE_URL}/coins/markets",
+        f"{tools.Config.COINGECKO_BASE_URL}/simple/price",
+    ]
+
+
+def test_batched_prices_are_served_from_cache(upstream):
+    tools.get_prices(["bitcoin", "ethereum"])
+    assert tools.get_prices(["ethereum", "bitcoin"]) == {"bitcoin": 100, "ethereum": 100}
+    assert len(upstream) == 1
+
+
+def test_concurrent_identical_batches_share_one_request(upstream, monkeypatch):
+    fake_get = tools.http_client.get
+
+    def slow_get(url, params=None, **kwargs):
+        time.sleep(0.2)
+        return fake_get(url, params=params, **kwargs)
+
+    monkeypatch.setattr(tools.http_client, "get", slow_get)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: tools.get_prices(["bitcoin", "ethereum"]), range(4)))
+
+    assert results == [{"bitcoin": 100, "ethereum": 100}] * 4
+    assert len(upstream) == 1
+
+
+def test_stale_prices_are_served_while_they_refresh(upstream, monkeypatch):
+    tools.get_prices(["bitcoin"])
+    monkeypatch.setitem(tools.Config.MARKET_CACHE_TTLS, "price", 0)
+    tools.store("price", "bitcoin", 90)
+
+    assert tools.get_prices(["bitcoin"]) == {"bitcoin": 90}
+    deadline = time.time() + 2
+    while market_cache.get_stats()["in_flight"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(upstream) == 2
+
+
+def test_missing_prices_and_failed_lookups_are_reported_per_coin(upstream, monkeypatch):
+    def fake_get(url, params=None, **kwargs):
+        return FakeResponse({"bitcoin": {}})
+
+    def get_coingecko_id(name):
+        if name == "ETH":
+            raise requests.exceptions.ConnectionError("down")
+        return "bitcoin"
+
+    monkeypatch.setattr(tools.http_client, "get", fake_get)
+    monkeypatch.setattr(tools, "get_coingecko_id", get_coingecko_id)
+    tool_calls = [
+        {"name": "get_price", "args": {"coin_name": "BTC"}},
+        {"name": "get_price", "args": {"coin_name": "ETH"}},
+        {"name": "get_fdv", "args": {"coin_name": "BTC"}},
+    ]
+    monkeypatch.setattr(
+        "src.agents.crypto_data.agent.SINGLE_TOOLS",
+        {"get_fdv": (lambda name: 1 / 0, "coin_name")},
+    )
+    response = asyncio.run(CryptoDataAgent({}, None, None).execute_tool_calls(tool_calls))
+
+    assert response["data"].splitlines() == [
+        tools.Config.PRICE_FAILURE_MESSAGE,
+        tools.Config.API_ERROR_MESSAGE,
+        tools.Config.API_ERROR_MESSAGE,
+    ]
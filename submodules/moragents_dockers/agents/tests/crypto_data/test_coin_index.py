@@ -0,0 +1,127 @@
+import json
+
+import pytest
+import requests
+from src.agents.crypto_data import coin_index
+from src.agents.crypto_data.coin_index import CoinIndex
+
+COINS = [
+    {"id": "ethereum", "symbol": "eth", "name": "Ethereum", "rank": 2},
+    {"id": "ethereum-wormhole", "symbol": "eth", "name": "Ethereum (Wormhole)", "rank": None},
+    {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "rank": 1},
+    {"id": "shiba-inu", "symbol": "shib", "name": "Shiba Inu", "rank": 15},
+    {"id": "eth", "symbol": "eth2", "name": "Obscure ETH", "rank": None},
+    {"id": "doge", "symbol": "dog", "name": "Doge Token", "rank": None},
+    {"id": "dogecoin", "symbol": "doge", "name": "Dogecoin", "rank": 8},
+]
+NFTS = [{"id": "bored-ape-yacht-club", "symbol": "BAYC", "name": "Bored Ape Yacht Club"}]
+
+
+def build_index(tmp_path):
+    index = CoinIndex(str(tmp_path / "index.json"), refresh_interval=3600)
+    index._loaded = True
+    index.build(COINS, NFTS, fetched_at=float("inf"))
+    return index
+
+
+def test_resolves_names_symbols_and_aliases(tmp_path):
+    index = build_index(tmp_path)
+    assert index.resolve("Bitcoin") == "bitcoin"
+    assert index.resolve("BTC") == "bitcoin"
+    assert index.resolve("shiba inu") == "shiba-inu"
+    assert index.resolve("bored ape yacht club", type="nft") == "bored-ape-yacht-club"
+    assert index.resolve("bayc", type="nft") == "bored-ape-yacht-club"
+    assert index.resolve("not a coin at all") is None
+
+
+def test_market_cap_rank_breaks_ties(tmp_path):
+    index = build_index(tmp_path)
+    assert index.resolve("eth") == "ethereum"
+    assert index.resolve("doge") == "dogecoin"
+
+
+def test_fuzzy_match_and_symbol_lookup(tmp_path):
+    index = build_index(tmp_path)
+    assert index.resolve("etherium") == "ethereum"
+    assert index.get_symbol("ethereum") == "eth"
+
+
+def test_round_trips_through_disk(tmp_path):
+    index = build_index(tmp_path)
+    index.save(COINS, NFTS, fetched_at=float("inf"))
+
+    reloaded = CoinIndex(index.index_path, refresh_interval=3600)
+    assert reloaded.load()
+    assert reloaded.resolve("btc") == "bitcoin"
+
+
+class FakeCoinGecko:
+    def __init__(self, nft_pages, failing_nft_page=None):
+        self.nft_pages = nft_pages
+        self.failing_nft_page = failing_nft_page
+        self.paths = []
+
+    def get(self, url, params=None):
+        path = url.split("/api/v3")[1]
+        self.paths.append(path)
+        response = requests.Response()
+        response.status_code = 200
+        if path == "/coins/list":
+            body = [{key: coin[key] for key in ("id", "symbol", "name")} for coin in COINS]
+        elif path == "/coins/markets":
+            body = [{"id": "bitcoin", "market_cap_rank": 1}] if params["page"] == 1 else []
+        elif params["page"] == self.failing_nft_page:
+            response.status_code = 429
+            body = {"error": "rate limited"}
+        else:
+            body = (
+                self.nft_pages[params["page"] - 1] if params["page"] <= len(self.nft_pages) else []
+            )
+        response._content = json.dumps(body).encode()
+        return response
+
+
+def nft_page(page, size=250):
+    return [
+        {"id": f"nft-{page}-{i}", "symbol": None, "name": f"NFT {page} {i}"} for i in range(size)
+    ]
+
+
+@pytest.fixture
+def coingecko(monkeypatch):
+    monkeypatch.setattr(coin_index.Config, "COIN_INDEX_REQUEST_INTERVAL", 0)
+
+    def use(fake):
+        monkeypatch.setattr(coin_index.http_client, "get", fake.get)
+        return fake
+
+    return use
+
+
+def test_refresh_keeps_coins_and_partial_nfts_when_an_nft_page_fails(tmp_path, coingecko):
+    fake = coingecko(FakeCoinGecko([nft_page(1), nft_page(2)], failing_nft_page=2))
+    index = CoinIndex(str(tmp_path / "index.json"), refresh_interval=3600)
+
+    index.refresh()
+
+    assert fake.paths.count("/nfts/list") == 2
+    assert index.resolve("btc") == "bitcoin"
+    assert index.resolve("nft 1 0", type="nft") == "nft-1-0"
+    with open(index.index_path) as f:
+        saved = json.load(f)
+    assert len(saved["coins"]) == len(COINS)
+    assert len(saved["nfts"]) == 250
+
+
+def test_failed_nft_refresh_keeps_the_previous_collections(tmp_path, coingecko):
+    coingecko(FakeCoinGecko([nft_page(1), nft_page(2, size=10)]))
+    index = CoinIndex(str(tmp_path / "index.json"), refresh_interval=3600)
+    index.refresh()
+
+    coingecko(FakeCoinGecko([nft_page(1)], failing_nft_page=1))
+    index.refresh()
+
+    assert index.resolve("nft 2 3", type="nft") == "nft-2-3"
+    reloaded = CoinIndex(index.index_path, refresh_interval=3600)
+    assert reloaded.load()
+    assert reloaded.resolve("nft 2 3", type="nft") == "nft-2-3"
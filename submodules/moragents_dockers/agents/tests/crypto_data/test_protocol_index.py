@@ -0,0 +1,41 @@
+from src.agents.crypto_data.protocol_index import ProtocolIndex
+
+PROTOCOLS = [
+    {"slug": "aave-v3", "name": "Aave V3", "gecko_id": "aave", "tvl": 10e9},
+    {"slug": "aave-v2", "name": "Aave V2", "gecko_id": None, "tvl": 1e9},
+    {"slug": "uniswap-v3", "name": "Uniswap V3", "gecko_id": "uniswap", "tvl": 4e9},
+    {"slug": "uniswap-v2", "name": "Uniswap V2", "gecko_id": None, "tvl": 2e9},
+    {"slug": "curve-dex", "name": "Curve DEX", "gecko_id": "curve-dao-token", "tvl": 2e9},
+]
+
+
+def build_index(tmp_path):
+    index = ProtocolIndex(str(tmp_path / "protocols.joblib"), refresh_interval=3600)
+    index._loaded = True
+    index.build(PROTOCOLS, fetched_at=float("inf"))
+    return index
+
+
+def test_exact_lookups(tmp_path):
+    index = build_index(tmp_path)
+    assert index.lookup("Uniswap V2")["slug"] == "uniswap-v2"
+    assert index.lookup("curve-dex")["slug"] == "curve-dex"
+    assert index.lookup_gecko_id("aave")["slug"] == "aave-v3"
+    assert index.lookup("sushiswap") is None
+
+
+def test_search_orders_candidates_by_snapshot_tvl(tmp_path):
+    index = build_index(tmp_path)
+    assert [protocol["slug"] for protocol in index.search("uniswap")] == [
+        "uniswap-v3",
+        "uniswap-v2",
+    ]
+
+
+def test_matcher_is_persisted(tmp_path):
+    index = build_index(tmp_path)
+    index.save()
+
+    reloaded = ProtocolIndex(index.index_path, refresh_interval=3600)
+    assert reloaded.load()
+    assert reloaded.search("curve")[0]["slug"] == "curve-dex"
@@ -0,0 +1,184 @@
+import asyncio
+import types
+from datetime import datetime, timedelta
+
+import pytz
+import requests
+
+from src.agents.news_agent import agent as news_agent
+from src.agents.news_agent.agent import NewsAgent
+from src.agents.news_agent.article_store import ArticleStore
+from src.agents.news_agent.prefetch import NewsPrefetchHandler
+from src.agents.news_agent.tools import parse_batch_relevance, parse_entry, prefilter_articles
+
+
+def entry(title, summary="", hours_ago=1, link=None):
+    published = (datetime.now(pytz.UTC) - timedelta(hours=hours_ago)).isoformat()
+    link = link or f"https://news/{title}"
+    return {"title": title, "summary": summary, "link": link, "published": published}
+
+
+def test_prefilter_keeps_recent_articles_about_the_coin_best_first():
+    entries = [
+        entry("Markets wrap", "Stocks rallied, Solana was mentioned", hours_ago=2),
+        entry("Solana upgrade ships next week", hours_ago=3),
+        entry("SOL price prediction for 2025"),
+        entry("Fed holds rates"),
+        entry("Solana validators vote on fees", hours_ago=48),
+    ]
+    articles = prefilter_articles(map(parse_entry, entries), "SOL", "Solana", limit=5)
+    assert [article["title"] for article in articles] == [
+        "Solana upgrade ships next week",
+        "Markets wrap",
+    ]
+
+
+def test_short_tickers_only_match_in_upper_case():
+    entries = [entry("Layer 2 news", "op ed on rollups"), entry("OP token unlock looms")]
+    articles = prefilter_articles(map(parse_entry, entries), "OP", "Optimism", limit=5)
+    assert [article["title"] for article in articles] == ["OP token unlock looms"]
+
+
+def test_batched_answers_are_parsed_per_article():
+    text = "1: Upgrade lowers fees, bullish.\n2. NOT RELEVANT\nnoise\n7: out of range"
+    assert parse_batch_relevance(text, 3) == {0: "Upgrade lowers fees, bullish.", 1: "NOT RELEVANT"}
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, input, **kwargs):
+        prompt = input[0]["content"]
+        self.prompts.append(prompt)
+        return types.SimpleNamespace(content="1: Big upgrade.\n2: NOT RELEVANT")
+
+
+def test_syndicated_copies_share_a_story():
+    original = parse_entry(
+        {**entry("Bitcoin ETF approved - Reuters"), "source": {"title": "Reuters"}}
+    )
+    copy = parse_entry(
+        entry("Bitcoin ETF Approved!", link="https://NEWS/Bitcoin ETF approved/?utm_source=rss")
+    )
+    assert original["title"] == "Bitcoin ETF approved"
+    assert original["story_key"] == copy["story_key"]
+    assert original["key"] != copy["key"]
+
+
+def test_tracking_parameters_do_not_change_the_article_key():
+    tracked = parse_entry(entry("Bitcoin", link="https://News/a/?utm_source=rss&oc=5#top"))
+    assert tracked["key"] == parse_entry(entry("Bitcoin", link="https://news/a"))["key"]
+
+    first = parse_entry(entry("Bitcoin", link="https://news/a?id=1&fbclid=x"))
+    assert first["key"] == parse_entry(entry("Bitcoin", link="https://news/a?id=1"))["key"]
+    assert first["key"] != parse_entry(entry("Bitcoin", link="https://news/a?id=2"))["key"]
+
+
+def use_feeds(monkeypatch, tmp_path, feeds):
+    fetched = []
+
+    def fetch_rss_feed(url):
+        fetched.append(url)
+        return types.SimpleNamespace(
+            entries=next(items for name, items in feeds.items() if name in url)
+        )
+
+    monkeypatch.setattr("src.agents.news_agent.agent.fetch_rss_feed", fetch_rss_feed)
+    monkeypatch.setattr(
+        "src.agents.news_agent.agent.article_store",
+        ArticleStore(str(tmp_path / "articles.sqlite3")),
+    )
+    return fetched
+
+
+def test_coins_are_fetched_concurrently_with_one_llm_call_each(monkeypatch, tmp_path):
+    feeds = {
+        "Bitcoin": [entry("Bitcoin ETF approved"), entry("Bitcoin miners sell")],
+        "Ethereum": [entry("Ethereum fork scheduled"), entry("Ethereum gas spikes")],
+    }
+    use_feeds(monkeypatch, tmp_path, feeds)
+    llm = FakeLLM()
+    agent = NewsAgent({}, llm, None)
+
+    news = asyncio.run(agent.fetch_crypto_news(["BTC", "ETH"]))
+
+    assert len(llm.prompts) == 2
+    assert {(item["Coin"], item["Summary"]) for item in news} == {
+        ("BTC", "Big upgrade."),
+        ("ETH", "Big upgrade."),
+    }
+
+
+def test_repeated_queries_reuse_stored_feeds_and_verdicts(monkeypatch, tmp_path):
+    feeds = {
+        "Bitcoin": [
+            entry("Bitcoin ETF approved", link="https://a/1"),
+            entry("Bitcoin ETF approved", link="https://b/1", hours_ago=2),
+            entry("Bitcoin miners sell", hours_ago=3),
+        ]
+    }
+    fetched = use_feeds(monkeypatch, tmp_path, feeds)
+    llm = FakeLLM()
+    agent = NewsAgent({}, llm, None)
+
+    first = asyncio.run(agent.fetch_crypto_news(["BTC"]))
+    second = asyncio.run(agent.fetch_crypto_news(["BTC"]))
+
+    assert len(fetched) == 1
+    assert len(llm.prompts) == 1
+    assert llm.prompts[0].count("Bitcoin ETF approved") == 1
+    assert first == second
+    assert [(item["Title"], item["Link"]) for item in first] == [
+        ("Bitcoin ETF approved", "https://a/1")
+    ]
+
+
+def test_prefetch_builds_digests_of_the_most_requested_tickers(monkeypatch, tmp_path):
+    feeds = {
+        "Solana": [entry("Solana upgrade ships")],
+        "Bitcoin": [entry("Bitcoin ETF approved")],
+        "Ethereum": [entry("Ethereum fork scheduled")],
+    }
+    fetched = use_feeds(monkeypatch, tmp_path, feeds)
+    store = news_agent.article_store
+    monkeypatch.setattr("src.agents.news_agent.prefetch.article_store", store)
+    store.record_requests(["SOL", "BTC"])
+    store.record_requests(["SOL", "DOGECOIN"])
+    agent = NewsAgent({}, FakeLLM(), None)
+
+    class AgentManager:
+        async def get_agent_async(self, agent_name):
+            return agent
+
+    asyncio.run(NewsPrefetchHandler(AgentManager()).execute({"top_n": 3}))
+    assert [url.split("q=")[1].split("&")[0] for url in fetched] == [
+        "Solana",
+        "Bitcoin",
+        "Ethereum",
+    ]
+
+    fetched.clear()
+    agent.llm = None
+    news = asyncio.run(agent.fetch_crypto_news(["SOL"]))
+    assert fetched == []
+    assert [item["Title"] for item in news] == ["Solana upgrade ships"]
+
+
+def test_a_failed_refresh_keeps_the_previous_digest(monkeypatch, tmp_path):
+    feeds = {"Bitcoin": [entry("Bitcoin ETF approved")]}
+    use_feeds(monkeypatch, tmp_path, feeds)
+    agent = NewsAgent({}, FakeLLM(), None)
+    asyncio.run(agent.build_digests(["BTC"]))
+
+    def unreachable(url):
+        raise requests.exceptions.ConnectionError("feed is down")
+
+    monkeypatch.setattr("src.agents.news_agent.agent.fetch_rss_feed", unreachable)
+    monkeypatch.setattr(news_agent.Config, "FEED_TTL", -1)
+    asyncio.run(agent.build_digests(["BTC"]))
+
+    digest = news_agent.article_store.get_digest("BTC", news_agent.Config.DIGEST_TTL)
+    assert [item["Title"] for item in digest] == ["Bitcoin ETF approved"]
+    monkeypatch.setattr(news_agent.Config, "DIGEST_TTL", -1)
+    assert asyncio.run(agent.fetch_crypto_news(["BTC"])) == []
@@ -0,0 +1,37 @@
+from src.agents.rag.answer_cache import SemanticAnswerCache
+
+DOC_A, DOC_B = "a" * 64, "b" * 64
+
+
+def test_rephrased_and_similar_questions_hit_within_the_same_documents():
+    cache = SemanticAnswerCache(max_entries=10, threshold=0.95)
+    cache.put([DOC_A], "What is the vesting cliff?", [1.0, 0.0, 0.0], "Twelve months")
+
+    assert cache.get_exact([DOC_A], "what is the vesting  cliff") == "Twelve months"
+    assert cache.get_similar([DOC_A], [0.99, 0.05, 0.0]) == "Twelve months"
+    assert cache.get_similar([DOC_A], [0.0, 1.0, 0.0]) is None
+    assert cache.get_similar([DOC_A, DOC_B], [1.0, 0.0, 0.0]) is None
+    assert cache.get_exact([DOC_B], "What is the vesting cliff?") is None
+
+
+def test_least_recently_used_answers_are_evicted():
+    cache = SemanticAnswerCache(max_entries=2, threshold=0.95)
+    cache.put([DOC_A], "first", [1.0, 0.0], "1")
+    cache.put([DOC_A], "second", [0.0, 1.0], "2")
+    cache.get_exact([DOC_A], "first")
+    cache.put([DOC_A], "third", [1.0, 1.0], "3")
+
+    assert cache.get_exact([DOC_A], "second") is None
+    assert cache.get_exact([DOC_A], "first") == "1"
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_invalidating_a_document_drops_its_answers():
+    cache = SemanticAnswerCache(max_entries=10, threshold=0.95)
+    cache.put([DOC_A], "question", [1.0, 0.0], "from a")
+    cache.put([DOC_A, DOC_B], "question", [1.0, 0.0], "from a and b")
+    cache.put([DOC_B], "question", [1.0, 0.0], "from b")
+
+    assert cache.invalidate_document(DOC_A) == 2
+    assert cache.get_exact([DOC_A], "question") is None
+    assert cache.get_exact([DOC_B], "question") == "from b"
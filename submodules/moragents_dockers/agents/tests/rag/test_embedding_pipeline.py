@@ -0,0 +1,50 @@
+import asyncio
+import threading
+import time
+
+from langchain_core.documents import Document
+
+from src.agents.rag.embedding_pipeline import EmbeddingPipeline
+
+
+class RecordingEmbeddings:
+    def __init__(self):
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.batches.append(len(texts))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self._lock:
+            self.in_flight -= 1
+        return [[float(text.split()[-1])] for text in texts]
+
+
+def test_chunks_are_embedded_in_bounded_batches_and_keep_order():
+    embeddings = RecordingEmbeddings()
+    pipeline = EmbeddingPipeline(embeddings, batch_size=4, max_concurrency=2, timeout=10)
+    chunks = (Document(page_content=f"chunk {i}") for i in range(10))
+    progress = []
+
+    documents, vectors = asyncio.run(
+        pipeline.embed_documents(chunks, progress=lambda done, read: progress.append(done))
+    )
+
+    assert embeddings.batches == [4, 4, 2]
+    assert embeddings.max_in_flight <= 2
+    assert [doc.page_content for doc in documents] == [f"chunk {i}" for i in range(10)]
+    assert vectors == [[float(i)] for i in range(10)]
+    assert progress[-1] == 10
+
+
+def test_empty_source_embeds_nothing():
+    embeddings = RecordingEmbeddings()
+    pipeline = EmbeddingPipeline(embeddings, batch_size=4, max_concurrency=2, timeout=10)
+
+    assert asyncio.run(pipeline.embed_documents(iter([]))) == ([], [])
+    assert embeddings.batches == []
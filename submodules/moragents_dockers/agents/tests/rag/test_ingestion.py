@@ -0,0 +1,52 @@
+import asyncio
+
+from src.agents.rag.ingestion import IngestionJobManager, IngestionStatus
+
+
+def test_jobs_run_in_background_and_report_status():
+    async def scenario():
+        manager = IngestionJobManager(max_workers=2, max_jobs=10)
+        release = asyncio.Event()
+
+        async def process(job):
+            job.total_pages, job.pages_read = 4, 2
+            await release.wait()
+            if job.filename == "bad.pdf":
+                raise ValueError("unreadable")
+
+        good = manager.submit("s1", "good.pdf", "/tmp/good.pdf", process)
+        bad = manager.submit("s2", "bad.pdf", "/tmp/bad.pdf", process)
+        assert good.status == IngestionStatus.QUEUED
+
+        await asyncio.sleep(0.01)
+        assert good.status == IngestionStatus.RUNNING
+        assert good.to_dict()["progress"] == 0.5
+
+        release.set()
+        await asyncio.sleep(0.01)
+        await manager.shutdown()
+        return manager, good, bad
+
+    manager, good, bad = asyncio.run(scenario())
+    assert good.status == IngestionStatus.COMPLETED and good.progress == 1.0
+    assert bad.status == IngestionStatus.FAILED and bad.error == "unreadable"
+    assert [job.id for job in manager.list_jobs("s1")] == [good.id]
+
+
+def test_finished_jobs_are_pruned_oldest_first():
+    async def scenario():
+        manager = IngestionJobManager(max_workers=1, max_jobs=2)
+
+        async def process(job):
+            pass
+
+        jobs = []
+        for i in range(4):
+            jobs.append(manager.submit(None, f"{i}.pdf", f"/tmp/{i}.pdf", process))
+            await asyncio.sleep(0.01)
+        await manager.shutdown()
+        return manager, jobs
+
+    manager, jobs = asyncio.run(scenario())
+    assert manager.get_job(jobs[0].id) is None
+    assert manager.get_job(jobs[-1].id) is not None
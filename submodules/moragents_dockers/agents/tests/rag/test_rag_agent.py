@@ -0,0 +1,93 @@
+import asyncio
+import os
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.agents.rag.agent import RagAgent
+from src.agents.rag.ingestion import IngestionJob
+from src.stores import session_manager_instance
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.agents.rag.agent.Config.STORE_DIR", str(tmp_path / "store"))
+    agent = RagAgent({}, None, DeterministicFakeEmbedding(size=16))
+    release = asyncio.Event()
+
+    def iter_chunks(job):
+        with open(job.file_path) as f:
+            text = f.read()
+        if text == "broken":
+            raise ValueError("unreadable")
+        yield Document(page_content=text)
+
+    embed_into = agent.embedding_pipeline.embed_into
+
+    async def gated_embed_into(chunks, sink, progress=None):
+        await release.wait()
+        return await embed_into(chunks, sink, progress)
+
+    agent._iter_chunks = iter_chunks
+    agent.embedding_pipeline.embed_into = gated_embed_into
+    agent.release = release
+    return agent
+
+
+def upload(tmp_path, name, content, session_id):
+    path = tmp_path / name
+    path.write_text(content)
+    return IngestionJob(id=name, session_id=session_id, filename=name, file_path=str(path))
+
+
+def test_concurrent_upload_of_the_same_file_waits_for_its_embedding(agent, tmp_path):
+    async def scenario():
+        first = asyncio.ensure_future(agent._ingest(upload(tmp_path, "a.pdf", "x", "rag-1")))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(agent._ingest(upload(tmp_path, "b.pdf", "x", "rag-2")))
+        await asyncio.sleep(0.01)
+        assert not second.done()
+        assert session_manager_instance.get_session("rag-2").uploaded_documents == []
+
+        agent.release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+    doc_hash = session_manager_instance.get_session("rag-2").uploaded_documents[0]
+    assert agent.vector_store.has_document(doc_hash)
+    assert agent.vector_store.get_stats()["chunks"] == 1
+
+
+def test_concurrent_upload_fails_along_with_the_embedding_it_waited_for(agent, tmp_path):
+    async def scenario():
+        first = asyncio.ensure_future(agent._ingest(upload(tmp_path, "a.pdf", "broken", "rag-3")))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(agent._ingest(upload(tmp_path, "b.pdf", "broken", "rag-4")))
+        await asyncio.sleep(0.01)
+
+        agent.release.set()
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert session_manager_instance.get_session("rag-4").uploaded_documents == []
+    assert agent._embedding == {}
+
+
+def test_uploads_are_deleted_once_ingested_or_failed(agent, tmp_path):
+    agent.release.set()
+    ingested = upload(tmp_path, "a.pdf", "x", "rag-5")
+    failed = upload(tmp_path, "b.pdf", "broken", "rag-5")
+
+    asyncio.run(agent._run_ingestion(ingested))
+    with pytest.raises(ValueError):
+        asyncio.run(agent._run_ingestion(failed))
+
+    assert not os.path.exists(ingested.file_path)
+    assert not os.path.exists(failed.file_path)
+    messages = session_manager_instance.get_session("rag-5").chat_manager.get_messages()
+    assert [m["content"] for m in messages[-2:]] == [
+        "a.pdf is ready, ask me about it",
+        "Sorry, I couldn't process b.pdf",
+    ]
@@ -0,0 +1,45 @@
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.agents.rag.retrieval import HybridRetriever, pack_context, reciprocal_rank_fusion
+from src.agents.rag.vector_store import PersistentVectorStore
+
+
+def doc(chunk_id, text="text"):
+    return Document(id=chunk_id, page_content=text)
+
+
+def test_fusion_rewards_chunks_ranked_by_both_searches():
+    dense = [doc("a"), doc("b"), doc("c")]
+    keyword = [doc("c"), doc("d")]
+    fused = reciprocal_rank_fusion([dense, keyword], k=60)
+    assert [d.id for d in fused] == ["c", "a", "b", "d"]
+
+
+def test_packing_skips_chunks_over_the_remaining_budget():
+    chunks = [doc("a", "x" * 40), doc("b", "x" * 400), doc("c", "x" * 20)]
+    assert [d.id for d in pack_context(chunks, token_budget=20)] == ["a", "c"]
+
+
+def test_exact_terms_are_found_and_scoped_to_the_session(tmp_path):
+    store = PersistentVectorStore(str(tmp_path), DeterministicFakeEmbedding(size=16), 1 << 26)
+    store.add_documents(
+        "a" * 64,
+        "a.pdf",
+        [
+            Document(page_content="The vesting cliff is twelve months."),
+            Document(page_content="Treasury address 0xDEADBEEF holds the reserve."),
+            Document(page_content="Governance votes happen weekly."),
+        ],
+    )
+    store.add_documents("b" * 64, "b.pdf", [Document(page_content="0xDEADBEEF is unrelated.")])
+
+    keyword = store.keyword_search("which address is 0xdeadbeef?", ["a" * 64], k=5)
+    assert keyword[0].page_content == "Treasury address 0xDEADBEEF holds the reserve."
+    assert all(d.metadata["doc_hash"] == "a" * 64 for d in keyword)
+
+    retriever = HybridRetriever(store, token_budget=1000)
+    context = retriever.retrieve("0xDEADBEEF", ["a" * 64])
+    assert context[0].page_content.startswith("Treasury address")
+    assert all(d.metadata["doc_hash"] == "a" * 64 for d in context)
+    assert retriever.retrieve("0xDEADBEEF", []) == []
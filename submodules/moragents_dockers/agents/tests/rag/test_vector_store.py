@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.agents.rag.vector_store import PersistentVectorStore, hash_file
+
+MEMORY_LIMIT = 64 * 1024 * 1024
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    calls: int = 0
+
+    def embed_documents(self, texts):
+        self.calls += len(texts)
+        return super().embed_documents(texts)
+
+
+def make_docs(*texts):
+    return [Document(page_content=text) for text in texts]
+
+
+def test_reupload_reuses_stored_embeddings(tmp_path):
+    embeddings = CountingEmbeddings(size=16)
+    store = PersistentVectorStore(str(tmp_path), embeddings, MEMORY_LIMIT)
+
+    assert store.add_documents("a" * 64, "a.pdf", make_docs("alpha one", "alpha two"))
+    assert not store.add_documents("a" * 64, "a.pdf", make_docs("alpha one", "alpha two"))
+    assert embeddings.calls == 2
+    assert store.get_stats()["documents"] == 1
+    assert store.get_stats()["chunks"] == 2
+
+
+def test_store_survives_restart_and_filters_by_document(tmp_path):
+    embeddings = DeterministicFakeEmbedding(size=16)
+    store = PersistentVectorStore(str(tmp_path), embeddings, MEMORY_LIMIT)
+    store.add_documents("a" * 64, "a.pdf", make_docs("alpha one", "alpha two"))
+    store.add_documents("b" * 64, "b.pdf", make_docs("beta one"))
+
+    reloaded = PersistentVectorStore(str(tmp_path), embeddings, MEMORY_LIMIT)
+    assert reloaded.has_document("b" * 64)
+
+    found = reloaded.similarity_search("alpha one", ["b" * 64], k=5)
+    assert [doc.page_content for doc in found] == ["beta one"]
+
+    found = reloaded.similarity_search("alpha one", ["a" * 64, "b" * 64], k=5)
+    assert found[0].page_content == "alpha one"
+    assert len(found) == 3
+
+
+def test_aborted_document_leaves_nothing_behind(tmp_path):
+    embeddings = DeterministicFakeEmbedding(size=16)
+    store = PersistentVectorStore(str(tmp_path), embeddings, MEMORY_LIMIT)
+
+    assert store.begin_document("c" * 64, "c.pdf")
+    store.add_batch("c" * 64, 0, make_docs("gamma"), embeddings.embed_documents(["gamma"]))
+    store.abort_document("c" * 64)
+
+    assert not store.has_document("c" * 64)
+    assert store.docstore.document_hashes() == set()
+    assert not any(name.endswith(".vectors") for name in os.listdir(tmp_path))
+
+
+def test_index_over_memory_limit_is_compressed(tmp_path):
+    dimension, total = 8, 10000
+    store = PersistentVectorStore(str(tmp_path), DeterministicFakeEmbedding(size=dimension), 1024)
+    vectors = np.random.default_rng(0).random((total, dimension), dtype=np.float32)
+
+    store.begin_document("d" * 64, "d.pdf")
+    for start in range(0, total, 5000):
+        batch = make_docs(*(f"chunk {i}" for i in range(start, start + 5000)))
+        store.add_batch("d" * 64, start, batch, vectors[start : start + 5000])
+    store.commit_document("d" * 64)
+
+    assert store.get_stats()["index_type"] == "IndexIVFPQ"
+    nearest = store._store.similarity_search_by_vector(vectors[123].tolist(), k=1)
+    assert nearest[0].page_content == "chunk 123"
+
+    reloaded = PersistentVectorStore(str(tmp_path), store.embeddings, 1024)
+    assert reloaded.get_stats()["index_type"] == "IndexIVFPQ"
+
+    # A small document is found however many nearer chunks other documents have
+    reloaded.add_documents("e" * 64, "e.pdf", make_docs("epsilon"), [[5.0] * dimension])
+    found = reloaded.similarity_search("", ["e" * 64], k=5, query_vector=vectors[123].tolist())
+    assert [doc.page_content for doc in found] == ["epsilon"]
+    found = reloaded.similarity_search("", ["d" * 64], k=1, query_vector=vectors[123].tolist())
+    assert found[0].page_content == "chunk 123"
+
+
+def test_hash_file_depends_on_content_only(tmp_path):
+    first, second, empty = tmp_path / "first.pdf", tmp_path / "second.pdf", tmp_path / "empty"
+    first.write_bytes(b"same content")
+    second.write_bytes(b"same content")
+    empty.write_bytes(b"")
+    assert hash_file(str(first)) == hash_file(str(second))
+    assert hash_file(str(empty)) == (
+        "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+    )
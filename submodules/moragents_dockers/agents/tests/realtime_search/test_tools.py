@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from src.agents.realtime_search import tools
+from src.agents.realtime_search.config import Config
+
+SEARCH_PAGE = """
+<div class="g"><a href="/url?q=https://a.example/post&sa=U">A</a><span>First snippet</span></div>
+<div class="g"><a href="https://b.example/">B</a><span>Second snippet</span></div>
+<div class="g"><a href="/search?q=more">More</a><span>Third snippet</span></div>
+"""
+
+
+def test_results_are_parsed_with_unwrapped_links():
+    results = tools.parse_search_results(SEARCH_PAGE, limit=5)
+    assert [result["link"] for result in results] == [
+        "https://a.example/post",
+        "https://b.example/",
+        None,
+    ]
+    assert results[0]["snippet"] == "AFirst snippet"
+
+
+def test_slow_pages_are_skipped_and_others_fetched_concurrently(monkeypatch):
+    def fetch_page_excerpt(url):
+        time.sleep(2 if "slow" in url else 0.1)
+        return f"text of {url}"
+
+    monkeypatch.setattr(tools, "fetch_page_excerpt", fetch_page_excerpt)
+    monkeypatch.setattr(Config, "PAGE_FETCH_TIMEOUT", 0.5)
+    results = [
+        {"snippet": "a", "link": "https://a/1"},
+        {"snippet": "slow", "link": "https://slow/2"},
+        {"snippet": "c", "link": "https://c/3"},
+    ]
+
+    started_at = time.perf_counter()
+    tools.enrich_with_pages(results)
+
+    assert time.perf_counter() - started_at < 1
+    assert [result.get("excerpt") for result in results] == [
+        "text of https://a/1",
+        None,
+        "text of https://c/3",
+    ]
+    assert "Page excerpt:\ntext of https://a/1" in tools.format_results(results)
+
+
+def test_equivalent_queries_share_one_search(monkeypatch):
+    searches = []
+    monkeypatch.setattr(tools, "search_web", lambda term: searches.append(term) or "results")
+
+    assert tools.cached_search("Who won the 2022 World Cup?") == "results"
+    assert tools.cached_search("who won the 2022 world cup") == "results"
+    assert searches == ["Who won the 2022 World Cup?"]
+
+
+def test_searches_without_results_are_not_cached(monkeypatch):
+    searches = []
+    monkeypatch.setattr(tools, "search_web", lambda term: searches.append(term) or "")
+
+    assert tools.cached_search("blocked by a consent page") == ""
+    assert tools.cached_search("blocked by a consent page") == ""
+    assert len(searches) == 2
+
+
+class StreamedResponse:
+    def __init__(self, content_type, body):
+        self.headers = {"Content-Type": content_type}
+        self.body = body
+        self.bytes_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            self.bytes_read += chunk_size
+            yield self.body[start : start + chunk_size]
+
+
+@pytest.fixture
+def page(monkeypatch):
+    def use_page(content_type, body):
+        response = StreamedResponse(content_type, body)
+        monkeypatch.setattr(tools.http_client, "get", lambda url, **kwargs: response)
+        return response
+
+    return use_page
+
+
+def test_page_bodies_are_read_up_to_the_size_cap(page, monkeypatch):
+    monkeypatch.setattr(Config, "PAGE_MAX_BYTES", 64 * 1024)
+    monkeypatch.setattr(Config, "PAGE_READ_SIZE", 1024)
+    response = page("text/html", b"<p>Kept text</p>" + b"<p>filler</p>" * 100000)
+
+    assert tools.fetch_page_excerpt("https://a/1").startswith("Kept text filler")
+    assert response.bytes_read == 64 * 1024
+
+
+def test_pages_that_are_not_html_are_never_read(page):
+    response = page("application/pdf", b"%PDF-1.7" * 1000)
+
+    assert tools.fetch_page_excerpt("https://a/report.pdf") is None
+    assert response.bytes_read == 0
@@ -0,0 +1,72 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src.stores import session_manager_instance
+
+
+def sse_events(body):
+    frames = body.split("\n\n")
+    assert frames[-1] == ""
+    assert all(frame.startswith("data: ") for frame in frames[:-1])
+    return [json.loads(frame[len("data: ") :]) for frame in frames[:-1]]
+
+
+def post_stream(monkeypatch, events, session_id):
+    async def get_active_agent_for_chat(prompt, session):
+        return "default"
+
+    async def delegate_chat_stream(agent_name, chat_request, session):
+        for event in events:
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+    monkeypatch.setattr(app_module, "get_active_agent_for_chat", get_active_agent_for_chat)
+    monkeypatch.setattr(app_module.delegator, "delegate_chat_stream", delegate_chat_stream)
+    response = TestClient(app_module.app).post(
+        "/chat/stream",
+        json={
+            "prompt": {"role": "user", "content": "hi"},
+            "chain_id": "1",
+            "wallet_address": "0x0",
+            "session_id": session_id,
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return sse_events(response.text)
+
+
+def test_tokens_and_the_final_response_are_sent_as_sse_frames(monkeypatch):
+    done = {
+        "type": "done",
+        "agentName": "default",
+        "response": {"role": "assistant", "content": "Hello there"},
+    }
+    events = [{"type": "token", "content": "Hello"}, {"type": "token", "content": " there"}, done]
+
+    assert post_stream(monkeypatch, events, "stream-1") == events
+    messages = session_manager_instance.get_session("stream-1").chat_manager.get_messages()
+    assert messages[-1]["content"] == "Hello there"
+    assert messages[-1]["agentName"] == "default"
+
+
+def test_no_responding_agent_is_reported_as_an_error(monkeypatch):
+    events = [{"type": "done", "agentName": None, "response": {"error": "failed"}}]
+
+    assert post_stream(monkeypatch, events, "stream-2") == [
+        {"type": "error", "message": "All available agents failed"}
+    ]
+
+
+def test_an_error_mid_stream_ends_the_stream_with_an_error_event(monkeypatch):
+    events = [{"type": "token", "content": "Hel"}, RuntimeError("LLM went away")]
+
+    assert post_stream(monkeypatch, events, "stream-3") == [
+        {"type": "token", "content": "Hel"},
+        {"type": "error", "message": "LLM went away"},
+    ]
+    messages = session_manager_instance.get_session("stream-3").chat_manager.get_messages()
+    assert messages[-1] == {"role": "user", "content": "hi"}
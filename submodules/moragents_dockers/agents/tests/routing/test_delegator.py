@@ -0,0 +1,217 @@
+import asyncio
+import time
+
+import pytest
+
+from src.config import Config
+from src.delegator import Delegator
+from src.models.messages import ChatMessage, ChatRequest
+from src.stores import agent_manager_instance
+from src.stores.session_manager import Session
+
+
+class FakeAgent:
+    def __init__(self, name, delay=0.0, fails=False):
+        self.name = name
+        self.delay = delay
+        self.fails = fails
+        self.calls = 0
+        self.cancelled = False
+
+    async def chat(self, request):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fails:
+            raise RuntimeError(f"{self.name} is down")
+        return {"role": "assistant", "content": f"answer from {self.name}"}
+
+
+class StreamingAgent(FakeAgent):
+    def __init__(self, name, chunks, fails_after=None):
+        super().__init__(name)
+        self.chunks = chunks
+        self.fails_after = fails_after
+
+    async def stream_chat(self, request):
+        for i, chunk in enumerate(self.chunks):
+            if i == self.fails_after:
+                raise RuntimeError(f"{self.name} lost the LLM")
+            yield chunk
+
+
+@pytest.fixture
+def agents(monkeypatch):
+    agents = {}
+
+    async def get_agent_async(agent_name):
+        return agents.get(agent_name)
+
+    monkeypatch.setattr(agent_manager_instance, "get_agent_async", get_agent_async)
+    monkeypatch.setattr(agent_manager_instance, "get_selected_agents", lambda: list(agents))
+    return agents
+
+
+def make_delegator(ranked):
+    delegator = Delegator.__new__(Delegator)
+
+    async def get_ranked_agents(prompt, session, top_k):
+        return [name for name in ranked if name not in session.attempted_agents][:top_k]
+
+    delegator.get_ranked_agents = get_ranked_agents
+    return delegator
+
+
+def chat_request():
+    return ChatRequest(
+        prompt=ChatMessage(role="user", content="what is the price of eth"),
+        chain_id="1",
+        wallet_address="0x0",
+    )
+
+
+def delegate(delegator, session):
+    return asyncio.run(delegator.delegate_chat_speculative(chat_request(), session))
+
+
+def test_best_ranked_success_wins_over_faster_agents(agents):
+    agents["crypto data"] = FakeAgent("crypto data", delay=0.05)
+    agents["realtime search"] = FakeAgent("realtime search")
+
+    agent_name, response = delegate(
+        make_delegator(["crypto data", "realtime search"]), Session("s")
+    )
+
+    assert agent_name == "crypto data"
+    assert response["content"] == "answer from crypto data"
+
+
+def test_a_hung_best_ranked_agent_only_holds_the_response_for_the_grace_period(agents, monkeypatch):
+    monkeypatch.setattr(Config, "SPECULATIVE_GRACE_PERIOD", 0.05)
+    agents["crypto data"] = FakeAgent("crypto data", delay=10)
+    agents["realtime search"] = FakeAgent("realtime search")
+
+    async def scenario():
+        delegator = make_delegator(["crypto data", "realtime search"])
+        result = await delegator.delegate_chat_speculative(chat_request(), Session("s"))
+        await asyncio.sleep(0)
+        return result
+
+    started = time.monotonic()
+    agent_name, _ = asyncio.run(scenario())
+    assert agent_name == "realtime search"
+    assert time.monotonic() - started < 1
+    assert agents["crypto data"].cancelled
+
+
+def test_failed_agents_fall_back_to_the_next_ranked_one(agents):
+    agents["crypto data"] = FakeAgent("crypto data", fails=True)
+    agents["realtime search"] = FakeAgent("realtime search", delay=0.01)
+    agents["default"] = FakeAgent("default")
+    session = Session("s")
+
+    agent_name, _ = delegate(make_delegator(["crypto data", "realtime search"]), session)
+    assert agent_name == "realtime search"
+
+    agents["realtime search"].fails = True
+    session.attempted_agents.clear()
+    agent_name, _ = delegate(make_delegator(["crypto data", "realtime search"]), session)
+    assert agent_name == "default"
+    assert session.attempted_agents == {"crypto data", "realtime search", "default"}
+
+
+def test_agents_still_running_are_cancelled_once_a_winner_is_found(agents):
+    agents["crypto data"] = FakeAgent("crypto data")
+    agents["realtime search"] = FakeAgent("realtime search", delay=10)
+
+    async def scenario():
+        delegator = make_delegator(["crypto data", "realtime search"])
+        result = await delegator.delegate_chat_speculative(chat_request(), Session("s"))
+        await asyncio.sleep(0)
+        return result
+
+    agent_name, _ = asyncio.run(scenario())
+    assert agent_name == "crypto data"
+    assert agents["realtime search"].cancelled
+
+
+def test_side_effect_agents_never_run_speculatively(agents):
+    for name in ("crypto data", "dca", "imagen"):
+        agents[name] = FakeAgent(name)
+
+    agent_name, _ = delegate(make_delegator(["crypto data", "dca", "imagen"]), Session("s"))
+    assert agent_name == "crypto data"
+    assert agents["dca"].calls == 0
+    assert agents["imagen"].calls == 1
+
+    agent_name, _ = delegate(make_delegator(["dca", "crypto data", "imagen"]), Session("s"))
+    assert agent_name == "dca"
+    assert agents["crypto data"].calls == 1
+    assert agents["imagen"].calls == 1
+
+
+def stream(delegator, agent_name, session):
+    async def collect():
+        return [
+            event
+            async for event in delegator.delegate_chat_stream(agent_name, chat_request(), session)
+        ]
+
+    return asyncio.run(collect())
+
+
+def test_streaming_agents_yield_tokens_then_the_full_response(agents):
+    agents["default"] = StreamingAgent("default", ["Hello", " there "])
+
+    events = stream(make_delegator([]), "default", Session("s"))
+
+    assert events == [
+        {"type": "token", "content": "Hello"},
+        {"type": "token", "content": " there "},
+        {
+            "type": "done",
+            "agentName": "default",
+            "response": {"role": "assistant", "content": "Hello there"},
+        },
+    ]
+
+
+def test_agents_without_streaming_answer_in_the_done_event(agents):
+    agents["crypto data"] = FakeAgent("crypto data")
+
+    events = stream(make_delegator([]), "crypto data", Session("s"))
+
+    assert events == [
+        {
+            "type": "done",
+            "agentName": "crypto data",
+            "response": {"role": "assistant", "content": "answer from crypto data"},
+        }
+    ]
+
+
+def test_a_stream_failing_before_any_output_falls_back(agents, monkeypatch):
+    monkeypatch.setattr(Config, "SPECULATIVE_FALLBACK_ENABLED", True)
+    agents["default"] = StreamingAgent("default", ["Hello"], fails_after=0)
+    agents["crypto data"] = FakeAgent("crypto data")
+    session = Session("s")
+
+    events = stream(make_delegator(["crypto data"]), "default", session)
+
+    assert [event["type"] for event in events] == ["done"]
+    assert events[0]["agentName"] == "crypto data"
+    assert "default" in session.attempted_agents
+
+
+def test_a_stream_failing_mid_response_ends_with_an_error(agents):
+    agents["default"] = StreamingAgent("default", ["Hello", " there"], fails_after=1)
+
+    events = stream(make_delegator([]), "default", Session("s"))
+
+    assert events == [
+        {"type": "token", "content": "Hello"},
+        {"type": "error", "message": "default failed mid-response"},
+    ]
@@ -0,0 +1,54 @@
+import asyncio
+
+from src.semantic_router import SemanticRouter
+
+AGENTS = [
+    {"name": "crypto data", "description": "price", "examples": ["market cap"]},
+    {"name": "imagen", "description": "image", "examples": ["picture"]},
+    {"name": "default", "description": "chat", "examples": []},
+]
+
+VOCABULARY = ["price", "market cap", "image", "picture", "chat"]
+
+
+class KeywordEmbeddings:
+    """Embeds text as a bag of known keywords so similarities are predictable"""
+
+    def _embed(self, text):
+        return [1.0 if word in text else 0.0 for word in VOCABULARY] + [0.1]
+
+    async def aembed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text):
+        return self._embed(text)
+
+
+def make_router(margin_threshold=0.05):
+    return SemanticRouter(KeywordEmbeddings(), AGENTS, margin_threshold, min_similarity=0.3)
+
+
+def test_routes_clear_match_without_llm():
+    router = make_router()
+    selected = asyncio.run(router.route("what is the price of eth", ["crypto data", "imagen"]))
+
+    assert selected == "crypto data"
+    assert router.get_metrics()["fast_routed"] == 1
+
+
+def test_only_candidates_are_considered():
+    router = make_router()
+    ranked = asyncio.run(router.rank("draw a picture", ["default", "crypto data"]))
+
+    assert {name for name, _ in ranked} == {"default", "crypto data"}
+
+
+def test_ambiguous_prompt_falls_back():
+    router = make_router(margin_threshold=0.5)
+    selected = asyncio.run(router.route("price of this picture", ["crypto data", "imagen"]))
+    router.record_llm_selection(0.2)
+
+    assert selected is None
+    metrics = router.get_metrics()
+    assert metrics["fallback_rate"] == 1.0
+    assert metrics["avg_llm_latency_ms"] > 0
@@ -0,0 +1,25 @@
+# submodules/benchmarks/startup_benchmarks/benchmarks.py
+
+import logging
+
+from submodules.moragents_dockers.agents.tests.startup_benchmarks.config import Config
+from submodules.moragents_dockers.agents.tests.startup_benchmarks.helpers import (
+    format_slowest_modules,
+    measure_startup,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def test_startup_within_budget():
+    report = measure_startup(Config.AGENTS_DIR, Config.REPORT_TOP_MODULES)
+    total = report["total_seconds"]
+
+    logger.info(f"Startup took {total:.2f}s (budget {Config.STARTUP_BUDGET_SECONDS:.2f}s)")
+    logger.info(f"Milestones: {report['milestones_ms']}")
+
+    assert total <= Config.STARTUP_BUDGET_SECONDS, (
+        f"Startup took {total:.2f}s, over the {Config.STARTUP_BUDGET_SECONDS:.2f}s budget. "
+        f"Slowest imports:\n{format_slowest_modules(report)}"
+    )
@@ -0,0 +1,11 @@
+import os
+
+
+class Config:
+    # Maximum seconds importing src.app (models, stores, delegator and routers) may take
+    STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "10"))
+
+    # Number of slowest modules reported when the budget is exceeded
+    REPORT_TOP_MODULES = 15
+
+    AGENTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
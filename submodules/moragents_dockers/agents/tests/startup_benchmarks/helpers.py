@@ -0,0 +1,36 @@
+# submodules/benchmarks/startup_benchmarks/helpers.py
+
+import json
+import os
+import subprocess
+import sys
+
+PROFILE_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import src.app
+from src.utils.startup_profiler import startup_profiler
+report = startup_profiler.get_report({top})
+report["total_seconds"] = time.perf_counter() - start
+print(json.dumps(report))
+"""
+
+
+def measure_startup(agents_dir: str, top: int) -> dict:
+    """Import the app in a fresh interpreter and return its startup profile"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROFILE_SCRIPT.format(top=top)],
+        cwd=agents_dir,
+        env={**os.environ, "PYTHONPATH": agents_dir},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing src.app failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def format_slowest_modules(report: dict) -> str:
+    return "\n".join(
+        f"  {module['cumulative_ms']:>9.1f} ms  {module['module']}" for module in report["modules"]
+    )
@@ -0,0 +1,96 @@
+import asyncio
+import sys
+import time
+import types
+
+import pytest
+
+from src.stores.agent_manager import AgentManager
+
+
+class FakeAgent:
+    instances = 0
+
+    def __init__(self, config, llm, embeddings):
+        FakeAgent.instances += 1
+        # Slow enough for concurrent first requests to overlap
+        time.sleep(0.05)
+        self.config = config
+
+
+class BrokenAgent:
+    failures = 1
+
+    def __init__(self, config, llm, embeddings):
+        if BrokenAgent.failures:
+            BrokenAgent.failures -= 1
+            raise RuntimeError("model not pulled")
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    module = types.ModuleType("fake_agents")
+    module.FakeAgent, module.BrokenAgent = FakeAgent, BrokenAgent
+    monkeypatch.setitem(sys.modules, "fake_agents", module)
+    monkeypatch.setattr("src.stores.agent_manager.Config.LAZY_AGENT_LOADING", True)
+    FakeAgent.instances, BrokenAgent.failures = 0, 1
+
+    manager = AgentManager(
+        {
+            "agents": [
+                {"path": "fake_agents", "class": "FakeAgent", "name": "fast"},
+                {"path": "fake_agents", "class": "FakeAgent", "name": "slow"},
+                {"path": "fake_agents", "class": "BrokenAgent", "name": "broken"},
+            ]
+        }
+    )
+    manager.configure(llm=object(), embeddings=object())
+    return manager
+
+
+def test_agents_are_loaded_on_first_use(manager):
+    assert manager.agents == {}
+
+    agent = manager.get_agent("fast")
+
+    assert agent.config["name"] == "fast"
+    assert manager.get_agent("fast") is agent
+    assert list(manager.agents) == ["fast"]
+    assert manager.get_agent("unknown") is None
+
+
+def test_concurrent_first_requests_load_an_agent_once(manager):
+    async def scenario():
+        return await asyncio.gather(*(manager.get_agent_async("slow") for _ in range(5)))
+
+    agents = asyncio.run(scenario())
+
+    assert FakeAgent.instances == 1
+    assert all(agent is agents[0] for agent in agents)
+
+
+def test_failed_agents_are_retried_after_the_retry_interval(manager, monkeypatch):
+    monkeypatch.setattr("src.stores.agent_manager.Config.AGENT_LOAD_RETRY_INTERVAL", 60)
+    assert manager.get_agent("broken") is None
+    assert manager.load_errors == {"broken": "model not pulled"}
+
+    # Not retried while the failure is recent
+    BrokenAgent.failures = 1
+    assert manager.get_agent("broken") is None
+    assert BrokenAgent.failures == 1
+
+    monkeypatch.setattr("src.stores.agent_manager.Config.AGENT_LOAD_RETRY_INTERVAL", 0)
+    BrokenAgent.failures = 0
+    assert manager.get_agent("broken") is not None
+    assert manager.load_errors == {}
+
+
+def test_warm_up_loads_the_selected_agents(manager):
+    manager.set_selected_agents(["fast", "broken"])
+
+    manager.warm_up()
+
+    report = {entry["name"]: entry for entry in manager.get_load_report()}
+    assert report["fast"]["loaded"] and report["fast"]["selected"]
+    assert not report["slow"]["loaded"] and not report["slow"]["selected"]
+    assert report["broken"]["error"] == "model not pulled"
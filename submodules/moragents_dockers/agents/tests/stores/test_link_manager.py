@@ -0,0 +1,28 @@
+from src.stores import link_manager
+from src.stores.link_manager import LinkManager
+
+
+def test_urls_are_shortened_once_and_resolve(tmp_path):
+    manager = LinkManager(str(tmp_path / "links.sqlite3"), "http://agents:8080/")
+    ids = manager.shorten_many(["https://a/1", "https://b/2", "https://a/1"])
+
+    assert ids[0] == ids[2] != ids[1]
+    assert manager.shorten("https://b/2") == ids[1]
+    assert manager.resolve(ids[1]) == "https://b/2"
+    assert manager.resolve("zzzz") is None
+    assert manager.short_url(ids[0]) == f"http://agents:8080/s/{ids[0]}"
+
+    reopened = LinkManager(manager.db_path, manager.base_url)
+    assert reopened.resolve(ids[0]) == "https://a/1"
+
+
+def test_ids_are_random_and_retried_when_taken(tmp_path, monkeypatch):
+    manager = LinkManager(str(tmp_path / "links.sqlite3"), "http://agents:8080")
+    first = manager.shorten("https://a/1")
+    assert len(first) == link_manager.Config.SHORT_LINK_ID_LENGTH
+    assert first.isalnum()
+
+    generated = iter([first, first, "second"])
+    monkeypatch.setattr(link_manager, "new_link_id", lambda: next(generated))
+    assert manager.shorten("https://b/2") == "second"
+    assert manager.resolve(first) == "https://a/1"
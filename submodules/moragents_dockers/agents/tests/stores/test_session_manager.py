@@ -0,0 +1,58 @@
+import time
+
+from src.stores.session_manager import DEFAULT_SESSION_ID, SessionManager
+
+
+def test_sessions_are_isolated():
+    manager = SessionManager(max_sessions=10, idle_timeout=60, memory_limit=10**6)
+    first = manager.get_session("a")
+    second = manager.get_session("b")
+
+    first.chat_manager.add_message({"role": "user", "content": "hello"})
+    first.attempted_agents.add("default")
+    first.active_agent = "crypto data"
+
+    assert len(second.chat_manager.get_messages()) == 1
+    assert second.attempted_agents == set()
+    assert second.active_agent is None
+    assert manager.get_session("a") is first
+
+
+def test_missing_session_id_uses_default_session():
+    manager = SessionManager(max_sessions=10, idle_timeout=60, memory_limit=10**6)
+    assert manager.get_session(None).session_id == DEFAULT_SESSION_ID
+
+
+def test_least_recently_used_session_is_evicted():
+    manager = SessionManager(max_sessions=3, idle_timeout=60, memory_limit=10**6)
+    manager.get_session("a")
+    manager.get_session("b")
+    manager.get_session("a")
+    manager.get_session("c")
+
+    assert not manager.has_session("b")
+    assert manager.has_session("a")
+    assert manager.has_session("c")
+    assert manager.has_session(DEFAULT_SESSION_ID)
+
+
+def test_idle_sessions_are_evicted():
+    manager = SessionManager(max_sessions=10, idle_timeout=60, memory_limit=10**6)
+    manager.get_session("stale").last_accessed = time.time() - 120
+    manager.get_session("fresh")
+
+    assert not manager.has_session("stale")
+    assert manager.has_session("fresh")
+
+
+def test_memory_limit_evicts_oldest_sessions():
+    manager = SessionManager(max_sessions=10, idle_timeout=60, memory_limit=10**6)
+    manager.memory_limit = manager.get_memory_usage() + 5000
+    for session_id in ("a", "b", "c"):
+        session = manager.get_session(session_id)
+        session.chat_manager.add_message({"role": "user", "content": "x" * 2000})
+    manager.get_session("d")
+
+    assert not manager.has_session("a")
+    assert manager.get_memory_usage() <= manager.memory_limit
+    assert manager.get_stats()["evicted_count"] >= 1
@@ -0,0 +1,17 @@
+from src.stores.wallet_manager import WalletManager
+
+
+def test_a_session_never_sees_another_sessions_wallet():
+    manager = WalletManager()
+    manager.wallets = {"global": object(), "alice": object()}
+    manager.set_active_wallet("global")
+    manager.set_active_wallet("alice", "session-a")
+
+    assert manager.get_active_wallet_id("session-a") == "alice"
+    assert manager.get_active_wallet_id("session-b") is None
+    assert manager.get_active_wallet_id(None) == "global"
+    assert manager.get_active_wallet_id("default") == "global"
+
+    manager.clear_active_wallet("session-a")
+    assert manager.get_active_wallet_id("session-a") is None
+    assert manager.get_active_wallet_id(None) == "global"
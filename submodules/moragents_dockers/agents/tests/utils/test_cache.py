@@ -0,0 +1,86 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.cache import SingleFlightCache, TTLCache, normalize_cache_key
+
+
+def test_normalize_cache_key():
+    assert normalize_cache_key("What's the price of  ETH?") == normalize_cache_key(
+        "what s the PRICE of eth"
+    )
+
+
+def test_hit_and_miss_counters():
+    cache = TTLCache(max_size=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_entries_expire():
+    cache = TTLCache(max_size=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_clear():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_single_flight_coalesces_concurrent_misses():
+    cache = SingleFlightCache(max_size=10)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get_or_load("btc", loader, ttl=60), range(8)))
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+    assert cache.get_stats()["coalesced"] == 7
+
+
+def test_single_flight_serves_stale_while_revalidating():
+    cache = SingleFlightCache(max_size=10)
+    values = itertools.count(1)
+    refreshed = threading.Event()
+
+    def loader():
+        value = next(values)
+        if value == 2:
+            refreshed.set()
+        return value
+
+    assert cache.get_or_load("eth", loader, ttl=0, stale_ttl=60) == 1
+    assert cache.get_or_load("eth", loader, ttl=0, stale_ttl=60) == 1
+    assert refreshed.wait(timeout=2)
+    time.sleep(0.05)
+    assert cache.get_or_load("eth", loader, ttl=60) == 2
+    assert cache.get_stats()["stale_hits"] >= 1
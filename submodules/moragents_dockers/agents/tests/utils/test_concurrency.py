@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+from src.utils.concurrency import ConcurrencyLimiter, call_agent_chat
+
+
+class SyncAgent:
+    def chat(self, request):
+        return {"role": "assistant", "content": request, "thread": threading.get_ident()}
+
+
+class AsyncAgent:
+    async def chat(self, request):
+        return {"role": "assistant", "content": request}
+
+
+def test_call_agent_chat_offloads_sync_agent():
+    response = asyncio.run(call_agent_chat(SyncAgent(), "hello"))
+    assert response["content"] == "hello"
+    assert response["thread"] != threading.get_ident()
+
+
+def test_call_agent_chat_awaits_async_agent():
+    response = asyncio.run(call_agent_chat(AsyncAgent(), "hello"))
+    assert response == {"role": "assistant", "content": "hello"}
+
+
+def test_concurrency_limiter_bounds_in_flight():
+    limiter = ConcurrencyLimiter(2)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.get_stats()["in_flight"])
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(work() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert limiter.get_stats()["in_flight"] == 0
+
+
+def test_concurrency_limiter_times_out_when_full():
+    limiter = ConcurrencyLimiter(1, queue_timeout=0.01)
+
+    async def run():
+        async with limiter:
+            with pytest.raises(TimeoutError):
+                async with limiter:
+                    pass
+
+    asyncio.run(run())
@@ -0,0 +1,64 @@
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+from src.utils.http_client import HttpClient
+
+
+class FlakyHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = 0
+
+    def do_GET(self):
+        FlakyHandler.requests_seen += 1
+        failing = self.path == "/flaky" and FlakyHandler.requests_seen % 2 == 1
+        self.send_response(503 if failing else 200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_sync_requests_reuse_connections(base_url):
+    client = HttpClient(
+        timeout=(2, 5), max_retries=0, backoff_factor=0, pool_maxsize=4, max_per_host=2
+    )
+    for _ in range(5):
+        assert client.get(f"{base_url}/ok").status_code == 200
+
+    pools = client.get_stats()["sync_pools"]
+    assert [pool["connections_opened"] for pool in pools.values()] == [1]
+    client.close()
+
+
+def test_async_retries_retryable_status(base_url):
+    client = HttpClient(
+        timeout=(2, 5), max_retries=2, backoff_factor=0.01, pool_maxsize=4, max_per_host=2
+    )
+    FlakyHandler.requests_seen = 0
+
+    async def fetch():
+        try:
+            return await client.aget(f"{base_url}/flaky")
+        finally:
+            await client.aclose()
+
+    response = asyncio.run(fetch())
+    assert response.status_code == 200
+    assert FlakyHandler.requests_seen == 2
+
+    host_stats = next(iter(client.get_stats()["hosts"].values()))
+    assert host_stats["requests"] == 2
+    assert host_stats["errors"] == 1
@@ -0,0 +1,47 @@
+import importlib
+import importlib.util
+import inspect
+import sys
+
+from src.utils.startup_profiler import StartupProfiler
+
+
+class SharedLoader:
+    """One loader for every module, like pytest's assertion rewriting hook"""
+
+    def __init__(self):
+        self.wrapper_depths = []
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        frames = [frame.function for frame in inspect.stack()]
+        self.wrapper_depths.append(frames.count("timed_exec_module"))
+
+
+class SharedFinder:
+    def __init__(self, loader):
+        self.loader = loader
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname.startswith("profiled_"):
+            return importlib.util.spec_from_loader(fullname, self.loader)
+        return None
+
+
+def test_shared_loaders_are_wrapped_once_and_restored_on_stop(monkeypatch):
+    loader = SharedLoader()
+    monkeypatch.setattr(sys, "meta_path", [SharedFinder(loader)] + sys.meta_path)
+    for name in ("profiled_a", "profiled_b", "profiled_c"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    profiler = StartupProfiler()
+
+    profiler.start()
+    for name in ("profiled_a", "profiled_b", "profiled_c"):
+        importlib.import_module(name)
+    profiler.stop()
+
+    assert loader.wrapper_depths == [1, 1, 1]
+    assert {"profiled_a", "profiled_b", "profiled_c"} <= set(profiler.module_times)
+    assert "exec_module" not in vars(loader)
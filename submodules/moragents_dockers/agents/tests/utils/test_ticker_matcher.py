@@ -0,0 +1,48 @@
+from src.agents.news_agent.config import Config
+from src.utils.ticker_matcher import TickerMatcher
+
+COINS = {
+    "BTC": "Bitcoin",
+    "BCH": "Bitcoin Cash",
+    "ETH": "Ethereum",
+    "SOL": "Solana",
+    "POL": "POL (ex-MATIC)",
+    "NOT": "Notcoin",
+    "CORE": "Core",
+}
+
+
+def test_tickers_and_names_resolve_to_canonical_tickers_in_order():
+    matcher = TickerMatcher(COINS)
+    assert matcher.find("any news on solana, eth and $BTC? what about Solana again") == [
+        "SOL",
+        "ETH",
+        "BTC",
+    ]
+
+
+def test_longest_mention_wins_and_words_must_be_whole():
+    matcher = TickerMatcher(COINS)
+    assert matcher.find("Bitcoin Cash forks") == ["BCH"]
+    assert matcher.find("Bitcoin and Bitcoin Cash") == ["BTC", "BCH"]
+    assert matcher.find("methods, solar, POLygon") == []
+    assert matcher.find("POL news") == ["POL"]
+
+
+def test_exact_case_keywords_need_their_casing():
+    matcher = TickerMatcher(COINS, exact_case=["NOT", "CORE", "Core"])
+    assert matcher.find("why not buy core stuff?") == []
+    assert matcher.find("NOT and Core news") == ["NOT", "CORE"]
+    assert matcher.find("notcoin") == ["NOT"]
+
+
+def test_every_configured_coin_is_found_by_its_ticker():
+    matcher = TickerMatcher(Config.CRYPTO_DICT, exact_case=Config.EXACT_CASE_MENTIONS)
+    for ticker in Config.CRYPTO_DICT:
+        assert matcher.find(f"news about {ticker} today") == [ticker]
+
+
+def test_configured_common_words_are_not_read_as_coins():
+    matcher = TickerMatcher(Config.CRYPTO_DICT, exact_case=Config.EXACT_CASE_MENTIONS)
+    assert matcher.find("an apt algo, etc. plot the graph of meth use and ask the vet") == []
+    assert matcher.find("APT, METH and The Graph news") == ["APT", "METH", "GRT"]